@@ -0,0 +1,217 @@
+import logging
+import re
+import time
+from html.parser import HTMLParser
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+from urllib.parse import urlparse
+
+from metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# 도메인별 본문 선택자 ('tag', 'tag.class', 'tag#id'), 앞에 있을수록 우선
+DEFAULT_EXTRACTORS: Dict[str, List[str]] = {
+    'techcrunch.com': ['div.article-content', 'div.content', 'div.entry-content'],
+    'zdnet.com': [
+        'div.storyBody', 'div.article-content', 'div.story-body', 'div.story-body-container',
+        'article', 'div#content', 'div.main-content', 'div.article-body'
+    ],
+    'hankyung.com': ['div#articletxt', 'div.article-body', 'div.article-txt'],
+}
+
+# 범용 추출에서 본문으로 보지 않는 영역
+SKIP_TAGS = {'script', 'style', 'noscript', 'nav', 'header', 'footer', 'aside', 'form', 'figcaption', 'button'}
+_WHITESPACE = re.compile(r'\s+')
+_SELECTOR = re.compile(r'^([a-zA-Z][\w-]*)?(?:([.#])([\w-]+))?$')
+
+
+def parse_selector(selector: str) -> Tuple[str, Optional[str], Optional[str]]:
+    """'div.class' / 'div#id' / 'article' 형식의 선택자를 (태그, 속성, 값)으로 변환"""
+    match = _SELECTOR.match(selector.strip())
+    if not match or not (match.group(1) or match.group(3)):
+        raise ValueError(f"지원하지 않는 선택자입니다: {selector}")
+    tag, marker, value = match.groups()
+    attribute = {'.': 'class', '#': 'id'}.get(marker)
+    return (tag.lower() if tag else None, attribute, value)
+
+
+class _ParagraphCollector(HTMLParser):
+    """청크 단위로 HTML을 받아 선택자 영역과 범용 후보의 문단을 수집하는 스트리밍 파서
+
+    트리를 만들지 않고 열린 본문 영역의 깊이만 추적하므로, 필요한 문단이 모이면
+    나머지 HTML은 받거나 파싱하지 않아도 됩니다.
+    """
+
+    def __init__(self, selectors: List[Tuple[str, Optional[str], Optional[str]]],
+                 paragraphs: int, min_paragraph_chars: int):
+        super().__init__(convert_charrefs=True)
+        self.selectors = selectors
+        self.paragraphs = paragraphs
+        self.min_paragraph_chars = min_paragraph_chars
+        # 선택자별 문단과 영역 직속 텍스트 (p 태그가 없는 본문 대비)
+        self.matched: List[List[str]] = [[] for _ in selectors]
+        self.container_text: List[List[str]] = [[] for _ in selectors]
+        self.generic: List[str] = []
+        self._open: List[List] = []  # [선택자 번호, 태그, 같은 태그 중첩 깊이]
+        self._skip_depth = 0
+        self._in_script = False
+        self._paragraph: Optional[List[str]] = None
+        self.canonical: Optional[str] = None
+        self.done = False
+
+    def _matches(self, selector, tag: str, attrs: Dict[str, str]) -> bool:
+        selector_tag, attribute, value = selector
+        if selector_tag and selector_tag != tag:
+            return False
+        if attribute == 'class':
+            return value in (attrs.get('class') or '').split()
+        if attribute == 'id':
+            return attrs.get('id') == value
+        return True
+
+    def handle_starttag(self, tag, attrs):
+        if self.done:
+            return
+        if tag == 'p':
+            self._close_paragraph()
+            self._paragraph = []
+        if tag == 'br':
+            self.handle_data(' ')
+        if tag in SKIP_TAGS:
+            self._skip_depth += 1
+        self._in_script = tag in ('script', 'style')
+        for container in self._open:
+            if container[1] == tag:
+                container[2] += 1
+        attrs = dict(attrs)
+        if tag == 'link' and self.canonical is None and 'canonical' in (attrs.get('rel') or '').lower().split():
+            self.canonical = attrs.get('href') or None
+        for index, selector in enumerate(self.selectors):
+            if not any(container[0] == index for container in self._open) and self._matches(selector, tag, attrs):
+                self._open.append([index, tag, 1])
+
+    def handle_endtag(self, tag):
+        if self.done:
+            return
+        if tag == 'p':
+            self._close_paragraph()
+        if tag in SKIP_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+        self._in_script = False
+        closed = False
+        for container in self._open:
+            if container[1] == tag:
+                container[2] -= 1
+                closed = closed or container[2] == 0
+        if closed:
+            # 영역이 닫히면 미처 닫히지 않은 문단도 함께 마무리
+            self._close_paragraph()
+            self._open = [container for container in self._open if container[2] > 0]
+
+    def handle_data(self, data):
+        if self.done or self._in_script:
+            return
+        if self._paragraph is not None:
+            self._paragraph.append(data)
+        elif not self._skip_depth:
+            for index, _, _ in self._open:
+                self.container_text[index].append(data)
+
+    def _close_paragraph(self):
+        if self._paragraph is None:
+            return
+        text = _WHITESPACE.sub(' ', ''.join(self._paragraph)).strip()
+        self._paragraph = None
+        if not text:
+            return
+        for index, _, _ in self._open:
+            self.matched[index].append(text)
+            if len(self.matched[index]) >= self.paragraphs:
+                self.done = True
+        # 범용 추출은 메뉴/링크 목록이 아닌 충분히 긴 문단만 후보로 사용
+        if not self._skip_depth and len(text) >= self.min_paragraph_chars:
+            self.generic.append(text)
+            if not self.selectors and len(self.generic) >= self.paragraphs:
+                self.done = True
+
+    def result(self) -> Tuple[Optional[Union[int, str]], List[str]]:
+        """(사용된 선택자 번호 또는 'generic', 문단 목록)"""
+        self._close_paragraph()
+        for index, paragraphs in enumerate(self.matched):
+            if paragraphs:
+                return index, paragraphs[:self.paragraphs]
+        for index, texts in enumerate(self.container_text):
+            text = _WHITESPACE.sub(' ', ''.join(texts)).strip()
+            if text:
+                return index, [text]
+        if self.generic:
+            return 'generic', self.generic[:self.paragraphs]
+        return None, []
+
+
+class ArticleExtractor:
+    """도메인별 선택자 레지스트리 기반 기사 본문 추출기
+
+    URL의 도메인(하위 도메인 포함)에 등록된 선택자 영역에서 앞쪽 문단을 수집하고,
+    등록되지 않은 사이트나 선택자가 맞지 않는 페이지는 긴 문단 위주의 범용
+    (readability 방식) 추출로 대체합니다. 새 사이트는 rss_settings.extractors에
+    도메인별 선택자 목록을 추가하면 됩니다.
+    """
+
+    def __init__(self, extractors: Dict[str, List[str]] = None, paragraphs: int = 3,
+                 min_paragraph_chars: int = 40):
+        self.paragraphs = paragraphs
+        self.min_paragraph_chars = min_paragraph_chars
+        self.registry: Dict[str, List[Tuple[str, Optional[str], Optional[str]]]] = {}
+        for domain, selectors in DEFAULT_EXTRACTORS.items():
+            self.register(domain, selectors)
+        for domain, selectors in (extractors or {}).items():
+            self.register(domain, selectors)
+
+    @classmethod
+    def from_settings(cls, rss_settings: Dict) -> 'ArticleExtractor':
+        return cls(
+            extractors=rss_settings.get('extractors'),
+            paragraphs=rss_settings.get('summary_paragraphs', 3),
+            min_paragraph_chars=rss_settings.get('min_paragraph_chars', 40)
+        )
+
+    def register(self, domain: str, selectors: List[str]):
+        """도메인의 본문 선택자 등록 (기존 등록은 대체)"""
+        self.registry[domain.lower()] = [parse_selector(selector) for selector in selectors]
+
+    def selectors_for(self, url: str) -> List[Tuple[str, Optional[str], Optional[str]]]:
+        """가장 구체적인 도메인에 등록된 선택자 반환"""
+        host = (urlparse(url).hostname or '').lower()
+        parts = host.split('.')
+        for i in range(len(parts) - 1):
+            selectors = self.registry.get('.'.join(parts[i:]))
+            if selectors is not None:
+                return selectors
+        return []
+
+    def extract(self, url: str, chunks: Iterable[str]) -> List[str]:
+        """HTML 청크를 필요한 문단이 모일 때까지만 읽어 본문 문단 반환"""
+        return self.extract_page(url, chunks)[0]
+
+    def extract_page(self, url: str, chunks: Iterable[str]) -> Tuple[List[str], Optional[str]]:
+        """본문 문단과 페이지의 rel=canonical 주소(없으면 None) 반환"""
+        collector = _ParagraphCollector(self.selectors_for(url), self.paragraphs, self.min_paragraph_chars)
+        # 청크 대기 시간은 기사 다운로드, feed 시간은 HTML 파싱으로 나눠 기록
+        fetch_seconds = parse_seconds = 0.0
+        chunks = iter(chunks)
+        while not collector.done:
+            started = time.perf_counter()
+            chunk = next(chunks, None)
+            fetched = time.perf_counter()
+            fetch_seconds += fetched - started
+            if chunk is None:
+                break
+            collector.feed(chunk)
+            parse_seconds += time.perf_counter() - fetched
+        used, paragraphs = collector.result()
+        metrics.observe('stage_seconds', fetch_seconds, stage='article_fetch')
+        metrics.observe('stage_seconds', parse_seconds, stage='html_parse')
+        if used == 'generic':
+            logger.info(f"등록된 선택자로 본문을 찾지 못해 범용 추출을 사용했습니다: {url}")
+        return paragraphs, collector.canonical
@@ -0,0 +1,387 @@
+import argparse
+import glob
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+COLUMNS = ('crawler', 'category', 'keyword', 'source', 'title', 'link', 'summary', 'published', 'crawled_at')
+# 한글/한자 연속 구간은 2글자씩 겹쳐 자르고(한 글자뿐이면 그대로) 나머지는 단어 단위로 색인
+_CJK = '\uac00-\ud7a3\u4e00-\u9fff'
+_TOKEN = re.compile(
+    rf'(?=([{_CJK}][{_CJK}]))|(?<![{_CJK}])([{_CJK}])(?![{_CJK}])|([^\W_{_CJK}]+)'
+)
+
+
+def search_tokens(text: Optional[str]) -> List[str]:
+    """검색 색인/질의용 토큰 (한글은 2-gram, 영문/숫자는 소문자 단어)"""
+    return [bigram or single or word for bigram, single, word in _TOKEN.findall((text or '').lower())]
+
+
+def match_expression(terms: str) -> str:
+    """검색어를 FTS5 MATCH 식으로 변환 (공백으로 나뉜 검색어는 모두 포함해야 일치)"""
+    phrases = []
+    for term in terms.split():
+        tokens = search_tokens(term)
+        if not tokens:
+            continue
+        if len(tokens) == 1 and len(tokens[0]) == 1 and re.match(f'[{_CJK}]', tokens[0]):
+            # 한 글자 검색어는 그 글자로 시작하는 2-gram을 접두어 검색
+            phrases.append(f'"{tokens[0]}"*')
+        else:
+            phrases.append('"' + ' '.join(tokens) + '"')
+    return ' AND '.join(phrases)
+
+
+class ArticleStore:
+    """수집한 기사를 저장하는 SQLite 기반 추가 전용 저장소
+
+    기사는 수집되는 즉시 한 행씩 기록되며(크롤러별로 같은 링크는 한 번만) link, category,
+    keyword, source, crawled_at 인덱스로 기간/조건 조회 시 전체 결과를 읽지 않습니다.
+    제목과 요약은 저장과 같은 트랜잭션에서 FTS5 색인(articles_fts)에도 추가되어
+    search()로 순위가 매겨진 전문 검색을 할 수 있습니다(중복 표시된 기사는 제외).
+    source는 네이버 기사의 press, RSS 기사의 source(피드 제목)이며
+    crawler는 수집한 크롤러('naver' 또는 'rss')입니다.
+    """
+
+    def __init__(self, db_file: str = 'results/articles.db'):
+        self.db_file = db_file
+        directory = os.path.dirname(db_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(db_file, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute(
+            'CREATE TABLE IF NOT EXISTS articles ('
+            'id INTEGER PRIMARY KEY AUTOINCREMENT, '
+            'crawler TEXT NOT NULL, category TEXT, keyword TEXT, source TEXT, '
+            'title TEXT, link TEXT NOT NULL, summary TEXT, published TEXT, '
+            'crawled_at TEXT NOT NULL, data TEXT NOT NULL)'
+        )
+        for column in ('link', 'category', 'keyword', 'source', 'crawled_at'):
+            self.conn.execute(f'CREATE INDEX IF NOT EXISTS idx_articles_{column} ON articles({column})')
+        has_unique_index = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_articles_crawler_link'"
+        ).fetchone() is not None
+        if not has_unique_index:
+            self._deduplicate()
+        has_search_index = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'articles_fts'"
+        ).fetchone() is not None
+        # 토큰은 search_tokens로 미리 나눠 넣으므로 기본 토크나이저는 공백 분리만 담당
+        self.conn.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts "
+            "USING fts5(title, summary, content='', tokenize='unicode61')"
+        )
+        self.conn.commit()
+        if not has_search_index or not has_unique_index:
+            self.rebuild_search_index()
+
+    def _deduplicate(self):
+        """크롤러별 링크 유일 인덱스 생성 (기존 저장소의 중복 행은 처음 저장된 행만 남김)"""
+        removed = self.conn.execute(
+            'DELETE FROM articles WHERE id NOT IN (SELECT MIN(id) FROM articles GROUP BY crawler, link)'
+        ).rowcount
+        self.conn.execute('CREATE UNIQUE INDEX idx_articles_crawler_link ON articles(crawler, link)')
+        self.conn.commit()
+        if removed:
+            logger.info(f"중복 저장된 기사 {removed}건을 정리했습니다.")
+
+    @staticmethod
+    def _row(news_item: Dict, crawler: str) -> tuple:
+        return (
+            crawler,
+            news_item.get('category'),
+            news_item.get('keyword'),
+            news_item.get('press', news_item.get('source')),
+            news_item.get('title'),
+            news_item['link'],
+            news_item.get('summary'),
+            news_item.get('published'),
+            news_item['crawled_at'],
+            json.dumps(news_item, ensure_ascii=False)
+        )
+
+    def add_many(self, news_items: List[Dict], crawler: str) -> int:
+        """기사 목록을 한 트랜잭션으로 기록하고 새로 저장된 건수 반환 (같은 크롤러의 같은 링크는 무시)"""
+        if not news_items:
+            return 0
+        insert = f'INSERT OR IGNORE INTO articles ({", ".join(COLUMNS)}, data) VALUES ({", ".join("?" * (len(COLUMNS) + 1))})'
+        with self._lock, metrics.timer('save'):
+            search_rows = []
+            inserted = 0
+            for news_item in news_items:
+                cursor = self.conn.execute(insert, self._row(news_item, crawler))
+                if not cursor.rowcount:
+                    continue
+                inserted += 1
+                if not news_item.get('duplicate_of'):
+                    search_rows.append(self._search_row(cursor.lastrowid, news_item))
+            self.conn.executemany(
+                'INSERT INTO articles_fts (rowid, title, summary) VALUES (?, ?, ?)', search_rows
+            )
+            self.conn.commit()
+        metrics.inc('articles_saved_total', inserted, crawler=crawler)
+        return inserted
+
+    def update_many(self, news_items: List[Dict], crawler: str) -> int:
+        """저장된 기사의 요약과 중복 표시를 갱신하고 바뀐 건수 반환 (검색 색인도 같은 트랜잭션에서 갱신)"""
+        if not news_items:
+            return 0
+        updated = 0
+        with self._lock, metrics.timer('save'):
+            for news_item in news_items:
+                row = self.conn.execute(
+                    'SELECT id, data FROM articles WHERE crawler = ? AND link = ?', (crawler, news_item['link'])
+                ).fetchone()
+                data = json.dumps(news_item, ensure_ascii=False)
+                if row is None or row['data'] == data:
+                    continue
+                # 내용 없는 FTS 테이블은 색인했던 토큰을 그대로 넘겨야 지울 수 있음
+                stored = json.loads(row['data'])
+                if not stored.get('duplicate_of'):
+                    self.conn.execute(
+                        "INSERT INTO articles_fts (articles_fts, rowid, title, summary) VALUES ('delete', ?, ?, ?)",
+                        self._search_row(row['id'], stored)
+                    )
+                if not news_item.get('duplicate_of'):
+                    self.conn.execute(
+                        'INSERT INTO articles_fts (rowid, title, summary) VALUES (?, ?, ?)',
+                        self._search_row(row['id'], news_item)
+                    )
+                self.conn.execute(
+                    'UPDATE articles SET summary = ?, data = ? WHERE id = ?',
+                    (news_item.get('summary'), data, row['id'])
+                )
+                updated += 1
+            self.conn.commit()
+        return updated
+
+    @staticmethod
+    def _search_row(row_id: int, news_item: Dict) -> tuple:
+        return (
+            row_id,
+            ' '.join(search_tokens(news_item.get('title'))),
+            ' '.join(search_tokens(news_item.get('summary')))
+        )
+
+    def rebuild_search_index(self, batch_size: int = 1000) -> int:
+        """저장된 모든 기사로 검색 색인을 다시 생성"""
+        indexed = 0
+        with self._lock:
+            self.conn.execute("INSERT INTO articles_fts (articles_fts) VALUES ('delete-all')")
+            cursor = self.conn.cursor()
+            try:
+                cursor.execute('SELECT id, data FROM articles ORDER BY id')
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    search_rows = []
+                    for row in rows:
+                        news_item = json.loads(row['data'])
+                        if not news_item.get('duplicate_of'):
+                            search_rows.append(self._search_row(row['id'], news_item))
+                    self.conn.executemany(
+                        'INSERT INTO articles_fts (rowid, title, summary) VALUES (?, ?, ?)', search_rows
+                    )
+                    indexed += len(search_rows)
+            finally:
+                cursor.close()
+            self.conn.commit()
+        if indexed:
+            logger.info(f"검색 색인에 기사 {indexed}건을 추가했습니다.")
+        return indexed
+
+    def add(self, news_item: Dict, crawler: str) -> bool:
+        """기사 한 건 기록 (이미 저장된 링크면 False)"""
+        return self.add_many([news_item], crawler) == 1
+
+    def exists(self, link: str, max_id: Optional[int] = None, start: Optional[str] = None) -> bool:
+        """이미 저장된 링크인지 확인 (max_id 이하, start 이후에 저장된 행으로 제한 가능)"""
+        sql = 'SELECT 1 FROM articles WHERE link = ?'
+        params = [link]
+        if max_id is not None:
+            sql += ' AND id <= ?'
+            params.append(max_id)
+        if start is not None:
+            sql += ' AND crawled_at >= ?'
+            params.append(start)
+        with self._lock:
+            return self.conn.execute(sql + ' LIMIT 1', params).fetchone() is not None
+
+    def last_id(self) -> int:
+        """마지막으로 저장된 행 번호 (비어 있으면 0)"""
+        with self._lock:
+            return self.conn.execute('SELECT COALESCE(MAX(id), 0) FROM articles').fetchone()[0]
+
+    def query(self, start: Optional[str] = None, end: Optional[str] = None,
+              category: Optional[str] = None, keyword: Optional[str] = None,
+              source: Optional[str] = None, crawler: Optional[str] = None,
+              link: Optional[str] = None, after_id: Optional[int] = None,
+              limit: Optional[int] = None, order: str = 'crawled_at') -> Iterator[Dict]:
+        """조건에 맞는 기사를 crawled_at 순(order='id'면 저장 순)으로 하나씩 반환
+
+        start/end는 'YYYY-MM-DD' 또는 'YYYY-MM-DD HH:MM:SS' 형식이며 end는 포함하지 않습니다.
+        after_id를 주면 그보다 나중에 저장된 행만 반환합니다. after_id와 limit으로
+        나눠 읽을 때는 order='id'를 사용해야 빠지는 행이 없습니다.
+        """
+        conditions = []
+        params = []
+        for column, operator, value in (
+            ('crawled_at', '>=', start), ('crawled_at', '<', end),
+            ('category', '=', category), ('keyword', '=', keyword),
+            ('source', '=', source), ('crawler', '=', crawler),
+            ('link', '=', link), ('id', '>', after_id),
+        ):
+            if value is not None:
+                conditions.append(f'{column} {operator} ?')
+                params.append(value)
+        sql = 'SELECT id, crawler, data FROM articles'
+        if conditions:
+            sql += ' WHERE ' + ' AND '.join(conditions)
+        if order not in ('crawled_at', 'id'):
+            raise ValueError(f"지원하지 않는 정렬 기준입니다: {order}")
+        sql += ' ORDER BY id' if order == 'id' else ' ORDER BY crawled_at, id'
+        if limit:
+            sql += ' LIMIT ?'
+            params.append(limit)
+
+        # 공유 연결과 잠금을 쓰지 않는 읽기 전용 연결로 스트리밍 (WAL이라 저장과 동시에 읽을 수 있음)
+        reader = self._reader()
+        try:
+            for row in reader.execute(sql, params):
+                news_item = json.loads(row['data'])
+                news_item['_id'] = row['id']
+                news_item['_crawler'] = row['crawler']
+                yield news_item
+        finally:
+            reader.close()
+
+    def _reader(self) -> sqlite3.Connection:
+        """조회 전용 연결 (호출한 스레드에서만 사용)"""
+        reader = sqlite3.connect(Path(os.path.abspath(self.db_file)).as_uri() + '?mode=ro', uri=True)
+        reader.row_factory = sqlite3.Row
+        return reader
+
+    def search(self, terms: str, start: Optional[str] = None, end: Optional[str] = None,
+               category: Optional[str] = None, source: Optional[str] = None,
+               crawler: Optional[str] = None, limit: int = 20) -> List[Dict]:
+        """제목/요약 전문 검색 (제목 일치에 가중치를 둔 BM25 순, 같으면 최신순)
+
+        한 단어 안의 글자 순서가 맞아야 일치하며, 공백으로 나눈 검색어는 모두 포함해야 합니다.
+        start/end와 나머지 조건은 query()와 같습니다.
+        """
+        expression = match_expression(terms)
+        if not expression:
+            return []
+        conditions = ['articles_fts MATCH ?']
+        params: List = [expression]
+        for column, operator, value in (
+            ('a.crawled_at', '>=', start), ('a.crawled_at', '<', end),
+            ('a.category', '=', category), ('a.source', '=', source),
+            ('a.crawler', '=', crawler),
+        ):
+            if value is not None:
+                conditions.append(f'{column} {operator} ?')
+                params.append(value)
+        sql = (
+            'SELECT a.id, a.crawler, a.data, bm25(articles_fts, 2.0, 1.0) AS score '
+            'FROM articles_fts JOIN articles a ON a.id = articles_fts.rowid '
+            'WHERE ' + ' AND '.join(conditions) +
+            ' ORDER BY score, a.crawled_at DESC LIMIT ?'
+        )
+        params.append(limit)
+        with self._lock, metrics.timer('search'):
+            rows = self.conn.execute(sql, params).fetchall()
+        results = []
+        for row in rows:
+            news_item = json.loads(row['data'])
+            news_item['_id'] = row['id']
+            news_item['_crawler'] = row['crawler']
+            news_item['_score'] = round(-row['score'], 4)
+            results.append(news_item)
+        return results
+
+    def import_json_dir(self, results_dir: str = 'results') -> int:
+        """기존 results/*.json 파일을 저장소로 가져오기"""
+        imported = 0
+        for path in sorted(glob.glob(os.path.join(results_dir, '*.json'))):
+            crawler = 'rss' if os.path.basename(path).startswith('rss_news_') else 'naver'
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    news_items = json.load(f)
+            except Exception as e:
+                logger.error(f"결과 파일 로드 실패: {path} - {str(e)}")
+                continue
+            imported += self.add_many(news_items, crawler)
+        logger.info(f"결과 파일 {imported}건을 저장소로 가져왔습니다.")
+        return imported
+
+    def close(self):
+        self.conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='기사 저장소 도구')
+    parser.add_argument('--db', default='results/articles.db', help='저장소 파일 경로')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    import_parser = subparsers.add_parser('import', help='기존 JSON 결과 파일 가져오기')
+    import_parser.add_argument('results_dir', nargs='?', default='results')
+
+    query_parser = subparsers.add_parser('query', help='기간/조건으로 기사 조회 (JSONL 출력)')
+    query_parser.add_argument('--since', help='시작 시각 (YYYY-MM-DD[ HH:MM:SS])')
+    query_parser.add_argument('--until', help='종료 시각 (미포함)')
+    query_parser.add_argument('--category')
+    query_parser.add_argument('--keyword')
+    query_parser.add_argument('--source')
+    query_parser.add_argument('--crawler', choices=['naver', 'rss'])
+    query_parser.add_argument('--limit', type=int)
+
+    search_parser = subparsers.add_parser('search', help='제목/요약 전문 검색 (관련도 순 JSONL 출력)')
+    search_parser.add_argument('terms', nargs='+', help='검색어 (여러 개면 모두 포함)')
+    search_parser.add_argument('--since', help='시작 시각 (YYYY-MM-DD[ HH:MM:SS])')
+    search_parser.add_argument('--until', help='종료 시각 (미포함)')
+    search_parser.add_argument('--category')
+    search_parser.add_argument('--source')
+    search_parser.add_argument('--crawler', choices=['naver', 'rss'])
+    search_parser.add_argument('--limit', type=int, default=20)
+
+    subparsers.add_parser('reindex', help='검색 색인 다시 생성')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    store = ArticleStore(args.db)
+    if args.command == 'import':
+        store.import_json_dir(args.results_dir)
+    elif args.command == 'search':
+        for news_item in store.search(
+            ' '.join(args.terms), start=args.since, end=args.until, category=args.category,
+            source=args.source, crawler=args.crawler, limit=args.limit
+        ):
+            print(json.dumps(news_item, ensure_ascii=False))
+    elif args.command == 'reindex':
+        store.rebuild_search_index()
+    else:
+        for news_item in store.query(
+            start=args.since, end=args.until, category=args.category,
+            keyword=args.keyword, source=args.source, crawler=args.crawler, limit=args.limit
+        ):
+            print(json.dumps(news_item, ensure_ascii=False))
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,407 @@
+import argparse
+import copy
+import json
+import logging
+import math
+import os
+import platform
+import random
+import resource
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List
+from urllib.parse import parse_qs, urlparse
+from xml.sax.saxutils import escape
+
+from slack_sdk import WebClient
+
+from crawler import NaverNewsCrawler, load_config
+from rss_crawler import RSSNewsCrawler
+from http_client import HttpClient
+from news_recommender import NewsRecommender
+from slack_delivery import SlackDeliveryQueue
+from near_duplicate import NearDuplicateIndex
+from metrics import metrics
+from logging_setup import setup_logging
+
+logger = logging.getLogger(__name__)
+
+KOREAN_WORDS = [
+    '클라우드', '반도체', '인공지능', '데이터센터', '관세', '수출', '금리', '주식', '투자', '정부',
+    '교육부', '학점제', '입시', '내신', '플랫폼', '보안', '서비스', '출시', '협력', '발표',
+    '시장', '기업', '성장', '전망', '규제', '지원', '개발', '기술', '글로벌', '전략',
+]
+ENGLISH_WORDS = [
+    'cloud', 'chip', 'model', 'startup', 'funding', 'launch', 'security', 'platform', 'market', 'growth',
+    'developer', 'open', 'source', 'data', 'center', 'enterprise', 'service', 'robot', 'device', 'network',
+]
+
+
+def _sentence(rng: random.Random, words: List[str], length: int) -> str:
+    return ' '.join(rng.choice(words) for _ in range(length))
+
+
+class Fixtures:
+    """규모별 합성 응답 (네이버 검색 JSON, RSS XML, 기사 HTML)
+
+    같은 seed면 같은 기사가 만들어지며, 기사마다 무작위 단어열을 써서
+    근접 중복 색인에 묶이지 않도록 합니다. RSS 기사 다섯 개 중 하나는 영어입니다.
+    """
+
+    def __init__(self, articles: int, seed: int = 0):
+        self.articles = articles
+        self.seed = seed
+        self.display = min(100, articles)
+        keyword_count = math.ceil(articles / self.display)
+        self.keywords = [f"bench-{i:04d}" for i in range(keyword_count)]
+        self.feed_count = max(1, min(20, math.ceil(articles / 50)))
+        self.items_per_feed = math.ceil(articles / self.feed_count)
+        self.now = datetime.now(timezone.utc)
+
+    def _rng(self, *key) -> random.Random:
+        return random.Random(f"{self.seed}/" + '/'.join(map(str, key)))
+
+    def naver_items(self, keyword: str, start: int, display: int) -> List[Dict]:
+        index = self.keywords.index(keyword) if keyword in self.keywords else 0
+        total = min(self.display, self.articles - index * self.display)
+        items = []
+        for position in range(start - 1, min(start - 1 + display, total)):
+            rng = self._rng('naver', keyword, position)
+            title = _sentence(rng, KOREAN_WORDS, 6)
+            items.append({
+                'title': f"<b>{keyword}</b> {title}",
+                'originallink': f"https://press.example.com/{keyword}/{position}",
+                'link': f"https://n.news.naver.com/article/{index:04d}/{position:06d}",
+                'description': _sentence(rng, KOREAN_WORDS, 25),
+                'pubDate': format_datetime(self.now - timedelta(minutes=position)),
+            })
+        return items
+
+    def rss_feed(self, base_url: str, feed: int) -> bytes:
+        entries = []
+        count = min(self.items_per_feed, self.articles - feed * self.items_per_feed)
+        for position in range(max(count, 0)):
+            rng = self._rng('rss', feed, position)
+            words = ENGLISH_WORDS if position % 5 == 0 else KOREAN_WORDS
+            entries.append(
+                '<item>'
+                f'<title>{escape(_sentence(rng, words, 6))}</title>'
+                f'<link>{base_url}/article/{feed}/{position}</link>'
+                f'<guid>{base_url}/article/{feed}/{position}</guid>'
+                f'<pubDate>{format_datetime(self.now - timedelta(minutes=position))}</pubDate>'
+                '</item>'
+            )
+        return (
+            '<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+            f'<title>Bench Feed {feed}</title><link>{base_url}</link>'
+            + ''.join(entries) + '</channel></rss>'
+        ).encode('utf-8')
+
+    def article_html(self, feed: int, position: int) -> bytes:
+        rng = self._rng('article', feed, position)
+        words = ENGLISH_WORDS if position % 5 == 0 else KOREAN_WORDS
+        paragraphs = ''.join(f'<p>{_sentence(rng, words, 30)}</p>' for _ in range(8))
+        # 본문 뒤에 실제 기사 페이지처럼 관련 기사/댓글 영역을 붙여 크기를 맞춤
+        filler = ''.join(f'<li><a href="/related/{i}">{_sentence(rng, words, 8)}</a></li>' for i in range(200))
+        return (
+            '<html><head><meta charset="utf-8"><title>bench</title>'
+            '<script>window.dataLayer = [];</script></head><body>'
+            '<header><nav><a href="/">home</a></nav></header>'
+            f'<div class="article-body" id="articletxt">{paragraphs}</div>'
+            f'<aside><ul>{filler}</ul></aside><footer>bench</footer></body></html>'
+        ).encode('utf-8')
+
+
+class _QuietHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # 기사 본문을 필요한 만큼만 읽고 끊는 연결은 정상 동작
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+class StubServer:
+    """네이버 검색 API, RSS 피드, 기사 페이지, Slack chat.postMessage를 흉내 내는 로컬 HTTP 서버"""
+
+    def __init__(self, fixtures: Fixtures, latency_ms: float = 0):
+        self.fixtures = fixtures
+        self.latency = latency_ms / 1000
+        self.requests: Dict[str, int] = {}
+        self.slack_messages = 0
+        self._lock = threading.Lock()
+        self.server = _QuietHTTPServer(('127.0.0.1', 0), self._handler())
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def _count(self, route: str):
+        with self._lock:
+            self.requests[route] = self.requests.get(route, 0) + 1
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def _send(self, status: int, body: bytes, content_type: str):
+                if stub.latency:
+                    time.sleep(stub.latency)
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                parts = url.path.strip('/').split('/')
+                if parts[0] == 'naver':
+                    stub._count('naver')
+                    query = {key: values[0] for key, values in parse_qs(url.query).items()}
+                    items = stub.fixtures.naver_items(
+                        query.get('query', ''), int(query.get('start', 1)), int(query.get('display', 10))
+                    )
+                    body = json.dumps({'items': items}, ensure_ascii=False).encode('utf-8')
+                    self._send(200, body, 'application/json; charset=utf-8')
+                elif parts[0] == 'rss':
+                    stub._count('rss')
+                    body = stub.fixtures.rss_feed(stub.base_url, int(parts[1]))
+                    self._send(200, body, 'application/rss+xml; charset=utf-8')
+                elif parts[0] == 'article':
+                    stub._count('article')
+                    body = stub.fixtures.article_html(int(parts[1]), int(parts[2]))
+                    self._send(200, body, 'text/html; charset=utf-8')
+                else:
+                    self._send(404, b'not found', 'text/plain')
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                if self.path.rstrip('/').endswith('chat.postMessage'):
+                    stub._count('slack')
+                    with stub._lock:
+                        stub.slack_messages += 1
+                    body = json.dumps({'ok': True, 'channel': 'CBENCH', 'ts': f"{time.time():.6f}"})
+                    self._send(200, body.encode('utf-8'), 'application/json; charset=utf-8')
+                else:
+                    self._send(404, b'not found', 'text/plain')
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self._thread.start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def bench_config(config: Dict, fixtures: Fixtures, base_url: str, embedding_backend: str) -> Dict:
+    """설정 파일을 복사해 모든 외부 주소를 스텁 서버로 돌린 벤치마크용 설정 생성"""
+    config = copy.deepcopy(config)
+    config['naver_api'].update({
+        'base_url': f"{base_url}/naver/search",
+        'requests_per_second': 10000,
+        'daily_limit': 10 ** 9,
+    })
+    # 설정의 카테고리 구조(채널)는 유지하고 키워드만 규모에 맞게 분배
+    categories = list(config['search_keywords'].items())
+    search_keywords = {}
+    for i, keyword in enumerate(fixtures.keywords):
+        name, category_config = categories[i % len(categories)]
+        search_keywords.setdefault(name, dict(category_config, keywords=[], max_articles=fixtures.display))
+        search_keywords[name]['keywords'].append(keyword)
+    config['search_keywords'] = search_keywords
+
+    rss_settings = config.setdefault('rss_settings', {})
+    rss_settings['enabled'] = True
+    rss_settings['feeds'] = [f"{base_url}/rss/{i}" for i in range(fixtures.feed_count)]
+    rss_settings.setdefault('translation', {})['backend'] = 'identity'
+    rss_settings.setdefault('extractors', {})['127.0.0.1'] = ['div#articletxt']
+
+    slack_settings = config['slack_settings']
+    slack_settings.update({'enabled': True, 'bot_token': 'xoxb-benchmark', 'base_url': f"{base_url}/slack/api/"})
+    slack_settings.setdefault('delivery', {})['min_interval'] = 0
+
+    config.setdefault('recommendation_settings', {})['embedding_backend'] = embedding_backend
+    config.setdefault('output_settings', {})['database'] = 'results/articles.db'
+    return config
+
+
+def measure(name: str, func: Callable, count: Callable[[], int], trace_memory: bool = True) -> Dict:
+    """단계 실행 시간, 처리량, 파이썬 힙 최대 사용량 측정
+
+    tracemalloc은 할당마다 추적 비용이 들므로 시간만 비교할 때는 trace_memory=False로 끕니다.
+    """
+    if trace_memory:
+        tracemalloc.start()
+    started = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - started
+    peak = None
+    if trace_memory:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    articles = count()
+    logger.info(f"[{name}] {articles}건 {elapsed:.3f}초")
+    return {
+        'articles': articles,
+        'seconds': round(elapsed, 4),
+        'articles_per_second': round(articles / elapsed, 2) if elapsed else None,
+        'peak_memory_bytes': peak,
+    }
+
+
+def _stage_key(labels: Dict[str, str]) -> str:
+    """단계 히스토그램 이름 (stage 뒤에 나머지 라벨을 이름순으로 붙임, 예: similarity/scope=history)"""
+    extra = ','.join(f"{key}={value}" for key, value in sorted(labels.items()) if key != 'stage')
+    return labels['stage'] + (f"/{extra}" if extra else '')
+
+
+def run_scale(config: Dict, articles: int, embedding_backend: str, latency_ms: float, seed: int,
+              trace_memory: bool = True) -> Dict:
+    """임시 작업 디렉터리에서 한 규모의 전체 파이프라인을 실행"""
+    fixtures = Fixtures(articles, seed=seed)
+    metrics.reset()
+    stub = StubServer(fixtures, latency_ms=latency_ms)
+    stub.start()
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix='news-bench-') as workdir:
+        os.chdir(workdir)
+        try:
+            settings = bench_config(config, fixtures, stub.base_url, embedding_backend)
+            slack_settings = settings['slack_settings']
+            http_client = HttpClient(settings)
+            slack_client = WebClient(token=slack_settings['bot_token'], base_url=slack_settings['base_url'])
+            delivery_queue = SlackDeliveryQueue.from_settings(slack_client, slack_settings)
+            news_recommender = NewsRecommender.from_config(slack_client, settings)
+            near_duplicates = NearDuplicateIndex.from_config(settings)
+            naver_crawler = NaverNewsCrawler(settings, http_client, delivery_queue, news_recommender, near_duplicates)
+            rss_crawler = RSSNewsCrawler(settings, http_client, delivery_queue, news_recommender, near_duplicates)
+            store = naver_crawler.article_store
+
+            def stored(crawler: str) -> int:
+                return sum(1 for _ in store.query(crawler=crawler))
+
+            def crawl(crawler):
+                crawler.run_crawling()
+                delivery_queue.flush()
+
+            # 첫 인코딩의 모델 로드 시간은 추천 단계와 분리해 기록
+            load_started = time.perf_counter()
+            news_recommender.model.encode(['warmup'])
+            model_load_seconds = time.perf_counter() - load_started
+
+            stages = {
+                'naver': measure('naver', lambda: crawl(naver_crawler), lambda: stored('naver'), trace_memory),
+                'rss': measure('rss', lambda: crawl(rss_crawler), lambda: stored('rss'), trace_memory),
+            }
+            candidates = [item for item in store.query() if item.get('summary')]
+            stages['recommend'] = measure(
+                'recommend',
+                lambda: news_recommender.get_representative_news(candidates),
+                lambda: len(candidates),
+                trace_memory
+            )
+
+            delivery_queue.close()
+            http_client.close()
+        finally:
+            os.chdir(cwd)
+            stub.close()
+    return {
+        'articles': articles,
+        'model_load_seconds': round(model_load_seconds, 4),
+        'stages': stages,
+        'stage_breakdown': {
+            _stage_key(histogram['labels']): {
+                'count': histogram['count'], 'seconds': histogram['sum']
+            }
+            for histogram in metrics.snapshot()['histograms'] if histogram['name'] == 'stage_seconds'
+        },
+        'http_requests': dict(stub.requests),
+        'slack_messages': stub.slack_messages,
+    }
+
+
+def compare(result: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """기준 결과보다 tolerance 비율 이상 느려진 단계 목록"""
+    regressions = []
+    baseline_runs = {run['articles']: run for run in baseline.get('runs', [])}
+    for run in result['runs']:
+        reference = baseline_runs.get(run['articles'])
+        if not reference:
+            continue
+        for stage, stage_stats in run['stages'].items():
+            previous = reference['stages'].get(stage)
+            if previous and stage_stats['seconds'] > previous['seconds'] * (1 + tolerance):
+                regressions.append(
+                    f"{run['articles']}건 {stage}: {previous['seconds']}초 → {stage_stats['seconds']}초"
+                )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='로컬 스텁 서버 기반 파이프라인 벤치마크')
+    parser.add_argument('--config', default='config.json', help='기준 설정 파일')
+    parser.add_argument('--scales', type=int, nargs='+', default=[10, 100, 1000], help='규모별 기사 수 (10 ~ 10000)')
+    parser.add_argument('--embedding-backend', default='hashing',
+                        help="임베딩 백엔드 ('hashing'은 모델 없이 실행, 실제 비용은 'sentence-transformers'/'onnx')")
+    parser.add_argument('--latency-ms', type=float, default=0, help='스텁 서버 응답 지연 (밀리초)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--no-trace-memory', action='store_true', help='tracemalloc 없이 시간만 측정')
+    parser.add_argument('--output', help='결과 JSON 파일 (기본: 표준 출력)')
+    parser.add_argument('--baseline', help='비교할 이전 결과 JSON')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='허용 지연 비율 (기본 20%%)')
+    parser.add_argument('--log-level', default='WARNING')
+    args = parser.parse_args()
+
+    setup_logging()
+    logging.getLogger().setLevel(args.log_level)
+    logger.setLevel(logging.INFO)
+    config = load_config(os.path.abspath(args.config))
+
+    result = {
+        'generated_at': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'embedding_backend': args.embedding_backend,
+        'latency_ms': args.latency_ms,
+        'trace_memory': not args.no_trace_memory,
+        'runs': [],
+    }
+    for articles in args.scales:
+        result['runs'].append(run_scale(
+            config, articles, args.embedding_backend, args.latency_ms, args.seed, not args.no_trace_memory
+        ))
+    # ru_maxrss는 Linux에서 KB, macOS에서 바이트 단위
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    result['max_rss_bytes'] = max_rss if sys.platform == 'darwin' else max_rss * 1024
+
+    output = json.dumps(result, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            regressions = compare(result, json.load(f), args.tolerance)
+        for regression in regressions:
+            logger.error(f"성능 저하: {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
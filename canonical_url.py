@@ -0,0 +1,120 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
+
+from metrics import metrics
+from summary_cache import TRACKING_PARAM_PREFIXES, TRACKING_PARAMS, normalize_url
+
+logger = logging.getLogger(__name__)
+
+NAVER_MIRROR_HOSTS = {'n.news.naver.com', 'm.news.naver.com', 'news.naver.com'}
+
+
+def strip_tracking(url: str) -> str:
+    """추적 파라미터와 프래그먼트만 제거 (나머지 URL 형태는 유지)"""
+    parts = urlsplit(url.strip())
+    query = [
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PARAM_PREFIXES)
+    ]
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(query), ''))
+
+
+def is_naver_mirror(url: str) -> bool:
+    return urlsplit(url).netloc.lower() in NAVER_MIRROR_HOSTS
+
+
+class CanonicalUrlIndex:
+    """크롤러 간에 공유하는 기사 대표 URL 색인 (SQLite)
+
+    기사 URL은 추적 파라미터를 뺀 언론사 URL(네이버 미러 링크는 originallink)로 바꾸고,
+    본문을 받을 때 찾은 rel=canonical 주소를 별칭으로 저장해 다음부터는 요청 없이
+    대표 URL로 바꿉니다. 두 크롤러는 기사를 받거나 Slack으로 보내기 전에 claim()으로
+    대표 URL을 먼저 등록하며, 보존 기간 안에 이미 등록된 URL이면 처음 등록한 기사
+    링크를 돌려받아 건너뜁니다.
+    """
+
+    def __init__(self, db_file: str = 'canonical_urls.db', window_hours: float = 72):
+        self.db_file = db_file
+        self.window_seconds = window_hours * 3600
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(db_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(db_file, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute(
+            'CREATE TABLE IF NOT EXISTS aliases ('
+            'url TEXT PRIMARY KEY, canonical TEXT NOT NULL, resolved_at REAL NOT NULL)'
+        )
+        self.conn.execute(
+            'CREATE TABLE IF NOT EXISTS claims ('
+            'url TEXT PRIMARY KEY, link TEXT NOT NULL, crawler TEXT, claimed_at REAL NOT NULL)'
+        )
+        self.conn.execute('CREATE INDEX IF NOT EXISTS idx_claims_claimed_at ON claims(claimed_at)')
+        self.conn.commit()
+
+    @classmethod
+    def from_config(cls, config: Dict) -> 'CanonicalUrlIndex':
+        settings = config.get('canonical_url_settings', {})
+        return cls(
+            db_file=settings.get('path', 'canonical_urls.db'),
+            window_hours=settings.get('window_hours', 72)
+        )
+
+    def resolve(self, url: str, originallink: Optional[str] = None) -> str:
+        """언론사 기준 대표 URL (네트워크 요청 없음)"""
+        if originallink and is_naver_mirror(url):
+            url = originallink
+        url = strip_tracking(url)
+        with self._lock:
+            row = self.conn.execute(
+                'SELECT canonical FROM aliases WHERE url = ?', (normalize_url(url),)
+            ).fetchone()
+        return row[0] if row else url
+
+    def remember(self, url: str, canonical: str):
+        """본문에서 찾은 rel=canonical 주소를 별칭으로 저장"""
+        canonical = strip_tracking(urljoin(url, canonical))
+        if normalize_url(canonical) == normalize_url(url):
+            return
+        try:
+            with self._lock:
+                self.conn.execute(
+                    'INSERT OR REPLACE INTO aliases (url, canonical, resolved_at) VALUES (?, ?, ?)',
+                    (normalize_url(url), canonical, time.time())
+                )
+                self.conn.commit()
+        except sqlite3.Error as e:
+            logger.error(f"대표 URL 별칭 저장 실패: {str(e)}")
+
+    def claim(self, url: str, crawler: str) -> Optional[str]:
+        """대표 URL 등록 (보존 기간 안에 이미 등록됐으면 먼저 등록된 기사 링크 반환)"""
+        key = normalize_url(url)
+        now = time.time()
+        try:
+            with self._lock:
+                self.conn.execute('DELETE FROM claims WHERE claimed_at < ?', (now - self.window_seconds,))
+                inserted = self.conn.execute(
+                    'INSERT OR IGNORE INTO claims (url, link, crawler, claimed_at) VALUES (?, ?, ?, ?)',
+                    (key, url, crawler, now)
+                ).rowcount
+                row = None if inserted else self.conn.execute(
+                    'SELECT link FROM claims WHERE url = ?', (key,)
+                ).fetchone()
+                self.conn.commit()
+        except sqlite3.Error as e:
+            logger.error(f"대표 URL 등록 실패: {str(e)}")
+            return None
+        if row is None:
+            return None
+        metrics.inc('canonical_duplicates_total', crawler=crawler)
+        return row[0]
+
+    def close(self):
+        self.conn.close()
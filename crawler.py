@@ -1,54 +1,132 @@
 import json
 import time
+from contextlib import nullcontext
+from functools import partial
 from datetime import datetime
+from email.utils import parsedate_to_datetime
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from slack_sdk import WebClient
-from slack_sdk.errors import SlackApiError
 import argparse
 import schedule
 import logging
-from typing import List, Dict
+from typing import List, Dict, Iterable, Optional
 import requests
-from urllib.parse import quote
 from news_recommender import NewsRecommender
+from rate_limiter import TokenBucketLimiter
+from article_store import ArticleStore
+from near_duplicate import NearDuplicateIndex
+from http_client import HttpClient
+from canonical_url import CanonicalUrlIndex
+from slack_delivery import SlackDeliveryQueue
+from metrics import RunProfiler, metrics
+from poll_scheduler import AdaptivePollScheduler, naver_source
+from run_journal import JournalRun, RunJournal
+from logging_setup import setup_logging
 
-# 로깅 설정
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler('crawler.log')
-    ]
-)
 logger = logging.getLogger(__name__)
 
+NAVER_SEARCH_URL = "https://openapi.naver.com/v1/search/news.json"
+
 class NaverNewsCrawler:
-    def __init__(self, config):
+    def __init__(self, config, http_client: HttpClient = None,
+                 delivery_queue: SlackDeliveryQueue = None,
+                 news_recommender: NewsRecommender = None,
+                 near_duplicates: NearDuplicateIndex = None,
+                 poll_scheduler: AdaptivePollScheduler = None,
+                 canonical_urls: CanonicalUrlIndex = None,
+                 journal: RunJournal = None):
         logger.info("크롤러 초기화 중...")
         self.config = config
+        self.http = http_client or HttpClient(config)
         
         # 네이버 API 클라이언트 ID와 시크릿 설정
         self.client_id = config['naver_api']['client_id']
         self.client_secret = config['naver_api']['client_secret']
         
+        # 초당/일일 쿼터를 지키는 공유 요청 제한기
+        naver_api = config['naver_api']
+        self.rate_limiter = TokenBucketLimiter(
+            rate_per_second=naver_api.get('requests_per_second', 10),
+            daily_limit=naver_api.get('daily_limit', 25000),
+            state_file=naver_api.get('quota_file', 'naver_quota.json'),
+            save_every=naver_api.get('quota_save_every', 50)
+        )
+        self.api_url = naver_api.get('base_url', NAVER_SEARCH_URL)
+        self.max_pages = naver_api.get('max_pages', 3)
+        self.max_workers = naver_api.get('max_workers', 4)
+        
+        # 키워드별 마지막으로 수집한 기사 시각 (페이지네이션 중단 기준)
+        self.search_state_file = naver_api.get('search_state_file', 'naver_search_state.json')
+        self.search_state = self._load_search_state()
+        self._search_state_lock = threading.Lock()
+        
+        # 키워드별 적응형 수집 간격 (데몬의 적응형 스케줄에서만 사용)
+        self.poll_scheduler = poll_scheduler
+        
+        # 수집 결과 저장소
+        output_settings = config.get('output_settings', {})
+        self.article_store = ArticleStore(output_settings.get(
+            'database', os.path.join(output_settings.get('save_dir', 'results'), 'articles.db')
+        ))
+        
+        # 키워드/출처 간 근접 중복 색인 (데몬에서는 두 크롤러가 공유)
+        self.near_duplicates = near_duplicates or NearDuplicateIndex.from_config(config)
+        
+        # 크롤러 간 대표 URL 색인 (Slack 전송 전에 확인)
+        self.canonical_urls = canonical_urls or CanonicalUrlIndex.from_config(config)
+        
+        # 실행별 완료 작업 기록 (중단된 실행을 이어서 진행)
+        self.journal = journal or RunJournal.from_config(config)
+        self._run: Optional[JournalRun] = None
+        
         # Slack 클라이언트 초기화
         if config['slack_settings']['enabled']:
-            self.slack_client = WebClient(token=config['slack_settings']['bot_token'])
+            self.slack_client = WebClient(
+                token=config['slack_settings']['bot_token'],
+                base_url=config['slack_settings'].get('base_url', WebClient.BASE_URL)
+            )
             self.channels = config['slack_settings']['channels']
-            # 뉴스 추천기 초기화
-            recommendation_channel = config['slack_settings']['recommendation_channel']
-            self.news_recommender = NewsRecommender(
-                self.slack_client,
-                self.channels[recommendation_channel]
+            # 크롤링과 분리된 Slack 전송 큐
+            self.delivery_queue = delivery_queue or SlackDeliveryQueue.from_settings(
+                self.slack_client, config['slack_settings']
+            )
+            # 뉴스 추천기 초기화 (데몬에서는 공유 인스턴스를 전달받음)
+            self.news_recommender = news_recommender or NewsRecommender.from_config(
+                self.slack_client, config
             )
         else:
             self.slack_client = None
         logger.info("크롤러 초기화 완료")
 
-    def search_news(self, keyword: str, category: str, num_articles: int = 5) -> List[Dict]:
-        """뉴스 검색 및 수집"""
-        logger.info(f"'{keyword}' 검색 시작... (카테고리: {category})")
+    def _load_search_state(self) -> Dict:
+        """키워드별 수집 상태 파일 로드"""
+        if os.path.exists(self.search_state_file):
+            try:
+                with open(self.search_state_file, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except Exception as e:
+                logger.error(f"검색 상태 파일 로드 실패: {str(e)}")
+        return {}
+
+    def _save_search_state(self):
+        """키워드별 수집 상태 파일 저장"""
+        try:
+            with self._search_state_lock:
+                state = dict(self.search_state)
+            tmp_file = self.search_state_file + '.tmp'
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(state, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_file, self.search_state_file)
+        except Exception as e:
+            logger.error(f"검색 상태 파일 저장 실패: {str(e)}")
+
+    def _request_page(self, keyword: str, display: int, start: int) -> Optional[List[Dict]]:
+        """검색 API 한 페이지 요청 (일일 쿼터 초과 시 None)"""
+        if not self.rate_limiter.acquire():
+            logger.warning(f"네이버 API 일일 쿼터를 모두 사용했습니다. '{keyword}' 검색을 중단합니다.")
+            return None
         
         headers = {
             "X-Naver-Client-Id": self.client_id,
@@ -57,51 +135,174 @@ class NaverNewsCrawler:
         
         params = {
             "query": keyword,
-            "display": num_articles,
+            "display": display,
+            "start": start,
             "sort": "date"
         }
         
-        try:
-            response = requests.get(
-                "https://openapi.naver.com/v1/search/news.json",
+        with metrics.timer('naver_request'):
+            response = self.http.get(
+                self.api_url,
                 headers=headers,
                 params=params
             )
-            response.raise_for_status()
-            
-            result = response.json()
-            news_items = []
+        response.raise_for_status()
+        return response.json().get('items', [])
+
+    def search_news(self, keyword: str, category: str, num_articles: int = 5) -> List[Dict]:
+        """뉴스 검색 및 수집"""
+        logger.info(f"'{keyword}' 검색 시작... (카테고리: {category})")
+        
+        state_key = f"{category}/{keyword}"
+        run = self._run
+        done = run.get('search', state_key) if run else None
+        if done is not None:
+            # 중단된 실행에서 끝난 검색은 요청 없이 결과를 이어받고, 전송되지 않은 기사만 전송
+            if done['newest']:
+                with self._search_state_lock:
+                    self.search_state[state_key] = done['newest']
+            for news_item in done['items']:
+                self.send_to_slack(news_item, category)
+            logger.info(f"이전 실행의 '{keyword}' 검색 결과 {len(done['items'])}건을 이어받았습니다.")
+            return done['items']
+        
+        with self._search_state_lock:
+            last_seen = self.search_state.get(state_key)
+        last_seen_time = datetime.fromisoformat(last_seen) if last_seen else None
+        # 이전 수집 기록이 없으면 첫 페이지만 가져옴
+        max_pages = self.max_pages if last_seen_time else 1
+        
+        news_items = []
+        new_count = 0
+        requests_made = 0
+        saturated = False
+        newest_time = last_seen_time
+        try:
             
-            for item in result.get('items', []):
-                news_item = {
-                    'category': category,
-                    'keyword': keyword,
-                    'title': item['title'].replace('<b>', '').replace('</b>', ''),
-                    'press': item.get('publisher', '언론사 정보 없음'),
-                    'summary': item['description'].replace('<b>', '').replace('</b>', ''),
-                    'link': item['link'],
-                    'crawled_at': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                }
-                news_items.append(news_item)
-                logger.info(f"뉴스 항목 추가됨: {news_item['title'][:30]}...")
+            for page in range(max_pages):
+                start = page * num_articles + 1
+                # 네이버 검색 API의 start 최대값은 1000
+                if start > 1000:
+                    break
+                items = self._request_page(keyword, num_articles, start)
+                if items is None:
+                    break
+                requests_made += 1
                 
-                # Slack으로 즉시 전송
-                self.send_to_slack(news_item, category)
+                reached_seen = False
+                page_items = []
+                for item in items:
+                    published = parsedate_to_datetime(item['pubDate']) if item.get('pubDate') else None
+                    if published and last_seen_time and published <= last_seen_time:
+                        reached_seen = True
+                        break
+                    if published and (newest_time is None or published > newest_time):
+                        newest_time = published
+                    
+                    news_item = {
+                        'category': category,
+                        'keyword': keyword,
+                        'title': item['title'].replace('<b>', '').replace('</b>', ''),
+                        'press': item.get('publisher', '언론사 정보 없음'),
+                        'summary': item['description'].replace('<b>', '').replace('</b>', ''),
+                        'link': self.canonical_urls.resolve(item['link'], item.get('originallink')),
+                        'crawled_at': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                    }
+                    if news_item['link'] != item['link']:
+                        news_item['naver_link'] = item['link']
+                    
+                    # 중단된 실행에서 이미 저장한 기사는 다시 확인하거나 저장하지 않음
+                    journaled = run.get('article', news_item['link']) if run else None
+                    if journaled is not None:
+                        if not journaled.get('duplicate_of'):
+                            news_items.append(journaled)
+                            self.send_to_slack(journaled, category)
+                        continue
+                    page_items.append(news_item)
+                    
+                    # 다른 키워드나 RSS에서 같은 언론사 URL로 이미 수집한 기사는 전송과 추천에서 제외
+                    duplicate_of = self._claim(news_item['link'])
+                    if duplicate_of:
+                        news_item['duplicate_of'] = duplicate_of
+                        logger.info(f"이미 수집한 기사 URL 건너뜀: {news_item['link']}")
+                        continue
+                    
+                    # 다른 키워드/출처에서 이미 수집한 근접 중복 기사는 전송과 추천에서 제외
+                    duplicate_of = self.near_duplicates.check(news_item)
+                    # 자기 링크와 일치하면 중단된 실행에서 등록한 같은 기사
+                    if duplicate_of and duplicate_of != news_item['link']:
+                        news_item['duplicate_of'] = duplicate_of
+                        metrics.inc('near_duplicates_total', crawler='naver')
+                        logger.info(f"근접 중복 기사 건너뜀: {news_item['title'][:30]}...")
+                        continue
+                    news_items.append(news_item)
+                    logger.info(f"뉴스 항목 추가됨: {news_item['title'][:30]}...")
+                    
+                    # Slack으로 즉시 전송
+                    self.send_to_slack(news_item, category)
+                
+                # 페이지 단위로 즉시 저장 (중복 표시된 기사 포함)
+                self.save_results(page_items, category)
+                if run:
+                    run.record_many('article', [(news_item['link'], news_item) for news_item in page_items])
+                new_count += len(page_items)
+                
+                # 이미 수집한 기사에 도달했거나 마지막 페이지면 중단
+                if reached_seen or len(items) < num_articles:
+                    break
+            else:
+                # 최대 페이지까지 읽고도 이전 수집 기사에 닿지 못함 (수집 간격이 너무 김)
+                saturated = last_seen_time is not None
+            
+            if newest_time and newest_time != last_seen_time:
+                with self._search_state_lock:
+                    self.search_state[state_key] = newest_time.isoformat()
+            # 성공한 수집만 속도에 반영 (쿼터 소진으로 요청하지 못했으면 기록하지 않음)
+            if self.poll_scheduler and requests_made:
+                self.poll_scheduler.record(
+                    naver_source(category, keyword), new_count,
+                    requests=requests_made, saturated=saturated
+                )
+            elif self.poll_scheduler:
+                self.poll_scheduler.retry_later(naver_source(category, keyword))
+            if run:
+                run.record('search', state_key, {
+                    'items': news_items,
+                    'newest': newest_time.isoformat() if newest_time else None
+                })
             
             logger.info(f"총 {len(news_items)}개의 뉴스 항목 수집 완료")
             return news_items
             
         except requests.exceptions.RequestException as e:
             logger.error(f"API 요청 중 오류 발생: {str(e)}")
-            return []
+            if self.poll_scheduler:
+                self.poll_scheduler.retry_later(naver_source(category, keyword))
+            return news_items
         except Exception as e:
             logger.error(f"뉴스 검색 중 오류 발생: {str(e)}")
-            return []
+            if self.poll_scheduler:
+                self.poll_scheduler.retry_later(naver_source(category, keyword))
+            return news_items
+
+    def _claim(self, link: str) -> Optional[str]:
+        """대표 URL 등록 (중단된 실행에서 이 크롤러가 등록한 URL은 중복으로 보지 않음)"""
+        duplicate_of = self.canonical_urls.claim(link, 'naver')
+        run = self._run
+        if run:
+            if duplicate_of and run.has('claim', link):
+                return None
+            if not duplicate_of:
+                run.record('claim', link)
+        return duplicate_of
 
     def send_to_slack(self, news_item: Dict, category: str):
-        """뉴스 항목을 해당 카테고리의 Slack 채널로 전송"""
+        """뉴스 항목을 해당 카테고리의 Slack 채널로 전송 (이번 실행에서 이미 전송한 기사는 건너뜀)"""
         if not self.slack_client:
             return
+        run = self._run
+        if run and run.has('post', news_item['link']):
+            return
 
         try:
             channel_name = self.config['search_keywords'][category]['channel']
@@ -114,62 +315,116 @@ class NaverNewsCrawler:
                 summary=news_item['summary']
             )
             
-            self.slack_client.chat_postMessage(
-                channel=channel_id,
-                text=message,
-                parse="mrkdwn"
+            # 전송을 시도하기 직전에 기록해 재시작 후 다시 보내지 않음
+            self.delivery_queue.enqueue(
+                channel_id, message,
+                on_send=partial(run.record, 'post', news_item['link']) if run else None
             )
-            logger.info(f"Slack 메시지 전송 완료: {channel_name} 채널 - {news_item['title'][:30]}...")
+            logger.info(f"Slack 전송 대기열 추가: {channel_name} 채널 - {news_item['title'][:30]}...")
             
-        except SlackApiError as e:
-            logger.error(f"Slack 메시지 전송 실패: {str(e)}")
+        except KeyError as e:
+            logger.error(f"필수 키가 누락되었습니다: {str(e)}. 뉴스 항목: {news_item}")
 
     def save_results(self, news_items: List[Dict], category: str):
-        """수집된 뉴스를 JSON 파일로 저장"""
+        """수집된 뉴스를 기사 저장소에 기록"""
         if not news_items:
             return
             
-        os.makedirs('results', exist_ok=True)
-        filename = f"results/news_{category}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(news_items, f, ensure_ascii=False, indent=2)
-        
-        logger.info(f"결과가 {filename}에 저장되었습니다.")
+        saved = self.article_store.add_many(news_items, crawler='naver')
+        logger.info(f"{category} 뉴스 {saved}건이 {self.article_store.db_file}에 저장되었습니다.")
+
+    def sources(self) -> List[str]:
+        """적응형 스케줄에서 사용할 키워드별 소스 이름"""
+        return [
+            naver_source(category, keyword)
+            for category, category_config in self.config['search_keywords'].items()
+            for keyword in category_config['keywords']
+        ]
 
-    def run_crawling(self):
-        """크롤링 실행"""
+    def run_crawling(self, profile: bool = False, sources: Iterable[str] = None):
+        """크롤링 실행 (profile=True면 이번 실행을 cProfile로 기록, sources가 있으면 해당 키워드만 검색)"""
+        metrics_settings = self.config.get('metrics_settings', {})
+        started = time.time()
+        succeeded = False
+        profiler = RunProfiler('naver', metrics_settings.get('profile_dir', 'profiles')) if profile else None
         try:
-            all_news_items = []
+            # 끝나지 않은 이전 실행이 있으면 그 실행의 키워드로 이어서 진행
+            self._run = self.journal.begin('naver', sources)
+            with profiler or nullcontext():
+                self._run_crawling(profiler, self._run.sources)
+            self._run.finish()
+            succeeded = True
+        except Exception as e:
+            logger.error(f"크롤링 중 오류 발생: {str(e)}")
+        finally:
+            self._run = None
+            # 실패한 실행에서 사용한 쿼터도 기록
+            self.rate_limiter.save()
+            metrics.record_run('naver', started, succeeded)
+            metrics.export(metrics_settings)
+
+    def _run_crawling(self, profiler: RunProfiler = None, sources: Iterable[str] = None):
+        """카테고리별 검색, 전송, 추천 (완료한 작업은 실행 저널에 기록)"""
+        run = self._run
+        search_news = profiler.wrap(self.search_news) if profiler else self.search_news
+        all_news_items = []
+        selected = set(sources) if sources is not None else None
+        search_keywords = {
+            category: dict(category_config, keywords=[
+                keyword for keyword in category_config['keywords']
+                if selected is None or naver_source(category, keyword) in selected
+            ])
+            for category, category_config in self.config['search_keywords'].items()
+        }
+        search_keywords = {
+            category: category_config for category, category_config in search_keywords.items()
+            if category_config['keywords']
+        }
+        
+        # 모든 카테고리의 키워드를 공유 제한기 아래에서 동시에 검색
+        jobs = [
+            (category, keyword, category_config['max_articles'])
+            for category, category_config in search_keywords.items()
+            for keyword in category_config['keywords']
+        ]
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='naver-search') as executor:
+            futures = {
+                (category, keyword): executor.submit(
+                    search_news,
+                    keyword=keyword,
+                    category=category,
+                    num_articles=max_articles
+                )
+                for category, keyword, max_articles in jobs
+            }
             
-            for category, category_config in self.config['search_keywords'].items():
+            for category, category_config in search_keywords.items():
                 logger.info(f"\n=== {category} 카테고리 크롤링 시작 ===")
                 
                 category_news_items = []
                 for keyword in category_config['keywords']:
-                    news_items = self.search_news(
-                        keyword=keyword,
-                        category=category,
-                        num_articles=category_config['max_articles']
-                    )
+                    news_items = futures[(category, keyword)].result()
                     category_news_items.extend(news_items)
                     all_news_items.extend(news_items)
                 
-                # 카테고리별 대표 뉴스 추천
-                if category_news_items and self.slack_client:
-                    representative_news = self.news_recommender.get_representative_news(category_news_items)
-                    if representative_news:
-                        self.news_recommender.send_recommendation(representative_news)
-                
-                self.save_results(
-                    [item for item in all_news_items if item['category'] == category],
-                    category
-                )
+                # 카테고리별 대표 뉴스 추천 (이어서 진행할 때는 이미 보낸 추천을 다시 보내지 않음)
+                if category_news_items and self.slack_client and not run.has('recommend', category):
+                    for representative_news in self.news_recommender.get_topic_representatives(
+                        category_news_items, category
+                    ):
+                        if run.once('recommendation', representative_news['link']):
+                            self.news_recommender.send_recommendation(representative_news)
+                    run.record('recommend', category)
                 
                 logger.info(f"=== {category} 카테고리 크롤링 완료 ===\n")
-                
-        except Exception as e:
-            logger.error(f"크롤링 중 오류 발생: {str(e)}")
+        
+        self._save_search_state()
+        self.near_duplicates.save()
+        if self.slack_client:
+            self.news_recommender.save_state()
+        if self.poll_scheduler:
+            self.poll_scheduler.save()
+        logger.info(f"네이버 API 남은 일일 쿼터: {self.rate_limiter.remaining_today}")
 
 def load_config(config_path='config.json'):
     """설정 파일 로드"""
@@ -194,8 +449,11 @@ def setup_schedule(crawler):
         logger.info(f"스케줄 등록: 매일 {execution_time}에 실행")
 
 def main():
+    # 단독 실행일 때만 로그 파일 지정 (데몬은 daemon.log를 사용)
+    setup_logging('crawler.log')
     parser = argparse.ArgumentParser(description='네이버 뉴스 크롤러')
     parser.add_argument('--run-now', action='store_true', help='크롤러 즉시 실행')
+    parser.add_argument('--profile', action='store_true', help='즉시 실행을 cProfile로 기록 (--run-now와 함께 사용)')
     args = parser.parse_args()
 
     try:
@@ -204,7 +462,10 @@ def main():
 
         if args.run_now:
             logger.info("크롤러를 즉시 실행합니다.")
-            crawler.run_crawling()
+            crawler.run_crawling(profile=args.profile)
+            # 대기 중인 Slack 메시지를 모두 보낸 뒤 종료
+            if crawler.slack_client:
+                crawler.delivery_queue.close()
             return
 
         setup_schedule(crawler)
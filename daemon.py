@@ -0,0 +1,228 @@
+import argparse
+import asyncio
+import functools
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+from slack_sdk import WebClient
+
+from logging_setup import setup_logging
+
+# 두 크롤러 모듈을 불러오기 전에 데몬 로그 파일을 지정 (파일 기록은 큐 리스너 스레드에서 처리)
+setup_logging('logs/daemon.log')
+
+from crawler import NaverNewsCrawler, load_config
+from rss_crawler import RSSNewsCrawler
+from http_client import HttpClient
+from news_recommender import NewsRecommender
+from slack_delivery import SlackDeliveryQueue
+from near_duplicate import NearDuplicateIndex
+from canonical_url import CanonicalUrlIndex
+from run_journal import RunJournal
+from report_builder import ReportBuilder
+from poll_scheduler import AdaptivePollScheduler, source_job
+
+logger = logging.getLogger(__name__)
+
+# 시스템 시계 변경이나 절전 복귀에 대비해 긴 대기도 이 간격마다 다시 계산
+MAX_SLEEP_SECONDS = 3600
+# 적응형 스케줄에서 수집할 소스를 다시 확인하는 최소 간격
+MIN_POLL_CHECK_SECONDS = 30
+
+
+def next_fire_time(execution_times: List[str], now: datetime) -> datetime:
+    """'HH:MM' 목록에서 now 이후 가장 가까운 실행 시각 계산"""
+    candidates = []
+    for execution_time in execution_times:
+        hour, minute = map(int, execution_time.split(':'))
+        fire = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        if fire <= now:
+            fire += timedelta(days=1)
+        candidates.append(fire)
+    return min(candidates)
+
+
+class CrawlerDaemon:
+    """네이버/RSS 크롤러를 하나의 이벤트 루프에서 실행하는 데몬
+
+    HTTP 클라이언트, Slack 전송 큐, 근접 중복/대표 URL 색인, 뉴스 추천기(임베딩 모델)를 한 번만 만들어
+    두 크롤러가 공유합니다. 각 작업은 다음 실행 시각까지 잠들었다가 깨어나며,
+    이전 실행이 끝나지 않았으면 이번 실행을 건너뜁니다. schedule_settings.adaptive가
+    켜져 있으면 고정 시각 대신 키워드/피드별로 새 기사 속도에 맞춘 시각에 해당 소스만 수집합니다.
+    """
+
+    def __init__(self, config: Dict):
+        self.config = config
+        self.http_client = HttpClient(config)
+
+        delivery_queue = None
+        news_recommender = None
+        slack_settings = config['slack_settings']
+        if slack_settings['enabled']:
+            slack_client = WebClient(
+                token=slack_settings['bot_token'],
+                base_url=slack_settings.get('base_url', WebClient.BASE_URL)
+            )
+            delivery_queue = SlackDeliveryQueue.from_settings(slack_client, slack_settings)
+            news_recommender = NewsRecommender.from_config(slack_client, config)
+        self.delivery_queue = delivery_queue
+        near_duplicates = NearDuplicateIndex.from_config(config)
+        self.canonical_urls = CanonicalUrlIndex.from_config(config)
+        self.journal = RunJournal.from_config(config)
+
+        # 적응형 스케줄을 켜면 두 크롤러가 소스별 수집 결과를 하나의 스케줄러에 기록
+        adaptive_settings = config['schedule_settings'].get('adaptive', {})
+        self.poll_scheduler: Optional[AdaptivePollScheduler] = None
+        if adaptive_settings.get('enabled', False):
+            self.poll_scheduler = AdaptivePollScheduler.from_settings(adaptive_settings)
+
+        self.jobs: Dict[str, Callable] = {}
+        self.sources: List[str] = []
+        naver_crawler = NaverNewsCrawler(
+            config, self.http_client, delivery_queue, news_recommender, near_duplicates,
+            self.poll_scheduler, self.canonical_urls, self.journal
+        )
+        self.jobs['naver'] = naver_crawler.run_crawling
+        self.sources.extend(naver_crawler.sources())
+        if config.get('rss_settings', {}).get('enabled', True):
+            rss_crawler = RSSNewsCrawler(
+                config, self.http_client, delivery_queue, news_recommender, near_duplicates,
+                self.poll_scheduler, self.canonical_urls, self.journal
+            )
+            self.jobs['rss'] = rss_crawler.run_crawling
+            self.sources.extend(rss_crawler.sources())
+        # 실행이 끝날 때마다 새로 저장된 기사를 날짜별 리포트에 이어 씀
+        self.report_builder = None
+        if config.get('report_settings', {}).get('enabled', True):
+            self.report_builder = ReportBuilder.from_config(config, naver_crawler.article_store)
+        self._report_lock = None
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._tasks = set()
+
+    def _job_running(self, name: str) -> bool:
+        lock = self._locks.get(name)
+        return lock is not None and lock.locked()
+
+    async def run_job(self, name: str, profile: bool = False, sources: List[str] = None):
+        """작업 실행 (같은 작업이 실행 중이면 건너뜀, sources가 있으면 해당 소스만 수집)"""
+        lock = self._locks.setdefault(name, asyncio.Lock())
+        if lock.locked():
+            logger.warning(f"[{name}] 이전 실행이 아직 진행 중이어서 이번 실행을 건너뜁니다.")
+            return
+        async with lock:
+            logger.info(f"[{name}] 실행 시작" + (f" (소스 {len(sources)}개)" if sources is not None else ""))
+            started = datetime.now()
+            # 크롤러는 블로킹 I/O를 사용하므로 작업 스레드에서 실행
+            await asyncio.get_running_loop().run_in_executor(
+                None, functools.partial(self.jobs[name], profile=profile, sources=sources)
+            )
+            logger.info(f"[{name}] 실행 완료 ({(datetime.now() - started).total_seconds():.1f}초)")
+        await self.update_reports()
+
+    async def update_reports(self):
+        """리포트 갱신 (두 크롤러의 실행 완료가 겹치면 차례로 반영)"""
+        if not self.report_builder:
+            return
+        if self._report_lock is None:
+            self._report_lock = asyncio.Lock()
+        async with self._report_lock:
+            try:
+                await asyncio.get_running_loop().run_in_executor(None, self.report_builder.update)
+            except Exception as e:
+                logger.error(f"리포트 갱신 실패: {str(e)}")
+
+    async def _schedule_loop(self, name: str, execution_times: List[str]):
+        """다음 실행 시각까지 대기 후 작업 실행을 반복"""
+        while True:
+            fire = next_fire_time(execution_times, datetime.now())
+            logger.info(f"[{name}] 다음 실행 시각: {fire.strftime('%Y-%m-%d %H:%M')}")
+            while True:
+                delay = (fire - datetime.now()).total_seconds()
+                if delay <= 0:
+                    break
+                await asyncio.sleep(min(delay, MAX_SLEEP_SECONDS))
+            self._start(self.run_job(name))
+
+    async def _adaptive_loop(self):
+        """수집할 때가 된 소스만 모아 작업별로 실행을 반복"""
+        while True:
+            due: Dict[str, List[str]] = {}
+            for source in self.poll_scheduler.due(self.sources):
+                due.setdefault(source_job(source), []).append(source)
+            for name, sources in due.items():
+                # 실행 중인 작업의 소스는 실행이 끝나고 기록된 뒤 다시 판단
+                if name in self.jobs and not self._job_running(name):
+                    self._start(self.run_job(name, sources=sources))
+
+            next_poll = self.poll_scheduler.next_poll_time(self.sources)
+            delay = min(max(next_poll - time.time(), MIN_POLL_CHECK_SECONDS), MAX_SLEEP_SECONDS)
+            await asyncio.sleep(delay)
+
+    def _start(self, coroutine):
+        task = asyncio.ensure_future(coroutine)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def run_now(self, profile: bool = False):
+        """모든 작업을 즉시 한 번 실행"""
+        await asyncio.gather(*(self.run_job(name, profile) for name in self.jobs))
+
+    async def serve(self):
+        """스케줄 모드 실행"""
+        schedule_settings = self.config['schedule_settings']
+        if not schedule_settings['enabled']:
+            logger.info("스케줄이 비활성화되어 있습니다.")
+            return
+        if self.poll_scheduler:
+            adaptive_settings = schedule_settings['adaptive']
+            logger.info(
+                f"적응형 스케줄: 소스 {len(self.sources)}개, "
+                f"간격 {adaptive_settings.get('min_interval_minutes', 30)}~"
+                f"{adaptive_settings.get('max_interval_minutes', 720)}분"
+            )
+            await self._adaptive_loop()
+            return
+        logger.info(f"실행 시간: {', '.join(schedule_settings['execution_times'])}")
+        await asyncio.gather(*(
+            self._schedule_loop(name, schedule_settings['execution_times'])
+            for name in self.jobs
+        ))
+
+    def close(self):
+        """대기 중인 Slack 메시지를 보내고 연결 정리"""
+        if self.delivery_queue:
+            self.delivery_queue.close()
+        self.canonical_urls.close()
+        self.journal.close()
+        self.http_client.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='뉴스 크롤러 통합 데몬')
+    parser.add_argument('--run-now', action='store_true', help='모든 크롤러 즉시 실행')
+    parser.add_argument('--profile', action='store_true', help='즉시 실행을 cProfile로 기록 (--run-now와 함께 사용)')
+    args = parser.parse_args()
+
+    daemon = None
+    try:
+        config = load_config()
+        daemon = CrawlerDaemon(config)
+        if args.run_now:
+            logger.info("모든 크롤러를 즉시 실행합니다.")
+            asyncio.run(daemon.run_now(args.profile))
+        else:
+            logger.info("크롤러 데몬이 스케줄 모드로 실행됩니다.")
+            asyncio.run(daemon.serve())
+    except KeyboardInterrupt:
+        logger.info("프로그램이 사용자에 의해 종료되었습니다.")
+    except Exception as e:
+        logger.error(f"프로그램 실행 중 오류 발생: {str(e)}")
+    finally:
+        if daemon:
+            daemon.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+import argparse
+import hashlib
+import logging
+import os
+import threading
+from abc import ABC, abstractmethod
+from typing import Dict, List, Union
+
+import numpy as np
+
+from metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+MODEL_NAME = 'sentence-transformers/paraphrase-MiniLM-L3-v2'
+DEFAULT_ONNX_PATH = 'models/paraphrase-MiniLM-L3-v2-int8.onnx'
+
+PARITY_TEXTS = [
+    "KT 클라우드, 금융권 전용 클라우드 서비스 출시",
+    "엔비디아, 차세대 AI 가속기 공개",
+    "미국 관세 정책에 반도체 업계 긴장",
+    "교육부, 고교 학점제 운영 개선안 발표",
+    "AWS announces new generative AI services for enterprises",
+]
+
+
+class EmbeddingBackend(ABC):
+    """문장 임베딩 백엔드 인터페이스 (SentenceTransformer.encode와 같은 형태)"""
+
+    def encode(self, texts: Union[str, List[str]], batch_size: int = 32) -> np.ndarray:
+        """문자열 하나면 1차원, 목록이면 (N, D) float32 배열 반환"""
+        single = isinstance(texts, str)
+        texts = [texts] if single else list(texts)
+        with metrics.timer('embedding'):
+            embeddings = self._encode(texts, batch_size)
+        metrics.inc('embedded_texts_total', len(texts))
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        return embeddings[0] if single else embeddings
+
+    @abstractmethod
+    def _encode(self, texts: List[str], batch_size: int) -> np.ndarray:
+        """텍스트 목록을 (N, D) 배열로 인코딩"""
+
+
+class SentenceTransformerBackend(EmbeddingBackend):
+    """sentence-transformers(torch) 백엔드, 첫 인코딩 시점에 모델 로드"""
+
+    def __init__(self, model_name: str = MODEL_NAME):
+        self.model_name = model_name
+        self._model = None
+        self._lock = threading.Lock()
+
+    @property
+    def model(self):
+        with self._lock:
+            if self._model is None:
+                logger.info(f"임베딩 모델 로드 중: {self.model_name}")
+                from sentence_transformers import SentenceTransformer
+                self._model = SentenceTransformer(self.model_name)
+        return self._model
+
+    def _encode(self, texts: List[str], batch_size: int) -> np.ndarray:
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+        return self.model.encode(texts, batch_size=batch_size)
+
+
+class OnnxBackend(EmbeddingBackend):
+    """ONNX Runtime으로 int8 양자화 모델을 실행하는 백엔드
+
+    torch 없이 동작하며, 토큰화는 tokenizers 패키지를 사용합니다.
+    MiniLM 계열 sentence-transformers와 같은 평균 풀링을 적용합니다.
+    """
+
+    def __init__(self, model_path: str = DEFAULT_ONNX_PATH, tokenizer_name: str = MODEL_NAME,
+                 max_length: int = 128):
+        self.model_path = model_path
+        self.tokenizer_name = tokenizer_name
+        self.max_length = max_length
+        self._session = None
+        self._tokenizer = None
+        self._input_names = ()
+        self._lock = threading.Lock()
+
+    def _load(self):
+        with self._lock:
+            if self._session is not None:
+                return
+            logger.info(f"ONNX 임베딩 모델 로드 중: {self.model_path}")
+            import onnxruntime
+            from tokenizers import Tokenizer
+
+            options = onnxruntime.SessionOptions()
+            options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+            session = onnxruntime.InferenceSession(
+                self.model_path, options, providers=['CPUExecutionProvider']
+            )
+            tokenizer = Tokenizer.from_pretrained(self.tokenizer_name)
+            tokenizer.enable_truncation(max_length=self.max_length)
+            tokenizer.enable_padding()
+            self._input_names = tuple(node.name for node in session.get_inputs())
+            self._tokenizer = tokenizer
+            self._session = session
+
+    def _encode(self, texts: List[str], batch_size: int) -> np.ndarray:
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+        self._load()
+        results = []
+        for start in range(0, len(texts), batch_size):
+            encodings = self._tokenizer.encode_batch(texts[start:start + batch_size])
+            input_ids = np.array([e.ids for e in encodings], dtype=np.int64)
+            attention_mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+            feeds = {'input_ids': input_ids, 'attention_mask': attention_mask}
+            if 'token_type_ids' in self._input_names:
+                feeds['token_type_ids'] = np.array([e.type_ids for e in encodings], dtype=np.int64)
+            token_embeddings = self._session.run(None, feeds)[0]
+
+            # 평균 풀링 (패딩 토큰 제외)
+            mask = attention_mask[:, :, np.newaxis].astype(np.float32)
+            summed = (token_embeddings * mask).sum(axis=1)
+            results.append(summed / np.maximum(mask.sum(axis=1), 1e-9))
+        return np.vstack(results)
+
+
+class HashingBackend(EmbeddingBackend):
+    """문자 n-gram 해싱 임베딩 (모델 없이 동작하는 로컬 대체 백엔드, 벤치마크/오프라인용)"""
+
+    def __init__(self, dim: int = 384, ngram: int = 3):
+        self.dim = dim
+        self.ngram = ngram
+
+    def _encode(self, texts: List[str], batch_size: int) -> np.ndarray:
+        embeddings = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            text = ' '.join(text.lower().split())
+            for i in range(max(len(text) - self.ngram + 1, 1)):
+                digest = hashlib.blake2b(text[i:i + self.ngram].encode('utf-8'), digest_size=8).digest()
+                value = int.from_bytes(digest, 'big')
+                embeddings[row, value % self.dim] += 1.0 if value >> 63 else -1.0
+        return embeddings
+
+
+def create_backend(settings: Dict = None) -> EmbeddingBackend:
+    """설정에 맞는 임베딩 백엔드 생성 (ONNX를 쓸 수 없으면 torch 경로로 대체)"""
+    settings = settings or {}
+    name = settings.get('embedding_backend', 'sentence-transformers')
+    if name == 'onnx':
+        model_path = settings.get('onnx_model_path', DEFAULT_ONNX_PATH)
+        try:
+            import onnxruntime  # noqa: F401
+            import tokenizers  # noqa: F401
+        except ImportError:
+            logger.warning("onnxruntime/tokenizers가 설치되어 있지 않아 sentence-transformers 백엔드를 사용합니다.")
+        else:
+            if os.path.exists(model_path):
+                return OnnxBackend(model_path)
+            logger.warning(f"ONNX 모델 파일이 없어 sentence-transformers 백엔드를 사용합니다: {model_path}")
+    elif name == 'hashing':
+        return HashingBackend()
+    elif name != 'sentence-transformers':
+        raise ValueError(f"알 수 없는 임베딩 백엔드: {name}")
+    return SentenceTransformerBackend(settings.get('model_name', MODEL_NAME))
+
+
+def check_parity(reference: EmbeddingBackend, candidate: EmbeddingBackend,
+                 texts: List[str] = None, min_cosine: float = 0.98) -> float:
+    """두 백엔드 임베딩의 코사인 유사도 최소값을 계산하고 기준 미달 시 경고"""
+    texts = texts or PARITY_TEXTS
+    expected = reference.encode(texts)
+    actual = candidate.encode(texts)
+    expected = expected / np.linalg.norm(expected, axis=1, keepdims=True)
+    actual = actual / np.linalg.norm(actual, axis=1, keepdims=True)
+    worst = float(np.min(np.sum(expected * actual, axis=1)))
+    if worst < min_cosine:
+        logger.warning(f"임베딩 백엔드 정합성 미달: 최소 코사인 {worst:.4f} < {min_cosine}")
+    else:
+        logger.info(f"임베딩 백엔드 정합성 확인: 최소 코사인 {worst:.4f}")
+    return worst
+
+
+def export_quantized_onnx(output_path: str = DEFAULT_ONNX_PATH, model_name: str = MODEL_NAME):
+    """Hugging Face 모델을 ONNX로 내보낸 뒤 int8 동적 양자화 (torch/transformers 필요)"""
+    import torch
+    from transformers import AutoModel, AutoTokenizer
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    directory = os.path.dirname(output_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    model = AutoModel.from_pretrained(model_name)
+    model.eval()
+
+    sample = tokenizer(PARITY_TEXTS[:2], padding=True, return_tensors='pt')
+    input_names = [name for name in ('input_ids', 'attention_mask', 'token_type_ids') if name in sample]
+    dynamic_axes = {name: {0: 'batch', 1: 'sequence'} for name in input_names}
+    dynamic_axes['last_hidden_state'] = {0: 'batch', 1: 'sequence'}
+
+    fp32_path = os.path.splitext(output_path)[0] + '-fp32.onnx'
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            tuple(sample[name] for name in input_names),
+            fp32_path,
+            input_names=input_names,
+            output_names=['last_hidden_state'],
+            dynamic_axes=dynamic_axes,
+            opset_version=14
+        )
+    quantize_dynamic(fp32_path, output_path, weight_type=QuantType.QInt8)
+    os.remove(fp32_path)
+    logger.info(f"int8 양자화 ONNX 모델 저장 완료: {output_path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='임베딩 백엔드 도구')
+    parser.add_argument('command', choices=['export', 'parity'], help='export: ONNX 내보내기, parity: torch 경로와 비교')
+    parser.add_argument('--onnx-path', default=DEFAULT_ONNX_PATH, help='ONNX 모델 경로')
+    parser.add_argument('--min-cosine', type=float, default=0.98, help='정합성 기준 코사인 유사도')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    if args.command == 'export':
+        export_quantized_onnx(args.onnx_path)
+    worst = check_parity(SentenceTransformerBackend(), OnnxBackend(args.onnx_path), min_cosine=args.min_cosine)
+    if worst < args.min_cosine:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
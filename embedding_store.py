@@ -0,0 +1,149 @@
+import hashlib
+import json
+import logging
+import os
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def link_hash(link: str) -> str:
+    """링크를 고정 길이 해시 키로 변환"""
+    return hashlib.sha1(link.encode('utf-8')).hexdigest()
+
+
+class EmbeddingStore:
+    """전송된 뉴스 임베딩을 float32 행렬로 디스크에 보관하는 저장소
+
+    행렬은 `.npy` 파일로, 행 순서에 대응하는 링크 해시 목록은 `_keys.json` 파일로
+    저장합니다. 로드 시 행렬은 메모리 매핑되므로 캐시된 요약을 다시 인코딩하지 않습니다.
+    추가/정리한 내용은 메모리에 모아 두었다가 save()를 호출할 때 한 번에 기록합니다.
+    벡터는 정규화된 상태로 저장되어 내적만으로 코사인 유사도를 구할 수 있습니다.
+    """
+
+    def __init__(self, matrix_file: str = 'news_embeddings.npy'):
+        self.matrix_file = matrix_file
+        self.keys_file = os.path.splitext(matrix_file)[0] + '_keys.json'
+        self.keys: List[str] = []
+        self.matrix: Optional[np.ndarray] = None
+        self._index: Dict[str, int] = {}
+        self._dirty = False
+        self._load()
+
+    def _load(self):
+        """저장된 행렬(메모리 매핑)과 키 목록 로드"""
+        if not (os.path.exists(self.matrix_file) and os.path.exists(self.keys_file)):
+            return
+        try:
+            with open(self.keys_file, 'r', encoding='utf-8') as f:
+                keys = json.load(f)
+            matrix = np.load(self.matrix_file, mmap_mode='r')
+            if matrix.ndim != 2 or matrix.shape[0] != len(keys):
+                logger.warning("임베딩 저장소가 키 목록과 일치하지 않아 초기화합니다.")
+                return
+            self.keys = keys
+            self.matrix = matrix
+            self._index = {key: i for i, key in enumerate(keys)}
+        except Exception as e:
+            logger.error(f"임베딩 저장소 로드 실패: {str(e)}")
+
+    def _save(self):
+        """행렬과 키 목록을 임시 파일에 쓴 뒤 교체"""
+        try:
+            directory = os.path.dirname(self.matrix_file)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            matrix = self.matrix if self.matrix is not None else np.zeros((0, 0), dtype=np.float32)
+            tmp_matrix = self.matrix_file + '.tmp'
+            with open(tmp_matrix, 'wb') as f:
+                np.save(f, np.ascontiguousarray(matrix, dtype=np.float32))
+            tmp_keys = self.keys_file + '.tmp'
+            with open(tmp_keys, 'w', encoding='utf-8') as f:
+                json.dump(self.keys, f)
+            os.replace(tmp_matrix, self.matrix_file)
+            os.replace(tmp_keys, self.keys_file)
+            if self.keys:
+                self.matrix = np.load(self.matrix_file, mmap_mode='r')
+            self._dirty = False
+        except Exception as e:
+            logger.error(f"임베딩 저장소 저장 실패: {str(e)}")
+
+    def save(self):
+        """마지막 저장 이후 바뀐 내용이 있으면 파일에 기록"""
+        if self._dirty:
+            self._save()
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __contains__(self, link: str) -> bool:
+        return link_hash(link) in self._index
+
+    @staticmethod
+    def normalize(embeddings: np.ndarray) -> np.ndarray:
+        """행 단위 L2 정규화 (float32)"""
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        if embeddings.ndim == 1:
+            embeddings = embeddings[np.newaxis, :]
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        return embeddings / np.maximum(norms, 1e-8)
+
+    def vectors(self) -> np.ndarray:
+        """저장된 정규화 임베딩 행렬 반환 (비어 있으면 0행)"""
+        if self.matrix is None or not self.keys:
+            return np.zeros((0, 0), dtype=np.float32)
+        return self.matrix
+
+    def get(self, link: str) -> Optional[np.ndarray]:
+        """링크의 정규화 임베딩 (없으면 None)"""
+        row = self._index.get(link_hash(link))
+        if row is None or self.matrix is None:
+            return None
+        return np.array(self.matrix[row], dtype=np.float32)
+
+    def add_many(self, links: Iterable[str], embeddings: np.ndarray):
+        """링크별 임베딩 추가 (이미 있는 링크는 덮어씀)"""
+        links = list(links)
+        if not links:
+            return
+        vectors = self.normalize(embeddings)
+        matrix = np.array(self.matrix, dtype=np.float32) if self.keys else np.zeros((0, vectors.shape[1]), dtype=np.float32)
+        existing = len(matrix)
+        new_rows = []
+        for link, vector in zip(links, vectors):
+            key = link_hash(link)
+            row = self._index.get(key)
+            if row is None:
+                self._index[key] = len(self.keys)
+                self.keys.append(key)
+                new_rows.append(vector)
+            elif row < existing:
+                matrix[row] = vector
+            else:
+                # 같은 배치에서 앞서 추가한 링크
+                new_rows[row - existing] = vector
+        if new_rows:
+            matrix = np.vstack([matrix, np.stack(new_rows)])
+        self.matrix = matrix
+        self._dirty = True
+
+    def add(self, link: str, embedding: np.ndarray):
+        """단일 링크의 임베딩 추가"""
+        self.add_many([link], embedding)
+
+    def prune(self, keep_links: Iterable[str]):
+        """유지할 링크 외의 임베딩 제거"""
+        keep = {link_hash(link) for link in keep_links}
+        rows = [i for i, key in enumerate(self.keys) if key in keep]
+        if len(rows) == len(self.keys):
+            return
+        self.keys = [self.keys[i] for i in rows]
+        self._index = {key: i for i, key in enumerate(self.keys)}
+        if self.keys:
+            self.matrix = np.array(self.matrix[rows], dtype=np.float32)
+        else:
+            self.matrix = None
+        self._dirty = True
+        logger.info(f"만료된 임베딩 정리 완료: {len(self.keys)}개 유지")
@@ -0,0 +1,97 @@
+import calendar
+import json
+import logging
+import os
+import threading
+from typing import Dict, List
+
+logger = logging.getLogger(__name__)
+
+
+def entry_guid(entry) -> str:
+    """피드 항목의 고유 식별자 (guid가 없으면 링크)"""
+    return entry.get('id') or entry.get('link')
+
+
+def entry_timestamp(entry) -> float:
+    """피드 항목의 발행 시각 (UTC epoch, 없으면 None)"""
+    parsed = entry.get('published_parsed') or entry.get('updated_parsed')
+    return calendar.timegm(parsed) if parsed else None
+
+
+class FeedStateStore:
+    """피드별 조건부 요청 헤더와 마지막으로 처리한 항목 정보를 보관
+
+    피드 URL마다 ETag, Last-Modified, 가장 최근 항목의 guid와 발행 시각을
+    저장하여 다음 실행에서 304 응답이나 이미 처리한 항목을 건너뛸 수 있게 합니다.
+    """
+
+    def __init__(self, state_file: str = 'rss_feed_state.json'):
+        self.state_file = state_file
+        self._lock = threading.Lock()
+        self.state = self._load()
+
+    def _load(self) -> Dict:
+        """상태 파일 로드"""
+        if os.path.exists(self.state_file):
+            try:
+                with open(self.state_file, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except Exception as e:
+                logger.error(f"피드 상태 파일 로드 실패: {str(e)}")
+        return {}
+
+    def _save(self):
+        """상태 파일을 임시 파일에 쓴 뒤 교체"""
+        try:
+            tmp_file = self.state_file + '.tmp'
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(self.state, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_file, self.state_file)
+        except Exception as e:
+            logger.error(f"피드 상태 파일 저장 실패: {str(e)}")
+
+    def get(self, feed_url: str) -> Dict:
+        with self._lock:
+            return dict(self.state.get(feed_url, {}))
+
+    def conditional_headers(self, feed_url: str) -> Dict:
+        """저장된 ETag/Last-Modified로 조건부 요청 헤더 생성"""
+        feed_state = self.get(feed_url)
+        headers = {}
+        if feed_state.get('etag'):
+            headers['If-None-Match'] = feed_state['etag']
+        if feed_state.get('last_modified'):
+            headers['If-Modified-Since'] = feed_state['last_modified']
+        return headers
+
+    def new_entries(self, feed_url: str, entries: List) -> List:
+        """이미 처리한 항목이 처음 나오기 전까지의 새 항목만 반환"""
+        feed_state = self.get(feed_url)
+        last_guid = feed_state.get('last_guid')
+        last_published = feed_state.get('last_published')
+
+        fresh = []
+        for entry in entries:
+            published = entry_timestamp(entry)
+            if entry_guid(entry) == last_guid:
+                break
+            if last_published is not None and published is not None and published <= last_published:
+                break
+            fresh.append(entry)
+        return fresh
+
+    def update(self, feed_url: str, response_headers: Dict, entries: List):
+        """응답 헤더와 처리한 항목으로 피드 상태 갱신"""
+        with self._lock:
+            feed_state = self.state.setdefault(feed_url, {})
+            if response_headers.get('ETag'):
+                feed_state['etag'] = response_headers['ETag']
+            if response_headers.get('Last-Modified'):
+                feed_state['last_modified'] = response_headers['Last-Modified']
+            if entries:
+                feed_state['last_guid'] = entry_guid(entries[0])
+                timestamps = [t for t in map(entry_timestamp, entries) if t is not None]
+                if timestamps:
+                    feed_state['last_published'] = max(timestamps + [feed_state.get('last_published') or 0])
+            self._save()
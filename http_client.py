@@ -0,0 +1,116 @@
+import codecs
+import logging
+import re
+import time
+from typing import Dict, Iterator, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+try:
+    import brotli  # noqa: F401  urllib3이 br 인코딩을 해제할 수 있을 때만 요청
+    ACCEPT_ENCODING = 'gzip, deflate, br'
+except ImportError:
+    ACCEPT_ENCODING = 'gzip, deflate'
+
+USER_AGENT = 'Mozilla/5.0 (compatible; NewsCrawler/1.0)'
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+_META_CHARSET = re.compile(rb'<meta[^>]+charset=["\']?([\w-]+)', re.IGNORECASE)
+
+
+class HttpClient:
+    """두 크롤러가 공유하는 HTTP 클라이언트
+
+    호스트별 keep-alive 커넥션 풀, 설정 기반 연결/읽기 타임아웃,
+    429/5xx 응답에 대한 지수 백오프 재시도, 압축 전송, 최대 크기 제한이 있는
+    스트리밍 본문 읽기를 제공합니다.
+    """
+
+    def __init__(self, config: Dict):
+        settings = config.get('crawler_settings', {})
+        # 설정의 시간 값은 밀리초 단위
+        self.connect_timeout = settings.get('connect_timeout', 5000) / 1000
+        self.read_timeout = settings.get('timeout', 30000) / 1000
+        self.max_body_bytes = settings.get('max_body_bytes', 2 * 1024 * 1024)
+        pool_size = settings.get('pool_maxsize', settings.get('max_workers', 8))
+
+        retry = Retry(
+            total=settings.get('max_retries', 3),
+            connect=settings.get('max_retries', 3),
+            read=settings.get('max_retries', 3),
+            status=settings.get('max_retries', 3),
+            backoff_factor=settings.get('backoff_factor', 0.5),
+            status_forcelist=RETRY_STATUS_CODES,
+            allowed_methods=frozenset(['GET', 'HEAD']),
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(
+            pool_connections=settings.get('pool_connections', 16),
+            pool_maxsize=pool_size,
+            max_retries=retry
+        )
+
+        self.session = requests.Session()
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers.update({
+            'User-Agent': USER_AGENT,
+            'Accept-Encoding': ACCEPT_ENCODING
+        })
+
+    @property
+    def timeout(self):
+        return (self.connect_timeout, self.read_timeout)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """타임아웃과 재시도가 적용된 GET 요청"""
+        kwargs.setdefault('timeout', self.timeout)
+        return self.session.get(url, **kwargs)
+
+    def iter_text(self, url: str, max_bytes: Optional[int] = None,
+                  chunk_size: int = 8192, **kwargs) -> Iterator[str]:
+        """본문을 디코딩된 텍스트 청크로 스트리밍
+
+        호출 측이 필요한 만큼 읽고 중단하면(제너레이터 close) 나머지 본문은 받지 않습니다.
+        Content-Type에 문자셋이 없으면 첫 청크의 meta charset, 그다음 UTF-8을 사용합니다.
+        """
+        max_bytes = max_bytes or self.max_body_bytes
+        kwargs.setdefault('timeout', self.timeout)
+        response = self.session.get(url, stream=True, **kwargs)
+        try:
+            response.raise_for_status()
+            decoder = None
+            size = 0
+            deadline = time.monotonic() + self.read_timeout
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                if decoder is None:
+                    encoding = None
+                    if 'charset' in response.headers.get('Content-Type', '').lower():
+                        encoding = response.encoding
+                    if not encoding:
+                        match = _META_CHARSET.search(chunk)
+                        encoding = match.group(1).decode('ascii') if match else 'utf-8'
+                    try:
+                        decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+                    except LookupError:
+                        decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+                chunk = chunk[:max_bytes - size]
+                size += len(chunk)
+                yield decoder.decode(chunk)
+                if size >= max_bytes:
+                    logger.info(f"본문 최대 크기({max_bytes} bytes)에 도달하여 읽기 중단: {url}")
+                    break
+                if time.monotonic() > deadline:
+                    logger.warning(f"본문 읽기 제한 시간 초과로 중단: {url}")
+                    break
+            if decoder is not None:
+                yield decoder.decode(b'', final=True)
+        finally:
+            response.close()
+
+    def close(self):
+        self.session.close()
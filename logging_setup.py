@@ -0,0 +1,43 @@
+import atexit
+import logging
+import os
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+_listener: Optional[QueueListener] = None
+
+
+def setup_logging(log_file: Optional[str] = None, level: int = logging.INFO) -> QueueListener:
+    """루트 로거를 큐 핸들러로 설정하고 콘솔/파일 기록은 별도 스레드에서 처리
+
+    basicConfig처럼 처음 호출만 적용되며, 크롤링 스레드는 레코드를 큐에 넣기만 하므로
+    기사별 로그의 파일 쓰기가 수집 경로를 막지 않습니다. 종료 시 남은 레코드를 모두 기록합니다.
+    """
+    global _listener
+    if _listener is not None:
+        return _listener
+
+    formatter = logging.Formatter(LOG_FORMAT)
+    handlers = [logging.StreamHandler()]
+    if log_file:
+        directory = os.path.dirname(log_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        handlers.append(logging.FileHandler(log_file, encoding='utf-8'))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue = queue.SimpleQueue()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(QueueHandler(log_queue))
+    root.setLevel(level)
+
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
+    return _listener
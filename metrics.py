@@ -0,0 +1,238 @@
+import bisect
+import cProfile
+import io
+import json
+import logging
+import os
+import pstats
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+PREFIX = 'news_crawler'
+# 단계별 지연 시간 히스토그램 구간 (초)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+LabelKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+def _key(name: str, labels: Dict[str, str]) -> LabelKey:
+    return name, tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+class Histogram:
+    """누적 구간별 관측 수와 합계 (Prometheus histogram과 같은 형태)"""
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        index = bisect.bisect_left(self.buckets, value)
+        if index < len(self.buckets):
+            self.counts[index] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self) -> List[int]:
+        total = 0
+        result = []
+        for count in self.counts:
+            total += count
+            result.append(total)
+        return result
+
+
+class MetricsRegistry:
+    """크롤링 단계별 카운터와 지연 시간 히스토그램 모음
+
+    두 크롤러와 공유 구성 요소(HTTP 클라이언트, 번역기, 추천기, Slack 전송 큐)가
+    모듈 전역 인스턴스 `metrics`에 기록하며, 값은 프로세스 수명 동안 누적됩니다.
+    실행이 끝날 때 Prometheus textfile 또는 JSON 요약으로 내보냅니다.
+    """
+
+    def __init__(self):
+        self.counters: Dict[LabelKey, float] = {}
+        self.histograms: Dict[LabelKey, Histogram] = {}
+        self.runs: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, name: str, value: float = 1, **labels):
+        """카운터 증가"""
+        key = _key(name, labels)
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels):
+        """히스토그램 관측값 기록"""
+        key = _key(name, labels)
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.observe(value)
+
+    @contextmanager
+    def timer(self, stage: str, **labels):
+        """블록 실행 시간을 stage_seconds{stage=...}에 기록"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe('stage_seconds', time.perf_counter() - started, stage=stage, **labels)
+
+    def record_run(self, crawler: str, started: float, succeeded: bool):
+        """크롤러 실행 결과 기록"""
+        seconds = time.time() - started
+        self.observe('run_seconds', seconds, crawler=crawler)
+        self.inc('runs_total', crawler=crawler, status='ok' if succeeded else 'error')
+        with self._lock:
+            self.runs[crawler] = {
+                'started_at': datetime.fromtimestamp(started).isoformat(timespec='seconds'),
+                'seconds': round(seconds, 3),
+                'status': 'ok' if succeeded else 'error',
+            }
+
+    def snapshot(self) -> Dict:
+        """JSON으로 직렬화할 수 있는 현재 값"""
+        with self._lock:
+            counters = [
+                {'name': name, 'labels': dict(labels), 'value': value}
+                for (name, labels), value in sorted(self.counters.items())
+            ]
+            histograms = [
+                {
+                    'name': name, 'labels': dict(labels), 'count': histogram.count,
+                    'sum': round(histogram.sum, 6),
+                    'mean': round(histogram.sum / histogram.count, 6) if histogram.count else None,
+                    'buckets': dict(zip(map(str, histogram.buckets), histogram.cumulative())),
+                }
+                for (name, labels), histogram in sorted(self.histograms.items())
+            ]
+            runs = dict(self.runs)
+        return {
+            'generated_at': datetime.now().isoformat(timespec='seconds'),
+            'runs': runs,
+            'counters': counters,
+            'histograms': histograms,
+        }
+
+    def prometheus_text(self) -> str:
+        """Prometheus 텍스트 노출 형식"""
+        def format_labels(labels, extra=()):
+            pairs = list(labels) + list(extra)
+            if not pairs:
+                return ''
+            return '{' + ','.join(f'{key}="{value}"' for key, value in pairs) + '}'
+
+        lines = []
+        with self._lock:
+            typed = set()
+            for (name, labels), value in sorted(self.counters.items()):
+                metric = f"{PREFIX}_{name}"
+                if metric not in typed:
+                    lines.append(f"# TYPE {metric} counter")
+                    typed.add(metric)
+                lines.append(f"{metric}{format_labels(labels)} {value}")
+            for (name, labels), histogram in sorted(self.histograms.items()):
+                metric = f"{PREFIX}_{name}"
+                if metric not in typed:
+                    lines.append(f"# TYPE {metric} histogram")
+                    typed.add(metric)
+                for bound, count in zip(histogram.buckets, histogram.cumulative()):
+                    lines.append(f"{metric}_bucket{format_labels(labels, [('le', bound)])} {count}")
+                lines.append(f"{metric}_bucket{format_labels(labels, [('le', '+Inf')])} {histogram.count}")
+                lines.append(f"{metric}_sum{format_labels(labels)} {histogram.sum:.6f}")
+                lines.append(f"{metric}_count{format_labels(labels)} {histogram.count}")
+        return '\n'.join(lines) + '\n'
+
+    def export(self, settings: Optional[Dict]):
+        """metrics_settings에 지정된 JSON 요약/Prometheus textfile 기록 (임시 파일 후 교체)"""
+        settings = settings or {}
+        if not settings.get('enabled', True):
+            return
+        outputs = (
+            (settings.get('json_file'), lambda: json.dumps(self.snapshot(), ensure_ascii=False, indent=2)),
+            (settings.get('prometheus_file'), self.prometheus_text),
+        )
+        for path, render in outputs:
+            if not path:
+                continue
+            try:
+                directory = os.path.dirname(path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                tmp_file = path + '.tmp'
+                with open(tmp_file, 'w', encoding='utf-8') as f:
+                    f.write(render())
+                os.replace(tmp_file, path)
+            except Exception as e:
+                logger.error(f"지표 파일 저장 실패: {path} - {str(e)}")
+
+    def reset(self):
+        with self._lock:
+            self.counters.clear()
+            self.histograms.clear()
+            self.runs.clear()
+
+
+metrics = MetricsRegistry()
+
+
+class RunProfiler:
+    """한 번의 실행을 cProfile로 프로파일링 (선택 사용)
+
+    cProfile은 스레드마다 따로 동작하므로 실행 스레드와 wrap()으로 감싼 작업
+    스레드의 프로파일을 모아 하나의 .prof 파일로 저장합니다.
+    """
+
+    def __init__(self, name: str, directory: str = 'profiles'):
+        self.name = name
+        self.directory = directory
+        self.path = None
+        self._profiles: List[cProfile.Profile] = []
+        self._lock = threading.Lock()
+        self._main = cProfile.Profile()
+
+    def wrap(self, func):
+        """작업 스레드에서 실행될 함수를 프로파일링하도록 감싸기"""
+        def profiled(*args, **kwargs):
+            profile = cProfile.Profile()
+            profile.enable()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                profile.disable()
+                with self._lock:
+                    self._profiles.append(profile)
+        return profiled
+
+    def __enter__(self) -> 'RunProfiler':
+        self._main.enable()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._main.disable()
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            self.path = os.path.join(
+                self.directory, f"{self.name}-{datetime.now().strftime('%Y%m%d_%H%M%S')}.prof"
+            )
+            stats = pstats.Stats(self._main)
+            with self._lock:
+                for profile in self._profiles:
+                    stats.add(profile)
+            stats.dump_stats(self.path)
+            output = io.StringIO()
+            stats.stream = output
+            stats.sort_stats('cumulative').print_stats(20)
+            logger.info(f"프로파일 저장: {self.path}\n{output.getvalue()}")
+        except Exception as e:
+            logger.error(f"프로파일 저장 실패: {str(e)}")
+        return False
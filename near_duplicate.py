@@ -0,0 +1,212 @@
+import hashlib
+import html
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+FINGERPRINT_BITS = 64
+_NON_WORD = re.compile(r'[\W_]+', re.UNICODE)
+_BIT_SHIFTS = np.arange(FINGERPRINT_BITS, dtype=np.uint64)
+
+
+def _normalize(text: str) -> str:
+    """HTML 엔티티 해제, 소문자화 후 문자/숫자만 남김 (공백 제거로 한글 n-gram이 어절 경계를 넘도록)"""
+    return _NON_WORD.sub('', html.unescape(text).lower())
+
+
+def simhash(text: str, ngram: int = 3) -> int:
+    """문자 n-gram 기반 64비트 SimHash"""
+    normalized = _normalize(text)
+    if len(normalized) < ngram:
+        grams = [normalized] if normalized else []
+    else:
+        grams = [normalized[i:i + ngram] for i in range(len(normalized) - ngram + 1)]
+
+    if not grams:
+        return 0
+    values = np.array([
+        int.from_bytes(hashlib.blake2b(gram.encode('utf-8'), digest_size=8).digest(), 'big')
+        for gram in grams
+    ], dtype=np.uint64)
+    # n-gram 해시의 비트별 1/0 개수 차이로 투표 (행렬 연산)
+    ones = ((values[:, np.newaxis] >> _BIT_SHIFTS) & np.uint64(1)).sum(axis=0)
+    fingerprint = 0
+    for bit in np.flatnonzero(2 * ones > len(grams)):
+        fingerprint |= 1 << int(bit)
+    return fingerprint
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return bin(a ^ b).count('1')
+
+
+def news_fingerprint(news_item: Dict) -> int:
+    """제목 + 요약의 SimHash"""
+    return simhash(f"{news_item.get('title', '')} {news_item.get('summary', '')}")
+
+
+class NearDuplicateIndex:
+    """SimHash + LSH 밴드 기반 근접 중복 색인
+
+    64비트 지문을 max_distance + 1개의 밴드로 나누면 해밍 거리가 max_distance 이하인
+    두 지문은 적어도 한 밴드가 같으므로(비둘기집 원리), 같은 밴드 버킷의 후보만
+    비교합니다. 네이버와 RSS 크롤러가 한 인스턴스(또는 같은 상태 파일)를 공유해
+    키워드와 출처를 가로질러 중복을 묶습니다.
+    """
+
+    def __init__(self, max_distance: int = 6, window_hours: float = 24,
+                 state_file: Optional[str] = 'near_duplicates.json'):
+        self.max_distance = max_distance
+        self.window_seconds = window_hours * 3600
+        self.state_file = state_file
+        band_count = max_distance + 1
+        width = FINGERPRINT_BITS // band_count
+        self._bands = [
+            (i * width, FINGERPRINT_BITS if i == band_count - 1 else (i + 1) * width)
+            for i in range(band_count)
+        ]
+        self._buckets: Dict[tuple, List[int]] = {}
+        self._entries: Dict[int, Dict] = {}
+        self._order = deque()
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self._load()
+
+    @classmethod
+    def from_config(cls, config: Dict) -> 'NearDuplicateIndex':
+        settings = config.get('near_duplicate_settings', {})
+        return cls(
+            max_distance=settings.get('max_distance', 6),
+            window_hours=settings.get('window_hours', 24),
+            state_file=settings.get('state_file', 'near_duplicates.json')
+        )
+
+    def _band_keys(self, fingerprint: int):
+        for index, (start, end) in enumerate(self._bands):
+            yield (index, (fingerprint >> start) & ((1 << (end - start)) - 1))
+
+    def _insert(self, fingerprint: int, link: str, added_at: float):
+        entry_id = self._next_id
+        self._next_id += 1
+        self._entries[entry_id] = {'fingerprint': fingerprint, 'link': link, 'added_at': added_at}
+        self._order.append(entry_id)
+        for key in self._band_keys(fingerprint):
+            self._buckets.setdefault(key, []).append(entry_id)
+
+    def _expire(self, now: float):
+        """보존 기간이 지난 지문 제거 (추가 순서 큐 앞쪽만 확인)"""
+        cutoff = now - self.window_seconds
+        while self._order and self._entries[self._order[0]]['added_at'] < cutoff:
+            entry_id = self._order.popleft()
+            entry = self._entries.pop(entry_id)
+            for key in self._band_keys(entry['fingerprint']):
+                bucket = self._buckets.get(key)
+                if bucket:
+                    bucket.remove(entry_id)
+                    if not bucket:
+                        del self._buckets[key]
+
+    def _find(self, fingerprint: int) -> Optional[Dict]:
+        seen = set()
+        for key in self._band_keys(fingerprint):
+            for entry_id in self._buckets.get(key, ()):
+                if entry_id in seen:
+                    continue
+                seen.add(entry_id)
+                entry = self._entries[entry_id]
+                if hamming_distance(fingerprint, entry['fingerprint']) <= self.max_distance:
+                    return entry
+        return None
+
+    def check(self, news_item: Dict, now: float = None, fingerprint: int = None) -> Optional[str]:
+        """근접 중복이면 먼저 등록된 대표 기사 링크를, 아니면 등록 후 None 반환"""
+        if fingerprint is None:
+            fingerprint = news_fingerprint(news_item)
+        now = now or time.time()
+        with self._lock:
+            self._expire(now)
+            match = self._find(fingerprint)
+            if match is not None:
+                return match['link']
+            self._insert(fingerprint, news_item['link'], now)
+            return None
+
+    def collapse(self, news_items: List[Dict]) -> List[Dict]:
+        """근접 중복을 대표 기사 하나로 묶은 목록 반환
+
+        묶인 기사에는 duplicate_of, 대표 기사에는 duplicates(링크 목록)가 기록됩니다.
+        이전 실행이나 다른 크롤러에서 이미 등록된 기사와 중복이면 목록에서 제외됩니다.
+        """
+        representatives = {}
+        unique_items = []
+        for news_item in news_items:
+            original = self.check(news_item)
+            # 자기 링크와 일치하면 중단된 실행에서 이미 등록한 같은 기사
+            if original is None or original == news_item['link']:
+                representatives[news_item['link']] = news_item
+                unique_items.append(news_item)
+                continue
+            news_item['duplicate_of'] = original
+            if original in representatives:
+                representatives[original].setdefault('duplicates', []).append(news_item['link'])
+        if len(unique_items) != len(news_items):
+            logger.info(f"근접 중복 {len(news_items) - len(unique_items)}건을 묶었습니다. (남은 기사 {len(unique_items)}건)")
+        return unique_items
+
+    def _read_state(self) -> List[Dict]:
+        if not self.state_file or not os.path.exists(self.state_file):
+            return []
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            logger.error(f"근접 중복 상태 파일 로드 실패: {str(e)}")
+            return []
+
+    def _load(self):
+        now = time.time()
+        for entry in sorted(self._read_state(), key=lambda entry: entry['added_at']):
+            if now - entry['added_at'] <= self.window_seconds:
+                self._insert(int(entry['fingerprint'], 16), entry['link'], entry['added_at'])
+
+    def save(self):
+        """상태 파일 저장 (다른 프로세스가 기록한 항목과 병합)"""
+        if not self.state_file:
+            return
+        with self._lock:
+            now = time.time()
+            self._expire(now)
+            known = {entry['link'] for entry in self._entries.values()}
+            merged = [
+                {'fingerprint': int(entry['fingerprint'], 16), 'link': entry['link'], 'added_at': entry['added_at']}
+                for entry in self._read_state()
+                if entry['link'] not in known and now - entry['added_at'] <= self.window_seconds
+            ]
+            if merged:
+                # 만료 큐가 시간 순서를 유지하도록 병합한 항목까지 정렬해 다시 적재
+                combined = sorted(list(self._entries.values()) + merged, key=lambda entry: entry['added_at'])
+                self._buckets = {}
+                self._entries = {}
+                self._order = deque()
+                for entry in combined:
+                    self._insert(entry['fingerprint'], entry['link'], entry['added_at'])
+            entries = [
+                {'fingerprint': format(entry['fingerprint'], '016x'), 'link': entry['link'], 'added_at': entry['added_at']}
+                for entry in self._entries.values()
+            ]
+        try:
+            tmp_file = self.state_file + '.tmp'
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(entries, f, ensure_ascii=False)
+            os.replace(tmp_file, self.state_file)
+        except Exception as e:
+            logger.error(f"근접 중복 상태 파일 저장 실패: {str(e)}")
@@ -1,130 +1,256 @@
-import torch
-from sentence_transformers import SentenceTransformer
+import numpy as np
 from typing import List, Dict
 import logging
 from slack_sdk import WebClient
 from slack_sdk.errors import SlackApiError
-import json
 import os
-from datetime import datetime, timedelta
+import threading
+import time
+from datetime import datetime
+from embedding_store import EmbeddingStore
+from embedding_backend import EmbeddingBackend, create_backend
+from sent_index import SentNewsIndex
+from topic_clustering import TopicClusterer
+from vector_index import VectorIndex
+from metrics import metrics
 
 logger = logging.getLogger(__name__)
 
 class NewsRecommender:
-    def __init__(self, slack_client: WebClient, channel_id: str):
+    def __init__(self, slack_client: WebClient, channel_id: str, settings: Dict = None,
+                 embedding_backend: EmbeddingBackend = None):
         self.slack_client = slack_client
         self.channel_id = channel_id
-        self.model = SentenceTransformer('sentence-transformers/paraphrase-MiniLM-L3-v2')
-        self.cache_file = 'news_cache.json'
-        self.cache = self._load_cache()
+        # 모델은 첫 인코딩 시점에 로드됨
+        self.model = embedding_backend or create_backend(settings)
+        settings = settings or {}
+        self.cache_file = settings.get('cache_file', 'news_cache.json')
+        # 링크 해시 색인 + 만료 큐 + 추가 전용 저널
+        self.sent_index = SentNewsIndex(
+            self.cache_file,
+            window_hours=settings.get('dedup_window_hours', 24),
+            compact_every=settings.get('journal_compact_every', 100)
+        )
+        # 실행 간 유지되는 카테고리별 토픽 클러스터
+        self.topic_clusterer = TopicClusterer(
+            settings.get('topic_state_file', 'topic_clusters.npz'),
+            threshold=settings.get('topic_threshold', 0.6),
+            decay_hours=settings.get('topic_decay_hours', 72),
+            max_clusters=settings.get('max_topic_clusters', 50)
+        )
+        self.max_topics = settings.get('max_topics', 1)
+        # 수집한 모든 후보 기사의 임베딩 색인 (장기 유사 중복 제외와 관련 이전 보도 검색)
+        self.vector_index = VectorIndex.from_settings(settings)
+        self.related_threshold = settings.get('related_threshold', 0.6)
+        self.max_related = settings.get('max_related', 3)
+        # 전송된 뉴스 임베딩은 캐시 파일 옆의 저장소에 한 번만 계산해 보관
+        self.embedding_store = EmbeddingStore(
+            os.path.join(os.path.dirname(self.cache_file), 'news_embeddings.npy')
+        )
+        self._embeddings_backfilled = False
+        # 선정한 대표 뉴스의 후보 임베딩 (링크 키, 전송할 때 다시 인코딩하지 않음)
+        self._representative_embeddings: Dict[str, np.ndarray] = {}
+        # 여러 크롤러가 한 인스턴스를 공유할 때 캐시 갱신 보호
+        self._lock = threading.RLock()
         
-    def _load_cache(self) -> Dict:
-        """캐시 파일 로드"""
-        if os.path.exists(self.cache_file):
-            try:
-                with open(self.cache_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except Exception as e:
-                logger.error(f"캐시 파일 로드 실패: {str(e)}")
-        return {'sent_news': []}
+    @classmethod
+    def from_config(cls, slack_client: WebClient, config: Dict) -> 'NewsRecommender':
+        """설정의 추천 채널과 recommendation_settings로 추천기 생성"""
+        slack_settings = config['slack_settings']
+        recommendation_channel = slack_settings['recommendation_channel']
+        return cls(
+            slack_client,
+            slack_settings['channels'][recommendation_channel],
+            settings=config.get('recommendation_settings')
+        )
         
-    def _save_cache(self):
-        """캐시 파일 저장"""
-        try:
-            with open(self.cache_file, 'w', encoding='utf-8') as f:
-                json.dump(self.cache, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            logger.error(f"캐시 파일 저장 실패: {str(e)}")
+    def _backfill_embeddings(self):
+        """저장소에 없는 캐시 뉴스의 임베딩을 한 번에 계산해 저장 (최초 유사도 비교 시 1회)"""
+        if self._embeddings_backfilled:
+            return
+        self._embeddings_backfilled = True
+        self.embedding_store.prune(self.sent_index.links())
+        missing = [
+            news for news in self.sent_index.items()
+            if news['link'] not in self.embedding_store
+        ]
+        if not missing:
+            return
+        logger.info(f"캐시된 뉴스 {len(missing)}개의 임베딩을 저장소에 추가합니다.")
+        embeddings = self.model.encode([news['summary'] for news in missing])
+        self.embedding_store.add_many([news['link'] for news in missing], embeddings)
+
+    def _expire_sent_news(self, now: float = None):
+        """보존 기간이 지난 전송 기록과 임베딩 정리 (추천 1회당 한 번)"""
+        if self.sent_index.expire(datetime.fromtimestamp(now) if now else None):
+            self.embedding_store.prune(self.sent_index.links())
             
     def _is_news_sent(self, news_item: Dict) -> bool:
-        """뉴스가 이미 전송되었는지 확인"""
-        # 24시간 이내의 캐시만 유지
-        current_time = datetime.now()
-        self.cache['sent_news'] = [
-            news for news in self.cache['sent_news']
-            if datetime.fromisoformat(news['sent_time']) > current_time - timedelta(hours=24)
-        ]
+        """뉴스가 이미 전송되었는지 확인 (링크 해시 O(1) 조회)"""
+        return news_item['link'] in self.sent_index
         
-        # URL 기반 중복 체크
-        return any(
-            news['link'] == news_item['link'] 
-            for news in self.cache['sent_news']
-        )
+    def _similar_mask(self, embeddings: np.ndarray, threshold: float = 0.85) -> np.ndarray:
+        """후보 임베딩 각각이 전송된 뉴스와 유사한지 한 번의 행렬곱으로 판정"""
+        self._backfill_embeddings()
+        cached_embeddings = self.embedding_store.vectors()
+        if not len(self.sent_index) or not len(cached_embeddings):
+            return np.zeros(len(embeddings), dtype=bool)
+            
+        # 정규화 임베딩 간 내적이 곧 코사인 유사도 (후보 × 캐시 행렬)
+        with metrics.timer('similarity'):
+            similarities = EmbeddingStore.normalize(embeddings) @ cached_embeddings.T
+            return np.any(similarities > threshold, axis=1)
         
     def _is_similar_news(self, news_item: Dict, threshold: float = 0.85) -> bool:
         """유사한 뉴스가 이미 전송되었는지 확인"""
-        if not self.cache['sent_news']:
+        if not len(self.sent_index):
             return False
             
-        # 현재 뉴스의 임베딩 생성
-        current_embedding = self.model.encode(news_item['summary'])
+        current_embedding = self.model.encode([news_item['summary']])
+        return bool(self._similar_mask(current_embedding, threshold)[0])
         
-        # 캐시된 뉴스들과 유사도 비교
-        for cached_news in self.cache['sent_news']:
-            cached_embedding = self.model.encode(cached_news['summary'])
-            similarity = torch.nn.functional.cosine_similarity(
-                torch.tensor(current_embedding),
-                torch.tensor(cached_embedding),
-                dim=0
-            )
-            if similarity > threshold:
-                return True
-        return False
+    def _valid_candidates(self, news_items: List[Dict], threshold: float, now: float = None):
+        """전송 링크/유사 뉴스를 제외한 후보와 그 임베딩 (인코딩 1회)"""
+        # 이미 전송된 링크 제외
+        self._expire_sent_news(now)
+        candidates = [item for item in news_items if not self._is_news_sent(item)]
+        if not candidates:
+            return [], None, None
         
-    def get_representative_news(self, news_items: List[Dict]) -> Dict:
+        # 후보 전체를 한 번에 인코딩하고 유사도 필터와 대표 선정에 재사용
+        embeddings = np.asarray(
+            self.model.encode([item['summary'] for item in candidates]),
+            dtype=np.float32
+        )
+        keep = ~self._similar_mask(embeddings, threshold)
+        keep &= ~self._recommended_before(embeddings, threshold)
+        
+        # 후보 전체를 색인에 추가 (관련 이전 보도는 이번 배치보다 먼저 추가된 기사에서만 찾음)
+        indexed_at = now or time.time()
+        self.vector_index.add(
+            [item['link'] for item in candidates], [item['title'] for item in candidates],
+            embeddings, now=indexed_at
+        )
+        valid_news = [item for item, kept in zip(candidates, keep) if kept]
+        return valid_news, embeddings[keep], indexed_at
+        
+    def _recommended_before(self, embeddings: np.ndarray, threshold: float) -> np.ndarray:
+        """보존 기간(history_days) 안에 추천된 기사와 유사한 후보 판정 (근사 최근접 이웃)"""
+        with metrics.timer('similarity', scope='history'):
+            nearest = self.vector_index.search(embeddings, k=1, sent_only=True)
+        mask = np.array([bool(hits) and hits[0]['similarity'] > threshold for hits in nearest], dtype=bool)
+        if mask.any():
+            logger.info(f"이전에 추천된 기사와 유사한 후보 {int(mask.sum())}건을 제외합니다.")
+        return mask
+        
+    def _attach_related(self, news_item: Dict, embedding: np.ndarray, before: float):
+        """이번 배치 이전에 수집된 유사 기사를 관련 이전 보도(related)로 기록"""
+        hits = self.vector_index.search(embedding, k=self.max_related + 1, before=before)[0]
+        related = [
+            {'title': hit['title'], 'link': hit['link']}
+            for hit in hits
+            if hit['link'] != news_item['link'] and hit['similarity'] >= self.related_threshold
+        ][:self.max_related]
+        if related:
+            news_item['related'] = related
+        
+    def get_representative_news(self, news_items: List[Dict], threshold: float = 0.85,
+                                now: float = None) -> Dict:
         """Find the most representative news article using embeddings"""
-        if not news_items:
-            return None
+        with self._lock:
+            if not news_items:
+                return None
             
-        # 이미 전송된 뉴스 제외
-        valid_news = [
-            item for item in news_items
-            if not self._is_news_sent(item) and not self._is_similar_news(item)
-        ]
-        
-        if not valid_news:
-            logger.info("모든 뉴스가 이미 전송되었거나 유사한 뉴스가 존재합니다.")
-            return None
+            valid_news, embeddings, indexed_at = self._valid_candidates(news_items, threshold, now)
+            if not valid_news:
+                logger.info("모든 뉴스가 이미 전송되었거나 유사한 뉴스가 존재합니다.")
+                return None
             
-        # Extract summaries and create embeddings
-        summaries = [item['summary'] for item in valid_news]
-        embeddings = self.model.encode(summaries)
-        
-        # Calculate mean embedding
-        mean_embedding = torch.mean(torch.tensor(embeddings), dim=0)
+            # Calculate mean embedding
+            mean_embedding = embeddings.mean(axis=0)
         
-        # Find the article closest to the mean embedding
-        distances = torch.norm(torch.tensor(embeddings) - mean_embedding, dim=1)
-        most_representative_idx = torch.argmin(distances).item()
+            # Find the article closest to the mean embedding
+            distances = np.linalg.norm(embeddings - mean_embedding, axis=1)
+            most_representative_idx = int(np.argmin(distances))
+            
+            representative = valid_news[most_representative_idx]
+            self._attach_related(representative, embeddings[most_representative_idx], indexed_at)
+            self._representative_embeddings[representative['link']] = embeddings[most_representative_idx]
+            return representative
         
-        return valid_news[most_representative_idx]
+    def get_topic_representatives(self, news_items: List[Dict], category: str,
+                                  max_topics: int = None, threshold: float = 0.85,
+                                  now: float = None) -> List[Dict]:
+        """토픽 클러스터별 대표 뉴스를 클러스터 성장 순으로 반환 (now는 재생 시 모의 시각)"""
+        with self._lock:
+            if not news_items:
+                return []
+            
+            valid_news, embeddings, indexed_at = self._valid_candidates(news_items, threshold, now)
+            if not valid_news:
+                logger.info("모든 뉴스가 이미 전송되었거나 유사한 뉴스가 존재합니다.")
+                return []
+            
+            # 새 기사만 기존 토픽 중심에 배정 (과거 기사는 다시 임베딩하지 않음)
+            labels, growth = self.topic_clusterer.assign(category, embeddings, now=now)
+            self.topic_clusterer.save()
+            
+            normalized = EmbeddingStore.normalize(embeddings)
+            representatives = []
+            for label in self.topic_clusterer.rank(category, labels, growth)[:max_topics or self.max_topics]:
+                members = np.flatnonzero(labels == label)
+                # 클러스터 중심과 가장 가까운 기사를 대표로 선정
+                similarities = normalized[members] @ self.topic_clusterer.centroid(category, label)
+                index = members[int(np.argmax(similarities))]
+                self._attach_related(valid_news[index], embeddings[index], indexed_at)
+                self._representative_embeddings[valid_news[index]['link']] = embeddings[index]
+                representatives.append(valid_news[index])
+            
+            logger.info(f"{category} 토픽 {len(growth)}개 중 대표 뉴스 {len(representatives)}건 선정")
+            return representatives
         
-    def send_recommendation(self, news_item: Dict):
+    def send_recommendation(self, news_item: Dict, now: float = None):
         """Send the recommended news to Slack"""
-        try:
-            # RSS와 Naver 뉴스의 키 차이 처리
-            press = news_item.get('press', news_item.get('source', 'Unknown Source'))
+        with self._lock:
+            try:
+                # RSS와 Naver 뉴스의 키 차이 처리
+                press = news_item.get('press', news_item.get('source', 'Unknown Source'))
             
-            message = f"📰 *대표 뉴스 추천*\n\n*{news_item['title']}*\n{news_item['link']}\n출처: {press}\n\n{news_item['summary']}"
+                message = f"📰 *대표 뉴스 추천*\n\n*{news_item['title']}*\n{news_item['link']}\n출처: {press}\n\n{news_item['summary']}"
+                if news_item.get('related'):
+                    message += "\n\n*관련 이전 보도*\n" + '\n'.join(
+                        f"• <{related['link']}|{related['title']}>" for related in news_item['related']
+                    )
             
-            self.slack_client.chat_postMessage(
-                channel=self.channel_id,
-                text=message,
-                parse="mrkdwn"
-            )
+                with metrics.timer('slack_post', kind='recommendation'):
+                    self.slack_client.chat_postMessage(
+                        channel=self.channel_id,
+                        text=message,
+                        parse="mrkdwn"
+                    )
+                metrics.inc('slack_messages_total', kind='recommendation')
             
-            # 캐시에 전송된 뉴스 추가
-            self.cache['sent_news'].append({
-                'title': news_item['title'],
-                'link': news_item['link'],
-                'summary': news_item['summary'],
-                'sent_time': datetime.now().isoformat()
-            })
-            self._save_cache()
+                # 전송 기록 추가 (저널에 한 줄 기록)
+                self.sent_index.add(news_item, datetime.fromtimestamp(now) if now else None)
+                embedding = self._representative_embeddings.pop(news_item['link'], None)
+                if embedding is None:
+                    embedding = self.model.encode(news_item['summary'])
+                self.embedding_store.add(news_item['link'], embedding)
+                if news_item['link'] not in self.vector_index:
+                    self.vector_index.add([news_item['link']], [news_item['title']], embedding, now=now)
+                self.vector_index.mark_sent([news_item['link']])
             
-            logger.info(f"대표 뉴스 추천 메시지 전송 완료: {news_item['title'][:30]}...")
+                logger.info(f"대표 뉴스 추천 메시지 전송 완료: {news_item['title'][:30]}...")
             
-        except SlackApiError as e:
-            logger.error(f"Slack 메시지 전송 실패: {str(e)}")
-        except KeyError as e:
-            logger.error(f"필수 키가 누락되었습니다: {str(e)}. 뉴스 항목: {news_item}") 
\ No newline at end of file
+            except SlackApiError as e:
+                logger.error(f"Slack 메시지 전송 실패: {str(e)}")
+            except KeyError as e:
+                logger.error(f"필수 키가 누락되었습니다: {str(e)}. 뉴스 항목: {news_item}")
+    
+    def save_state(self):
+        """벡터 색인과 전송 뉴스 임베딩 저장 (크롤러 실행이 끝날 때 한 번)"""
+        with self._lock:
+            self.vector_index.save()
+            self.embedding_store.save()
+            # 이번 실행에서 전송하지 않은 대표 뉴스의 임베딩은 버림
+            self._representative_embeddings.clear() 
\ No newline at end of file
@@ -0,0 +1,148 @@
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def naver_source(category: str, keyword: str) -> str:
+    return f"naver:{category}/{keyword}"
+
+
+def rss_source(feed_url: str) -> str:
+    return f"rss:{feed_url}"
+
+
+def source_job(source: str) -> str:
+    """소스 이름의 크롤러 작업 이름 ('naver' 또는 'rss')"""
+    return source.split(':', 1)[0]
+
+
+class AdaptivePollScheduler:
+    """키워드/피드별 새 기사 속도에 맞춰 다음 수집 시각을 정하는 스케줄러
+
+    소스마다 새 기사 수를 지난 수집 이후 경과 시간으로 나눈 속도(건/시간)를 지수 이동
+    평균으로 유지하고, 다음 수집까지 약 target_new_items건이 쌓이도록 간격을 정합니다
+    (min/max 범위 안). 새 기사가 없으면 간격을 두 배로 늘리고, 한 번에 다 받지 못할
+    만큼 쌓였으면(saturated) 절반으로 줄입니다. 모든 소스의 예상 일일 요청 수가
+    daily_request_budget을 넘으면 간격을 같은 비율로 늘립니다.
+    """
+
+    def __init__(self, state_file: str = 'poll_schedule.json', min_interval_minutes: float = 30,
+                 max_interval_minutes: float = 720, target_new_items: float = 5,
+                 daily_request_budget: Optional[int] = None, smoothing: float = 0.5):
+        self.state_file = state_file
+        self.min_interval = min_interval_minutes * 60
+        self.max_interval = max_interval_minutes * 60
+        self.target_new_items = target_new_items
+        self.daily_request_budget = daily_request_budget
+        self.smoothing = smoothing
+        self.sources: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    @classmethod
+    def from_settings(cls, adaptive_settings: Dict) -> 'AdaptivePollScheduler':
+        return cls(
+            state_file=adaptive_settings.get('state_file', 'poll_schedule.json'),
+            min_interval_minutes=adaptive_settings.get('min_interval_minutes', 30),
+            max_interval_minutes=adaptive_settings.get('max_interval_minutes', 720),
+            target_new_items=adaptive_settings.get('target_new_items', 5),
+            daily_request_budget=adaptive_settings.get('daily_request_budget')
+        )
+
+    def _load(self):
+        if os.path.exists(self.state_file):
+            try:
+                with open(self.state_file, 'r', encoding='utf-8') as f:
+                    self.sources = json.load(f)
+            except Exception as e:
+                logger.error(f"수집 스케줄 상태 파일 로드 실패: {str(e)}")
+
+    def save(self):
+        with self._lock:
+            state = {source: dict(entry) for source, entry in self.sources.items()}
+        try:
+            tmp_file = self.state_file + '.tmp'
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(state, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_file, self.state_file)
+        except Exception as e:
+            logger.error(f"수집 스케줄 상태 파일 저장 실패: {str(e)}")
+
+    def _budget_factor(self) -> float:
+        """예상 일일 요청 수가 예산을 넘을 때 간격에 곱할 비율"""
+        if not self.daily_request_budget:
+            return 1.0
+        projected = sum(
+            entry.get('requests', 1) * 86400 / entry['interval']
+            for entry in self.sources.values() if entry.get('interval')
+        )
+        return max(projected / self.daily_request_budget, 1.0)
+
+    def record(self, source: str, new_items: int, requests: int = 1,
+               saturated: bool = False, now: float = None) -> float:
+        """수집 결과를 반영하고 다음 수집 시각(epoch 초) 반환"""
+        now = now or time.time()
+        with self._lock:
+            entry = self.sources.setdefault(source, {})
+            last_poll = entry.get('last_poll')
+            interval = entry.get('interval', self.min_interval)
+            entry['requests'] = round(
+                requests if 'requests' not in entry
+                else self.smoothing * requests + (1 - self.smoothing) * entry['requests'], 3
+            )
+
+            # 첫 수집은 경과 시간을 알 수 없어 속도를 갱신하지 않고 최소 간격 뒤 다시 수집
+            if last_poll is not None:
+                hours = max(now - last_poll, 60) / 3600
+                sample = new_items / hours
+                rate = entry.get('rate')
+                entry['rate'] = round(
+                    sample if rate is None else self.smoothing * sample + (1 - self.smoothing) * rate, 4
+                )
+                if saturated:
+                    interval = interval / 2
+                elif entry['rate'] <= 0:
+                    interval = interval * 2
+                else:
+                    interval = self.target_new_items / entry['rate'] * 3600
+            interval = min(max(interval, self.min_interval), self.max_interval)
+
+            entry['interval'] = round(interval, 1)
+            entry['last_poll'] = now
+            delay = min(interval * self._budget_factor(), self.max_interval)
+            entry['next_poll'] = now + delay
+            next_poll = entry['next_poll']
+        logger.info(
+            f"[{source}] 새 기사 {new_items}건, 다음 수집 {delay / 60:.0f}분 후"
+            + (" (미수집 기사 누적)" if saturated else "")
+        )
+        return next_poll
+
+    def retry_later(self, source: str, now: float = None) -> float:
+        """수집 실패 시 속도와 간격은 그대로 두고 최소 간격 뒤 다시 수집"""
+        now = now or time.time()
+        with self._lock:
+            entry = self.sources.setdefault(source, {})
+            entry['next_poll'] = now + self.min_interval
+            next_poll = entry['next_poll']
+        logger.info(f"[{source}] 수집 실패, {self.min_interval / 60:.0f}분 후 다시 수집")
+        return next_poll
+
+    def due(self, sources: Iterable[str], now: float = None) -> List[str]:
+        """수집할 때가 된 소스 목록 (한 번도 수집하지 않은 소스 포함)"""
+        now = now or time.time()
+        with self._lock:
+            return [
+                source for source in sources
+                if self.sources.get(source, {}).get('next_poll', 0) <= now
+            ]
+
+    def next_poll_time(self, sources: Iterable[str]) -> float:
+        """가장 빠른 다음 수집 시각"""
+        with self._lock:
+            return min((self.sources.get(source, {}).get('next_poll', 0) for source in sources), default=0)
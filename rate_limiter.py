@@ -0,0 +1,101 @@
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucketLimiter:
+    """초당 요청 수와 일일 쿼터를 함께 지키는 토큰 버킷
+
+    여러 스레드가 공유할 수 있으며, 일일 사용량은 파일에 저장되어
+    프로세스가 재시작되거나 하루에 여러 번 실행되어도 누적됩니다.
+    사용량 파일은 토큰마다 쓰지 않고 save_every건 또는 save_interval초마다,
+    그리고 save()를 호출할 때(실행 종료 시) 기록합니다.
+    """
+
+    def __init__(self, rate_per_second: float, daily_limit: int, state_file: str = 'naver_quota.json',
+                 save_every: int = 50, save_interval: float = 30):
+        self.rate = float(rate_per_second)
+        self.capacity = max(1.0, self.rate)
+        self.daily_limit = daily_limit
+        self.state_file = state_file
+        self.save_every = save_every
+        self.save_interval = save_interval
+        self._tokens = self.capacity
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+        self._state = self._load_state()
+        self._saved_used = self._state.get('used', 0)
+        self._last_save = time.monotonic()
+
+    def _load_state(self) -> dict:
+        """일일 사용량 파일 로드"""
+        if os.path.exists(self.state_file):
+            try:
+                with open(self.state_file, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except Exception as e:
+                logger.error(f"쿼터 파일 로드 실패: {str(e)}")
+        return {'date': self._today(), 'used': 0}
+
+    def _save_state(self):
+        """일일 사용량을 임시 파일에 쓴 뒤 교체 (잠금을 잡은 상태에서 호출)"""
+        self._saved_used = self._state['used']
+        self._last_save = time.monotonic()
+        try:
+            tmp_file = self.state_file + '.tmp'
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(self._state, f)
+            os.replace(tmp_file, self.state_file)
+        except Exception as e:
+            logger.error(f"쿼터 파일 저장 실패: {str(e)}")
+
+    def save(self):
+        """마지막 저장 이후 사용량이 바뀌었으면 파일에 기록"""
+        with self._lock:
+            if self._state['used'] != self._saved_used:
+                self._save_state()
+
+    @staticmethod
+    def _today() -> str:
+        return datetime.now().strftime('%Y-%m-%d')
+
+    def _roll_day(self):
+        """날짜가 바뀌었으면 일일 사용량 초기화"""
+        today = self._today()
+        if self._state.get('date') != today:
+            self._state = {'date': today, 'used': 0}
+            self._saved_used = 0
+
+    @property
+    def remaining_today(self) -> int:
+        with self._lock:
+            self._roll_day()
+            return max(0, self.daily_limit - self._state['used'])
+
+    def acquire(self) -> bool:
+        """요청 한 건에 대한 토큰 획득 (일일 쿼터를 모두 쓴 경우 False)"""
+        while True:
+            with self._lock:
+                self._roll_day()
+                if self._state['used'] >= self.daily_limit:
+                    return False
+
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._last_refill) * self.rate)
+                self._last_refill = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    self._state['used'] += 1
+                    if (self._state['used'] - self._saved_used >= self.save_every
+                            or now - self._last_save >= self.save_interval):
+                        self._save_state()
+                    return True
+
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
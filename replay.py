@@ -0,0 +1,287 @@
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+
+from article_store import ArticleStore
+from embedding_backend import EmbeddingBackend, create_backend
+from near_duplicate import NearDuplicateIndex, news_fingerprint
+from news_recommender import NewsRecommender
+
+logger = logging.getLogger(__name__)
+
+RSS_CATEGORY = 'rss'
+# RSS 크롤러가 추천 후보에서 제외하는 요약
+UNAVAILABLE_SUMMARY = "기사 내용을 추출할 수 없습니다."
+
+_worker_backend: Optional[EmbeddingBackend] = None
+
+
+def _init_worker(settings: Dict):
+    """작업 프로세스마다 임베딩 백엔드를 한 번 생성 (프로세스 간 스레드 경합 방지)"""
+    global _worker_backend
+    os.environ.setdefault('OMP_NUM_THREADS', '1')
+    _worker_backend = create_backend(settings)
+
+
+def _encode_batch(texts: List[str]) -> np.ndarray:
+    return _worker_backend.encode(texts)
+
+
+def _fingerprint_batch(news_items: List[Dict]) -> List[int]:
+    return [news_fingerprint(news_item) for news_item in news_items]
+
+
+class PrecomputedBackend(EmbeddingBackend):
+    """작업 프로세스에서 미리 계산한 임베딩을 돌려주는 백엔드 (없는 문장만 직접 인코딩)"""
+
+    def __init__(self, fallback: EmbeddingBackend):
+        self.fallback = fallback
+        self.vectors: Dict[str, np.ndarray] = {}
+
+    def _encode(self, texts: List[str], batch_size: int) -> np.ndarray:
+        missing = [text for text in dict.fromkeys(texts) if text not in self.vectors]
+        if missing:
+            self.vectors.update(zip(missing, self.fallback.encode(missing, batch_size)))
+        return np.stack([self.vectors[text] for text in texts])
+
+
+class RecordingSlackClient:
+    """chat_postMessage 호출을 Slack으로 보내지 않고 건수만 세는 클라이언트"""
+
+    def __init__(self):
+        self.posted = 0
+
+    def chat_postMessage(self, **kwargs):
+        self.posted += 1
+        return {'ok': True}
+
+
+def iter_runs(article_store: ArticleStore, start: Optional[str], end: Optional[str],
+              run_gap_minutes: float) -> Iterator[List[Dict]]:
+    """저장된 기사를 수집 시각 순으로 읽어 실행 단위로 묶음 (간격이 run_gap_minutes를 넘으면 새 실행)"""
+    gap = timedelta(minutes=run_gap_minutes)
+    run: List[Dict] = []
+    last = None
+    for news_item in article_store.query(start=start, end=end):
+        crawled_at = datetime.strptime(news_item['crawled_at'], "%Y-%m-%d %H:%M:%S")
+        if run and crawled_at - last > gap:
+            yield run
+            run = []
+        run.append(news_item)
+        last = crawled_at
+    if run:
+        yield run
+
+
+class Replayer:
+    """저장된 기사로 예약 실행을 재현해 추천 결과를 다시 계산하는 재생기
+
+    실행마다 근접 중복 제외와 카테고리별 토픽 대표 선정을 크롤러와 같은 순서로 수행하되,
+    시각은 실행의 마지막 수집 시각으로 맞춥니다. 임베딩은 chunk_size건씩 모아 프로세스
+    풀에서 배치로 계산하고, 선정은 이전 실행의 전송 기록에 의존하므로 순서대로 처리합니다.
+    추천 상태 파일은 state_dir에만 쓰며 Slack으로는 보내지 않습니다.
+    """
+
+    def __init__(self, config: Dict, state_dir: str, threshold: float = 0.85,
+                 workers: int = None, batch_size: int = 64, chunk_size: int = 2000,
+                 settings_override: Dict = None):
+        self.config = config
+        self.threshold = threshold
+        self.workers = os.cpu_count() if workers is None else workers
+        self.batch_size = batch_size
+        self.chunk_size = chunk_size
+        self.category_order = list(config.get('search_keywords', {})) + [RSS_CATEGORY]
+
+        settings = dict(config.get('recommendation_settings', {}), **(settings_override or {}))
+        settings.update({
+            'cache_file': os.path.join(state_dir, 'news_cache.json'),
+            'topic_state_file': os.path.join(state_dir, 'topic_clusters.npz'),
+            'vector_index_file': os.path.join(state_dir, 'news_vectors.npz'),
+        })
+        self.settings = settings
+        self.backend = PrecomputedBackend(create_backend(settings))
+        self.slack_client = RecordingSlackClient()
+        self.recommender = NewsRecommender(self.slack_client, 'replay', settings, embedding_backend=self.backend)
+        near_settings = config.get('near_duplicate_settings', {})
+        self.fingerprints: Dict[int, int] = {}
+        self.near_duplicates = NearDuplicateIndex(
+            max_distance=near_settings.get('max_distance', 6),
+            window_hours=near_settings.get('window_hours', 24),
+            state_file=None
+        )
+
+    def _precompute(self, executor: Optional[ProcessPoolExecutor], runs: List[List[Dict]]):
+        """묶음 안의 요약 임베딩과 근접 중복 지문을 배치로 나눠 작업 프로세스에서 계산"""
+        self.backend.vectors.clear()
+        self.fingerprints.clear()
+        news_items = [
+            {'_id': news_item['_id'], 'title': news_item.get('title', ''), 'summary': news_item.get('summary', '')}
+            for run in runs for news_item in run
+        ]
+        texts = list(dict.fromkeys(news_item['summary'] for news_item in news_items if news_item['summary']))
+        text_batches = [texts[i:i + self.batch_size] for i in range(0, len(texts), self.batch_size)]
+        item_batches = [news_items[i:i + self.batch_size] for i in range(0, len(news_items), self.batch_size)]
+        if executor is None:
+            embeddings = (self.backend.fallback.encode(batch, self.batch_size) for batch in text_batches)
+            fingerprints = map(_fingerprint_batch, item_batches)
+        else:
+            embeddings = executor.map(_encode_batch, text_batches)
+            fingerprints = executor.map(_fingerprint_batch, item_batches)
+        for batch, vectors in zip(text_batches, embeddings):
+            self.backend.vectors.update(zip(batch, vectors))
+        for batch, values in zip(item_batches, fingerprints):
+            self.fingerprints.update((news_item['_id'], value) for news_item, value in zip(batch, values))
+
+    def _replay_run(self, run: List[Dict]) -> List[Dict]:
+        """한 실행을 재현해 추천될 기사 목록 반환"""
+        now = datetime.strptime(run[-1]['crawled_at'], "%Y-%m-%d %H:%M:%S").timestamp()
+        by_category: Dict[str, List[Dict]] = {}
+        for news_item in run:
+            crawled_at = datetime.strptime(news_item['crawled_at'], "%Y-%m-%d %H:%M:%S").timestamp()
+            if self.near_duplicates.check(news_item, now=crawled_at, fingerprint=self.fingerprints.get(news_item['_id'])):
+                continue
+            if news_item.get('_crawler') == RSS_CATEGORY:
+                if not news_item.get('summary') or news_item['summary'] == UNAVAILABLE_SUMMARY:
+                    continue
+                category = RSS_CATEGORY
+            else:
+                category = news_item.get('category')
+            by_category.setdefault(category, []).append(news_item)
+
+        recommendations = []
+        order = {category: i for i, category in enumerate(self.category_order)}
+        for category in sorted(by_category, key=lambda category: order.get(category, len(order))):
+            for news_item in self.recommender.get_topic_representatives(
+                by_category[category], category, threshold=self.threshold, now=now
+            ):
+                self.recommender.send_recommendation(news_item, now=now)
+                recommendations.append({
+                    'run_at': run[-1]['crawled_at'],
+                    'category': category,
+                    'title': news_item['title'],
+                    'link': news_item['link'],
+                    'related': news_item.get('related', []),
+                })
+        return recommendations
+
+    def replay(self, article_store: ArticleStore, output, start: Optional[str] = None,
+               end: Optional[str] = None, run_gap_minutes: float = 30) -> Dict:
+        """기간의 기사를 재생해 추천 결과를 output에 JSONL로 기록하고 통계 반환"""
+        stats = {'runs': 0, 'articles': 0, 'recommendations': 0}
+        started = time.perf_counter()
+        executor = None
+        if self.workers > 1:
+            executor = ProcessPoolExecutor(self.workers, initializer=_init_worker, initargs=(self.settings,))
+        try:
+            chunk: List[List[Dict]] = []
+            chunk_articles = 0
+            runs = iter_runs(article_store, start, end, run_gap_minutes)
+            while True:
+                run = next(runs, None)
+                if run is not None:
+                    chunk.append(run)
+                    chunk_articles += len(run)
+                    if chunk_articles < self.chunk_size:
+                        continue
+                if not chunk:
+                    break
+                self._precompute(executor, chunk)
+                for chunk_run in chunk:
+                    for recommendation in self._replay_run(chunk_run):
+                        output.write(json.dumps(recommendation, ensure_ascii=False) + '\n')
+                        stats['recommendations'] += 1
+                    stats['runs'] += 1
+                    stats['articles'] += len(chunk_run)
+                logger.info(f"실행 {stats['runs']}회, 기사 {stats['articles']}건 재생 (추천 {stats['recommendations']}건)")
+                chunk = []
+                chunk_articles = 0
+                if run is None:
+                    break
+        finally:
+            if executor:
+                executor.shutdown()
+        stats['seconds'] = round(time.perf_counter() - started, 3)
+        return stats
+
+
+def compare(recommendations: List[Dict], baseline: List[Dict]) -> Dict:
+    """기준 재생 결과와 (실행 시각, 카테고리, 링크) 단위로 비교"""
+    def keys(records):
+        return {(record['run_at'], record['category'], record['link']) for record in records}
+    current, previous = keys(recommendations), keys(baseline)
+    changed = len(current ^ previous)
+    return {
+        'added': len(current - previous),
+        'removed': len(previous - current),
+        'changed_ratio': round(changed / max(len(previous), 1), 4),
+    }
+
+
+def _read_jsonl(path: str) -> List[Dict]:
+    with open(path, 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='저장된 기사로 추천/중복 제외 재생 (Slack 전송 없음)')
+    parser.add_argument('--config', default='config.json', help='설정 파일 경로')
+    parser.add_argument('--db', help='기사 저장소 경로 (기본: output_settings.database)')
+    parser.add_argument('--since', help='시작 시각 (YYYY-MM-DD[ HH:MM:SS])')
+    parser.add_argument('--until', help='종료 시각 (미포함)')
+    parser.add_argument('--output', default='replay_recommendations.jsonl', help='추천 결과 JSONL')
+    parser.add_argument('--state-dir', help='추천 상태 파일 디렉터리 (기본: 임시 디렉터리)')
+    parser.add_argument('--threshold', type=float, default=0.85, help='유사 뉴스 제외 임계값')
+    parser.add_argument('--embedding-backend', help='recommendation_settings.embedding_backend 대신 사용할 백엔드')
+    parser.add_argument('--workers', type=int, help='임베딩 작업 프로세스 수 (기본: CPU 수, 1이면 단일 프로세스)')
+    parser.add_argument('--batch-size', type=int, default=64, help='작업 프로세스에 보낼 인코딩 배치 크기')
+    parser.add_argument('--run-gap-minutes', type=float, default=30, help='이 간격 이상 벌어지면 다른 실행으로 간주')
+    parser.add_argument('--baseline', help='비교할 이전 재생 결과 JSONL')
+    parser.add_argument('--tolerance', type=float, default=0.0, help='허용 변경 비율 (기본 0)')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    with open(args.config, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+    output_settings = config.get('output_settings', {})
+    db_file = args.db or output_settings.get(
+        'database', os.path.join(output_settings.get('save_dir', 'results'), 'articles.db')
+    )
+    override = {'embedding_backend': args.embedding_backend} if args.embedding_backend else None
+
+    with tempfile.TemporaryDirectory(prefix='replay-') as scratch:
+        state_dir = args.state_dir or scratch
+        os.makedirs(state_dir, exist_ok=True)
+        replayer = Replayer(
+            config, state_dir, threshold=args.threshold, workers=args.workers,
+            batch_size=args.batch_size, settings_override=override
+        )
+        article_store = ArticleStore(db_file)
+        try:
+            with open(args.output, 'w', encoding='utf-8') as output:
+                stats = replayer.replay(article_store, output, args.since, args.until, args.run_gap_minutes)
+        finally:
+            article_store.close()
+    rate = stats['articles'] / stats['seconds'] if stats['seconds'] else 0
+    logger.info(
+        f"재생 완료: 실행 {stats['runs']}회, 기사 {stats['articles']}건, 추천 {stats['recommendations']}건 "
+        f"({stats['seconds']}초, 초당 {rate:.1f}건) → {args.output}"
+    )
+
+    if args.baseline:
+        result = compare(_read_jsonl(args.output), _read_jsonl(args.baseline))
+        logger.info(f"기준 대비 추가 {result['added']}건, 제외 {result['removed']}건 (변경 비율 {result['changed_ratio']})")
+        if result['changed_ratio'] > args.tolerance:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+import argparse
+import json
+import logging
+import os
+from typing import Dict, List, Optional
+
+from article_store import ArticleStore
+
+logger = logging.getLogger(__name__)
+
+REPORT_HEADER = "# 뉴스 요약 리포트 ({date})\n\n오늘의 주요 뉴스 요약입니다.\n"
+UNKNOWN_PRESS = '언론사 정보 없음'
+RSS_GROUP = 'rss'
+
+
+def report_path(report_dir: str, date: str) -> str:
+    return os.path.join(report_dir, f"report_{date}.md")
+
+
+def render_item(news_item: Dict) -> str:
+    """기사 한 건을 리포트 항목 형식으로 변환"""
+    press = news_item.get('press') or news_item.get('source') or UNKNOWN_PRESS
+    link = news_item['link']
+    return (
+        f"## {news_item.get('title', '')}\n"
+        f"- **출처**: {press}\n"
+        f"- **요약**: {news_item.get('summary', '')}\n"
+        f"- **링크**: [{link}]({link})\n"
+    )
+
+
+class ReportBuilder:
+    """기사 저장소에서 새로 저장된 기사만 읽어 날짜별 Markdown 리포트에 이어 쓰는 생성기
+
+    마지막으로 반영한 행 번호(after_id)를 상태 파일에 기록하고, 실행마다 그 이후 행만
+    batch_size 단위로 읽습니다. 각 배치는 카테고리(설정 순서, RSS는 마지막)와
+    키워드/피드 순으로 묶어 해당 날짜 리포트 끝에 추가하므로, 실행 시간과 메모리는
+    그날 전체가 아니라 새 기사 수에 비례합니다. 같은 날 이미 반영된 링크와 근접 중복으로
+    표시된 기사는 건너뜁니다. 추가 도중 중단되면 다음 실행에서 기록된 크기로 되돌린 뒤
+    다시 씁니다.
+    """
+
+    def __init__(self, article_store: ArticleStore, report_dir: str = 'reports',
+                 state_file: Optional[str] = None, category_order: List[str] = None,
+                 batch_size: int = 500, keep_days: int = 7, from_start: bool = False):
+        self.article_store = article_store
+        self.report_dir = report_dir
+        self.state_file = state_file or os.path.join(report_dir, '.report_state.json')
+        self.category_order = {category: i for i, category in enumerate(category_order or [])}
+        self.batch_size = batch_size
+        self.keep_days = keep_days
+        self.state = self._load_state(from_start)
+
+    @classmethod
+    def from_config(cls, config: Dict, article_store: ArticleStore = None,
+                    from_start: bool = False) -> 'ReportBuilder':
+        settings = config.get('report_settings', {})
+        output_settings = config.get('output_settings', {})
+        article_store = article_store or ArticleStore(output_settings.get(
+            'database', os.path.join(output_settings.get('save_dir', 'results'), 'articles.db')
+        ))
+        return cls(
+            article_store,
+            report_dir=settings.get('dir', 'reports'),
+            state_file=settings.get('state_file'),
+            category_order=list(config.get('search_keywords', {})),
+            batch_size=settings.get('batch_size', 500),
+            keep_days=settings.get('keep_days', 7),
+            from_start=from_start
+        )
+
+    def _load_state(self, from_start: bool) -> Dict:
+        if os.path.exists(self.state_file):
+            try:
+                with open(self.state_file, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except Exception as e:
+                logger.error(f"리포트 상태 파일 로드 실패: {str(e)}")
+        if from_start:
+            return {'after_id': 0, 'sizes': {}}
+        # 처음 실행할 때는 이미 저장된 기사를 기존 리포트에 다시 붙이지 않도록 현재 위치부터 시작
+        after_id = self.article_store.last_id()
+        logger.info(f"리포트 상태 파일이 없어 저장소의 현재 위치(id {after_id})부터 반영합니다.")
+        return {'after_id': after_id, 'sizes': {}}
+
+    def _save_state(self):
+        # 최근 keep_days일의 리포트 크기만 유지
+        sizes = self.state['sizes']
+        for date in sorted(sizes)[:-self.keep_days]:
+            del sizes[date]
+        try:
+            tmp_file = self.state_file + '.tmp'
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(self.state, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_file, self.state_file)
+        except Exception as e:
+            logger.error(f"리포트 상태 파일 저장 실패: {str(e)}")
+
+    def _group_key(self, news_item: Dict):
+        category = news_item.get('category') or RSS_GROUP
+        topic = news_item.get('keyword') or news_item.get('source') or ''
+        return (self.category_order.get(category, len(self.category_order)), category, topic)
+
+    def _append(self, date: str, news_items: List[Dict]):
+        """날짜 리포트 끝에 항목 추가 (중단된 이전 추가분은 먼저 잘라냄)"""
+        path = report_path(self.report_dir, date)
+        recorded = self.state['sizes'].get(date)
+        if recorded is not None and os.path.exists(path) and os.path.getsize(path) > recorded:
+            logger.warning(f"완료되지 않은 리포트 추가분을 되돌립니다: {path}")
+            with open(path, 'r+b') as f:
+                f.truncate(recorded)
+
+        # 같은 카테고리/토픽끼리 연속되도록 안정 정렬 (배치 안에서의 수집 순서 유지)
+        ordered = sorted(news_items, key=self._group_key)
+        body = '\n'.join(render_item(item) for item in ordered)
+        with open(path, 'a', encoding='utf-8') as f:
+            if f.tell() == 0:
+                f.write(REPORT_HEADER.format(date=date))
+            # 머리말과 항목, 항목과 항목 사이는 빈 줄 하나
+            f.write('\n' + body)
+            f.flush()
+            os.fsync(f.fileno())
+        self.state['sizes'][date] = os.path.getsize(path)
+
+    def update(self) -> Dict[str, int]:
+        """새로 저장된 기사를 날짜별 리포트에 반영하고 날짜별 추가 건수 반환"""
+        os.makedirs(self.report_dir, exist_ok=True)
+        appended: Dict[str, int] = {}
+        while True:
+            after_id = self.state['after_id']
+            batch = list(self.article_store.query(after_id=after_id, limit=self.batch_size, order='id'))
+            if not batch:
+                break
+
+            by_date: Dict[str, List[Dict]] = {}
+            seen = set()
+            for news_item in batch:
+                date = news_item['crawled_at'][:10]
+                link = news_item['link']
+                if news_item.get('duplicate_of') or (date, link) in seen:
+                    continue
+                seen.add((date, link))
+                # 이전 배치/실행에서 같은 날 이미 반영한 링크 제외 (link 인덱스 조회)
+                if self.article_store.exists(link, max_id=after_id, start=date):
+                    continue
+                by_date.setdefault(date, []).append(news_item)
+
+            for date, news_items in sorted(by_date.items()):
+                self._append(date, news_items)
+                appended[date] = appended.get(date, 0) + len(news_items)
+            self.state['after_id'] = batch[-1]['_id']
+            self._save_state()
+
+        for date, count in sorted(appended.items()):
+            logger.info(f"{report_path(self.report_dir, date)}에 {count}건 추가")
+        return appended
+
+
+def main():
+    parser = argparse.ArgumentParser(description='기사 저장소 기반 일일 리포트 생성')
+    parser.add_argument('--config', default='config.json', help='설정 파일 경로')
+    parser.add_argument('--from-start', action='store_true',
+                        help='상태 파일이 없을 때 저장소의 모든 기사를 처음부터 반영')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    with open(args.config, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+    builder = ReportBuilder.from_config(config, from_start=args.from_start)
+    builder.update()
+    builder.article_store.close()
+
+
+if __name__ == "__main__":
+    main()
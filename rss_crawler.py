@@ -1,149 +1,263 @@
 import feedparser
-import json
+import time
 from datetime import datetime
 import os
 import logging
-from typing import List, Dict
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing, contextmanager, nullcontext
+from functools import partial
+from typing import List, Dict, Iterable, Optional
+from urllib.parse import urlparse
 from slack_sdk import WebClient
-from slack_sdk.errors import SlackApiError
-import requests
-from bs4 import BeautifulSoup
-from googletrans import Translator
 from news_recommender import NewsRecommender
+from http_client import HttpClient
+from slack_delivery import SlackDeliveryQueue
+from feed_state import FeedStateStore
+from summary_cache import SummaryCache, normalize_url
+from article_store import ArticleStore
+from near_duplicate import NearDuplicateIndex
+from translation import BatchTranslator, create_backend, is_english
+from article_extractor import ArticleExtractor
+from canonical_url import CanonicalUrlIndex
+from metrics import RunProfiler, metrics
+from poll_scheduler import AdaptivePollScheduler, rss_source
+from run_journal import JournalRun, RunJournal
 
-# 로깅 설정
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler('rss_crawler.log')
-    ]
-)
 logger = logging.getLogger(__name__)
 
 class RSSNewsCrawler:
-    def __init__(self, config):
+    def __init__(self, config, http_client: HttpClient = None,
+                 delivery_queue: SlackDeliveryQueue = None,
+                 news_recommender: NewsRecommender = None,
+                 near_duplicates: NearDuplicateIndex = None,
+                 poll_scheduler: AdaptivePollScheduler = None,
+                 canonical_urls: CanonicalUrlIndex = None,
+                 journal: RunJournal = None):
         logger.info("RSS 크롤러 초기화 중...")
         self.config = config
+        self.http = http_client or HttpClient(config)
+        
+        # 키워드/출처 간 근접 중복 색인 (데몬에서는 두 크롤러가 공유)
+        self.near_duplicates = near_duplicates or NearDuplicateIndex.from_config(config)
+        
+        # 크롤러 간 대표 URL 색인 (기사 요청과 Slack 전송 전에 확인)
+        self.canonical_urls = canonical_urls or CanonicalUrlIndex.from_config(config)
+        
+        # 실행별 완료 작업 기록 (중단된 실행을 이어서 진행)
+        self.journal = journal or RunJournal.from_config(config)
+        self._run: Optional[JournalRun] = None
         
         # Slack 클라이언트 초기화
         if config['slack_settings']['enabled']:
-            self.slack_client = WebClient(token=config['slack_settings']['bot_token'])
+            self.slack_client = WebClient(
+                token=config['slack_settings']['bot_token'],
+                base_url=config['slack_settings'].get('base_url', WebClient.BASE_URL)
+            )
             self.channels = config['slack_settings']['channels']
-            # 뉴스 추천기 초기화
-            recommendation_channel = config['slack_settings']['recommendation_channel']
-            self.news_recommender = NewsRecommender(
-                self.slack_client,
-                self.channels[recommendation_channel]
+            # 크롤링과 분리된 Slack 전송 큐
+            self.delivery_queue = delivery_queue or SlackDeliveryQueue.from_settings(
+                self.slack_client, config['slack_settings']
+            )
+            # 뉴스 추천기 초기화 (데몬에서는 공유 인스턴스를 전달받음)
+            self.news_recommender = news_recommender or NewsRecommender.from_config(
+                self.slack_client, config
             )
         else:
             self.slack_client = None
             
         # 번역기 초기화
-        self.translator = Translator()
+        translation_settings = config['rss_settings'].get('translation', {})
+        self.translator = BatchTranslator(
+            create_backend(translation_settings.get('backend', 'googletrans')),
+            batch_size=translation_settings.get('batch_size', 20),
+            max_chars=translation_settings.get('max_chars', 4500)
+        )
+        
+        # 기사 동시 수집 설정
+        crawler_settings = config.get('crawler_settings', {})
+        self.max_workers = crawler_settings.get('max_workers', 8)
+        self.per_host_limit = crawler_settings.get('per_host_limit', 4)
+        self.article_executor = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix='rss-article'
+        )
+        self._host_semaphores = {}
+        self._host_lock = threading.Lock()
+        
+        # 피드별 ETag/Last-Modified와 마지막 처리 항목
+        self.feed_state = FeedStateStore(
+            config['rss_settings'].get('state_file', 'rss_feed_state.json')
+        )
+        
+        # 수집 결과 저장소
+        output_settings = config.get('output_settings', {})
+        self.article_store = ArticleStore(output_settings.get(
+            'database', os.path.join(output_settings.get('save_dir', 'results'), 'articles.db')
+        ))
+        
+        # 정규화 URL 기반 기사 요약 캐시
+        cache_settings = config['rss_settings'].get('summary_cache', {})
+        self.summary_cache = SummaryCache(
+            db_file=cache_settings.get('path', 'summary_cache.db'),
+            ttl_hours=cache_settings.get('ttl_hours', 72),
+            max_entries=cache_settings.get('max_entries', 5000)
+        )
+        
+        # 도메인별 본문 추출기 (rss_settings.extractors로 사이트 추가)
+        self.extractor = ArticleExtractor.from_settings(config['rss_settings'])
+        
+        # 피드별 적응형 수집 간격 (데몬의 적응형 스케줄에서만 사용)
+        self.poll_scheduler = poll_scheduler
+        self._profiler = None
         logger.info("RSS 크롤러 초기화 완료")
 
     def fetch_feed(self, feed_url: str) -> List[Dict]:
         """RSS 피드에서 뉴스 항목 가져오기"""
         logger.info(f"RSS 피드 가져오기: {feed_url}")
         
+        run = self._run
+        done = run.get('feed', feed_url) if run else None
+        if done is not None:
+            # 중단된 실행에서 처리한 피드는 다시 요청하지 않음 (피드 상태는 이미 갱신됨)
+            logger.info(f"이전 실행의 피드 결과 {len(done)}건을 이어받았습니다: {feed_url}")
+            return done
+        
         try:
-            feed = feedparser.parse(feed_url)
+            with metrics.timer('feed_fetch'):
+                response = self.http.get(feed_url, headers=self.feed_state.conditional_headers(feed_url))
+            if response.status_code == 304:
+                logger.info(f"피드 변경 없음 (304): {feed_url}")
+                if self.poll_scheduler:
+                    self.poll_scheduler.record(rss_source(feed_url), 0)
+                return []
+            response.raise_for_status()
+            feed = feedparser.parse(
+                response.content,
+                response_headers={k.lower(): v for k, v in response.headers.items()}
+            )
             news_items = []
             
-            for entry in feed.entries:
-                # 기사 내용 요약
-                summary = self._summarize_article(entry.link)
-                
+            # 이미 처리한 항목이 나오면 그 이후는 건너뜀
+            entries = self.feed_state.new_entries(feed_url, feed.entries)
+            logger.info(f"새 항목 {len(entries)}개 / 전체 {len(feed.entries)}개")
+            # 피드에 남은 항목이 모두 새 항목이면 그 사이 밀려난 항목이 있을 수 있음
+            saturated = bool(entries) and len(entries) == len(feed.entries)
+            
+            source = feed.feed.title if hasattr(feed.feed, 'title') else 'Unknown Source'
+            
+            # 다른 피드나 네이버에서 이미 수집한 기사는 본문을 받지 않음
+            links = []
+            fetch_links = []
+            for entry in entries:
+                link = self.canonical_urls.resolve(entry.link)
+                duplicate_of = self._claim(link)
+                links.append((link, duplicate_of))
+                if duplicate_of:
+                    logger.info(f"이미 수집한 기사 URL 건너뜀: {link}")
+                else:
+                    fetch_links.append(link)
+            
+            # 기사 내용 요약을 동시에 수행하되 결과는 피드 순서를 유지
+            summaries = iter(self.article_executor.map(
+                self._profiler.wrap(self._summarize_article) if self._profiler else self._summarize_article,
+                fetch_links
+            ))
+            
+            for entry, (link, duplicate_of) in zip(entries, links):
+                summary = ''
+                fetched_url = None
+                if not duplicate_of:
+                    summary = next(summaries)
+                    # 본문에서 rel=canonical을 새로 찾았으면 그 주소로 다시 확인
+                    canonical = self.canonical_urls.resolve(link)
+                    if normalize_url(canonical) != normalize_url(link):
+                        fetched_url = link
+                        link = canonical
+                        duplicate_of = self._claim(link)
                 news_item = {
                     'title': entry.title,
-                    'link': entry.link,
+                    'link': link,
                     'published': entry.published if hasattr(entry, 'published') else datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
                     'summary': summary,
-                    'source': feed.feed.title if hasattr(feed.feed, 'title') else 'Unknown Source',
+                    'source': source,
                     'crawled_at': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
                 }
+                if fetched_url:
+                    # 요약 캐시는 본문을 받은 주소를 키로 사용
+                    news_item['fetched_url'] = fetched_url
+                if duplicate_of:
+                    news_item['duplicate_of'] = duplicate_of
                 news_items.append(news_item)
                 logger.info(f"RSS 뉴스 항목 추가됨: {news_item['title'][:30]}...")
-                
-                # Slack으로 즉시 전송
-                self.send_to_slack(news_item)
             
+            # 피드 단위로 즉시 저장 (번역된 요약과 근접 중복 표시는 실행 중에 갱신)
+            self.save_results(news_items)
+            # 피드 상태를 갱신하기 전에 기록해 재시작 후 항목을 잃지 않음
+            if run:
+                run.record('feed', feed_url, news_items)
+            self.feed_state.update(feed_url, response.headers, entries)
+            # 성공한 수집만 속도에 반영
+            if self.poll_scheduler:
+                self.poll_scheduler.record(rss_source(feed_url), len(entries), saturated=saturated)
             logger.info(f"총 {len(news_items)}개의 RSS 뉴스 항목 수집 완료")
             return news_items
             
         except Exception as e:
             logger.error(f"RSS 피드 파싱 중 오류 발생: {str(e)}")
+            if self.poll_scheduler:
+                self.poll_scheduler.retry_later(rss_source(feed_url))
             return []
 
+    def _claim(self, link: str) -> Optional[str]:
+        """대표 URL 등록 (중단된 실행에서 이 크롤러가 등록한 URL은 중복으로 보지 않음)"""
+        duplicate_of = self.canonical_urls.claim(link, 'rss')
+        run = self._run
+        if run:
+            if duplicate_of and run.has('claim', link):
+                return None
+            if not duplicate_of:
+                run.record('claim', link)
+        return duplicate_of
+
+    @contextmanager
+    def _host_slot(self, url: str):
+        """호스트별 동시 요청 수 제한"""
+        host = urlparse(url).netloc
+        with self._host_lock:
+            semaphore = self._host_semaphores.get(host)
+            if semaphore is None:
+                semaphore = threading.BoundedSemaphore(self.per_host_limit)
+                self._host_semaphores[host] = semaphore
+        with semaphore:
+            yield
+
     def _summarize_article(self, url: str) -> str:
-        """기사 내용 요약 및 번역"""
+        """기사 내용 요약 및 번역 (캐시 우선, 호스트별 동시성 제한 적용)"""
+        cached = self.summary_cache.get(url)
+        if cached:
+            return cached['summary']
+        with self._host_slot(url):
+            return self._summarize_article_content(url)
+
+    def _summarize_article_content(self, url: str) -> str:
+        """기사 본문 앞 문단을 스트리밍으로 추출해 요약"""
         try:
             logger.info(f"기사 내용 추출 시도: {url}")
-            response = requests.get(url)
-            response.raise_for_status()
+            # 필요한 문단이 모이면 나머지 본문은 내려받지 않음
+            with closing(self.http.iter_text(url)) as chunks:
+                paragraphs, canonical = self.extractor.extract_page(url, chunks)
+            if canonical:
+                self.canonical_urls.remember(url, canonical)
             
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # 사이트별 맞춤형 선택자
-            if 'techcrunch.com' in url:
-                logger.info("TechCrunch 기사 처리 중...")
-                # TechCrunch의 기사 내용은 여러 div에 분산되어 있음
-                article_content = soup.find('div', class_='article-content')
-                if not article_content:
-                    article_content = soup.find('div', class_='content')
-                if not article_content:
-                    article_content = soup.find('div', class_='entry-content')
-            elif 'zdnet.com' in url:
-                logger.info("ZDNet 기사 처리 중...")
-                # ZDNet의 기사 내용은 여러 가능한 클래스에 있음
-                article_content = soup.find('div', class_='storyBody')
-                if not article_content:
-                    logger.info("storyBody 클래스 찾기 실패, 다음 선택자 시도...")
-                    article_content = soup.find('div', class_='article-content')
-                if not article_content:
-                    logger.info("article-content 클래스 찾기 실패, 다음 선택자 시도...")
-                    article_content = soup.find('div', class_='story-body')
-                if not article_content:
-                    logger.info("story-body 클래스 찾기 실패, 다음 선택자 시도...")
-                    article_content = soup.find('div', class_='story-body-container')
-                if not article_content:
-                    logger.info("story-body-container 클래스 찾기 실패, 다음 선택자 시도...")
-                    article_content = soup.find('article')
-                if not article_content:
-                    logger.info("article 태그 찾기 실패, 다음 선택자 시도...")
-                    # ZDNet의 경우 메인 콘텐츠가 div#content에 있을 수 있음
-                    article_content = soup.find('div', id='content')
-                if not article_content:
-                    logger.info("div#content 찾기 실패, 다음 선택자 시도...")
-                    # ZDNet의 경우 메인 콘텐츠가 div.main-content에 있을 수 있음
-                    article_content = soup.find('div', class_='main-content')
-                if not article_content:
-                    logger.info("div.main-content 찾기 실패, 다음 선택자 시도...")
-                    # ZDNet의 경우 메인 콘텐츠가 div.article-body에 있을 수 있음
-                    article_content = soup.find('div', class_='article-body')
-            
-            if article_content:
-                logger.info("기사 내용을 찾았습니다. 요약 생성 중...")
-                # 첫 3문단을 요약으로 사용
-                paragraphs = article_content.find_all('p')
-                if not paragraphs:
-                    logger.info("p 태그를 찾을 수 없습니다. div 내의 텍스트를 직접 추출합니다.")
-                    # p 태그가 없는 경우, div 내의 텍스트를 직접 추출
-                    paragraphs = [article_content]
-                
-                summary = ' '.join([p.text.strip() for p in paragraphs[:3]])
+            if paragraphs:
+                text = ' '.join(paragraphs)
                 
                 # 요약이 200자 이상이면 자르기
-                if len(summary) > 200:
-                    summary = summary[:200] + '...'
-                
-                # 영어인 경우 한글로 번역
-                if self._is_english(summary):
-                    logger.info("영어 기사 감지, 번역 시작...")
-                    summary = self._translate_to_korean(summary)
+                summary = text[:200] + '...' if len(text) > 200 else text
                 
+                # 번역은 실행 단위로 모아 translate_summaries에서 일괄 처리
+                self.summary_cache.put(url, text, summary)
                 logger.info("기사 요약 완료")
                 return summary
             
@@ -154,30 +268,30 @@ class RSSNewsCrawler:
             logger.error(f"기사 요약 중 오류 발생: {str(e)}")
             return "기사 내용을 요약할 수 없습니다."
 
-    def _is_english(self, text: str) -> bool:
-        """텍스트가 영어인지 확인"""
-        try:
-            # 영어 문자와 공백의 비율이 70% 이상이면 영어로 간주
-            english_chars = sum(1 for c in text if c.isalpha() and ord(c) < 128)
-            total_chars = sum(1 for c in text if c.isalpha())
-            return (english_chars / total_chars) > 0.7 if total_chars > 0 else False
-        except:
-            return False
-
-    def _translate_to_korean(self, text: str) -> str:
-        """googletrans를 사용하여 영어를 한글로 번역"""
-        try:
-            # 번역 시도
-            translated = self.translator.translate(text, src='en', dest='ko')
-            return translated.text
-        except Exception as e:
-            logger.error(f"번역 중 오류 발생: {str(e)}")
-            return text
+    def translate_summaries(self, news_items: List[Dict]):
+        """영어 요약을 모아 한 번에 한글로 번역하고 요약 캐시 갱신"""
+        english_items = [item for item in news_items if is_english(item['summary'])]
+        if not english_items:
+            return
+        
+        logger.info(f"영어 기사 {len(english_items)}개 감지, 일괄 번역 시작...")
+        originals = [item['summary'] for item in english_items]
+        with metrics.timer('translation'):
+            translations = self.translator.translate_many(originals, src='en', dest='ko')
+        metrics.inc('translated_texts_total', len(originals))
+        for item, original, translated in zip(english_items, originals, translations):
+            if translated != original:
+                item['summary'] = translated
+                # 추출 본문은 그대로 두고 요약만 번역문으로 갱신
+                self.summary_cache.put(item.get('fetched_url', item['link']), None, translated)
 
     def send_to_slack(self, news_item: Dict):
-        """뉴스 항목을 Slack 채널로 전송"""
+        """뉴스 항목을 Slack 채널로 전송 (이번 실행에서 이미 전송한 기사는 건너뜀)"""
         if not self.slack_client:
             return
+        run = self._run
+        if run and run.has('post', news_item['link']):
+            return
 
         try:
             # 항상 rss-news 채널 사용
@@ -190,52 +304,105 @@ class RSSNewsCrawler:
                 summary=news_item['summary']
             )
             
-            self.slack_client.chat_postMessage(
-                channel=channel_id,
-                text=message,
-                parse="mrkdwn"
+            # 전송을 시도하기 직전에 기록해 재시작 후 다시 보내지 않음
+            self.delivery_queue.enqueue(
+                channel_id, message,
+                on_send=partial(run.record, 'post', news_item['link']) if run else None
             )
-            logger.info(f"Slack 메시지 전송 완료: RSS 뉴스 - {news_item['title'][:30]}...")
+            logger.info(f"Slack 전송 대기열 추가: RSS 뉴스 - {news_item['title'][:30]}...")
             
-        except SlackApiError as e:
-            logger.error(f"Slack 메시지 전송 실패: {str(e)}")
         except KeyError as e:
             logger.error(f"필수 키가 누락되었습니다: {str(e)}. 뉴스 항목: {news_item}")
 
     def save_results(self, news_items: List[Dict]):
-        """수집된 뉴스를 JSON 파일로 저장"""
+        """수집된 뉴스를 기사 저장소에 기록"""
         if not news_items:
             return
             
-        os.makedirs('results', exist_ok=True)
-        filename = f"results/rss_news_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(news_items, f, ensure_ascii=False, indent=2)
-        
-        logger.info(f"RSS 결과가 {filename}에 저장되었습니다.")
+        saved = self.article_store.add_many(news_items, crawler='rss')
+        logger.info(f"RSS 뉴스 {saved}건이 {self.article_store.db_file}에 저장되었습니다.")
+
+    def sources(self) -> List[str]:
+        """적응형 스케줄에서 사용할 피드별 소스 이름"""
+        return [rss_source(feed_url) for feed_url in self.config['rss_settings']['feeds']]
 
-    def run_crawling(self):
-        """RSS 크롤링 실행"""
+    def run_crawling(self, profile: bool = False, sources: Iterable[str] = None):
+        """RSS 크롤링 실행 (profile=True면 이번 실행을 cProfile로 기록, sources가 있으면 해당 피드만 수집)"""
+        metrics_settings = self.config.get('metrics_settings', {})
+        started = time.time()
+        succeeded = False
+        self._profiler = RunProfiler('rss', metrics_settings.get('profile_dir', 'profiles')) if profile else None
         try:
+            # 끝나지 않은 이전 실행이 있으면 그 실행의 피드로 이어서 진행
+            self._run = self.journal.begin('rss', sources)
+            with self._profiler or nullcontext():
+                self._run_crawling(self._run.sources)
+            self._run.finish()
+            succeeded = True
+        except Exception as e:
+            logger.error(f"RSS 크롤링 중 오류 발생: {str(e)}")
+        finally:
+            self._run = None
+            self._profiler = None
+            metrics.record_run('rss', started, succeeded)
+            metrics.export(metrics_settings)
+
+    def _run_crawling(self, sources: Iterable[str] = None):
+        """피드 수집, 번역, 저장, 전송, 추천 (완료한 작업은 실행 저널에 기록)"""
+        run = self._run
+        self.summary_cache.reset_stats()
+        
+        # 번역/중복 정리/저장까지 끝난 실행이면 그 결과로 전송과 추천만 이어서 진행
+        unique_news_items = run.get('prepared', 'rss')
+        if unique_news_items is None:
             all_news_items = []
+            feeds = self.config['rss_settings']['feeds']
+            if sources is not None:
+                selected = set(sources)
+                feeds = [feed_url for feed_url in feeds if rss_source(feed_url) in selected]
+            fetch_feed = self._profiler.wrap(self.fetch_feed) if self._profiler else self.fetch_feed
             
-            for feed_url in self.config['rss_settings']['feeds']:
-                logger.info(f"\n=== RSS 피드 크롤링 시작: {feed_url} ===")
-                news_items = self.fetch_feed(feed_url)
-                all_news_items.extend(news_items)
-                logger.info(f"=== RSS 피드 크롤링 완료 ===\n")
+            # 피드도 동시에 가져오고 결과는 설정된 피드 순서대로 합침
+            with ThreadPoolExecutor(max_workers=max(len(feeds), 1), thread_name_prefix='rss-feed') as feed_executor:
+                for feed_url, news_items in zip(feeds, feed_executor.map(fetch_feed, feeds)):
+                    all_news_items.extend(news_items)
+                    logger.info(f"=== RSS 피드 크롤링 완료: {feed_url} ===")
             
-            # 요약이 있는 뉴스만 필터링
-            valid_news_items = [item for item in all_news_items if item['summary'] and item['summary'] != "기사 내용을 추출할 수 없습니다."]
-            
-            # 대표 뉴스 추천
-            if valid_news_items and self.slack_client:
-                representative_news = self.news_recommender.get_representative_news(valid_news_items)
-                if representative_news:
+            # 번역을 한 단계로 처리한 뒤 저장된 기사에 반영하고 피드 순서대로 Slack 전송
+            # 같은 URL로 이미 수집된 기사(duplicate_of)는 저장만 하고 번역/전송/추천에서 제외
+            candidates = [item for item in all_news_items if not item.get('duplicate_of')]
+            if run.resumed:
+                # 중단 전에 번역해 요약 캐시에 넣은 기사는 다시 번역하지 않음
+                for item in candidates:
+                    cached = self.summary_cache.get(item.get('fetched_url', item['link']))
+                    if cached:
+                        item['summary'] = cached['summary']
+            self.translate_summaries(candidates)
+            unique_news_items = self.near_duplicates.collapse(candidates)
+            metrics.inc('near_duplicates_total', len(candidates) - len(unique_news_items), crawler='rss')
+            updated = self.article_store.update_many(candidates, crawler='rss')
+            if updated:
+                logger.info(f"RSS 뉴스 {updated}건의 번역 요약/중복 표시를 저장소에 반영했습니다.")
+            run.record('prepared', 'rss', unique_news_items)
+        
+        for news_item in unique_news_items:
+            self.send_to_slack(news_item)
+        
+        # 요약이 있는 뉴스만 필터링
+        valid_news_items = [item for item in unique_news_items if item['summary'] and item['summary'] != "기사 내용을 추출할 수 없습니다."]
+        
+        # 대표 뉴스 추천 (이어서 진행할 때는 이미 보낸 추천을 다시 보내지 않음)
+        if valid_news_items and self.slack_client and not run.has('recommend', 'rss'):
+            for representative_news in self.news_recommender.get_topic_representatives(
+                valid_news_items, 'rss'
+            ):
+                if run.once('recommendation', representative_news['link']):
                     self.news_recommender.send_recommendation(representative_news)
-            
-            self.save_results(all_news_items)
-                
-        except Exception as e:
-            logger.error(f"RSS 크롤링 중 오류 발생: {str(e)}") 
\ No newline at end of file
+            run.record('recommend', 'rss')
+        
+        self.summary_cache.log_stats()
+        self.near_duplicates.save()
+        if self.slack_client:
+            self.news_recommender.save_state()
+        if self.poll_scheduler:
+            self.poll_scheduler.save()
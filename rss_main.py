@@ -4,6 +4,7 @@ import time
 import logging
 import json
 from rss_crawler import RSSNewsCrawler
+from logging_setup import setup_logging
 
 def load_config(config_path='config.json'):
     """설정 파일 로드"""
@@ -28,8 +29,11 @@ def setup_schedule(crawler):
         logging.info(f"RSS 스케줄 등록: 매일 {execution_time}에 실행")
 
 def main():
+    # 단독 실행일 때만 로그 파일 지정 (데몬은 daemon.log를 사용)
+    setup_logging('rss_crawler.log')
     parser = argparse.ArgumentParser(description='RSS 뉴스 크롤러')
     parser.add_argument('--run-now', action='store_true', help='크롤러 즉시 실행')
+    parser.add_argument('--profile', action='store_true', help='즉시 실행을 cProfile로 기록 (--run-now와 함께 사용)')
     args = parser.parse_args()
 
     try:
@@ -38,7 +42,10 @@ def main():
 
         if args.run_now:
             logging.info("RSS 크롤러를 즉시 실행합니다.")
-            crawler.run_crawling()
+            crawler.run_crawling(profile=args.profile)
+            # 대기 중인 Slack 메시지를 모두 보낸 뒤 종료
+            if crawler.slack_client:
+                crawler.delivery_queue.close()
             return
 
         setup_schedule(crawler)
@@ -0,0 +1,206 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class JournalRun:
+    """한 크롤러 실행의 완료 작업 기록
+
+    작업은 (종류, 키)로 구분합니다. 크롤러는 키워드 검색(search), 피드 수집(feed),
+    기사 등록/저장(claim, article), Slack 전송(post), 카테고리 추천(recommend),
+    추천 전송(recommendation)을 마칠 때마다 기록하고, 중단 후 다시 시작하면 기록된
+    작업은 결과(payload)를 그대로 사용해 건너뜁니다.
+    """
+
+    def __init__(self, journal: 'RunJournal', run_id: int, crawler: str,
+                 sources: Optional[List[str]], resumed: bool):
+        self.journal = journal
+        self.run_id = run_id
+        self.crawler = crawler
+        self.sources = sources
+        self.resumed = resumed
+        self.finished = False
+        self._done: Dict[Tuple[str, str], Optional[str]] = journal._load_units(run_id) if resumed else {}
+        self._lock = threading.Lock()
+
+    def has(self, kind: str, key: str) -> bool:
+        with self._lock:
+            return (kind, key) in self._done
+
+    def get(self, kind: str, key: str):
+        """완료된 작업의 결과 (기록이 없으면 None)"""
+        with self._lock:
+            payload = self._done.get((kind, key))
+        return json.loads(payload) if payload is not None else None
+
+    def record(self, kind: str, key: str, payload=None):
+        self.record_many(kind, [(key, payload)])
+
+    def record_many(self, kind: str, units: Iterable[Tuple[str, object]]):
+        """작업 완료 기록 (같은 키는 나중 결과로 덮어씀)"""
+        rows = [
+            (kind, key, json.dumps(payload, ensure_ascii=False) if payload is not None else None)
+            for key, payload in units
+        ]
+        with self._lock:
+            # 실행이 끝난 뒤 도착한 전송 기록(전송 큐 콜백)은 남기지 않음
+            if not rows or self.finished:
+                return
+            for kind, key, payload in rows:
+                self._done[(kind, key)] = payload
+        self.journal._write_units(self.run_id, rows)
+
+    def once(self, kind: str, key: str) -> bool:
+        """처음 기록하면 True, 이미 기록된 작업이면 False (전송 전에 호출해 중복 전송 방지)"""
+        with self._lock:
+            if (kind, key) in self._done:
+                return False
+            self._done[(kind, key)] = None
+            if self.finished:
+                return True
+        self.journal._write_units(self.run_id, [(kind, key, None)])
+        return True
+
+    def finish(self):
+        """실행 완료 (기록 삭제)"""
+        with self._lock:
+            self.finished = True
+        self.journal._finish(self.run_id)
+
+
+class RunJournal:
+    """크롤러 실행별 작업 저널 (SQLite)
+
+    실행을 시작할 때 같은 크롤러의 끝나지 않은 실행이 있으면 이어서 진행하고, 없으면
+    새 실행을 엽니다. 실행이 정상적으로 끝나면 기록을 지웁니다. max_age_hours보다
+    오래되었거나 이어받기를 max_resumes번 하고도 끝나지 않은 실행(매번 같은 곳에서
+    중단되는 실행)은 버리고 새 실행을 엽니다.
+    """
+
+    def __init__(self, db_file: str = 'run_journal.db', max_age_hours: float = 6,
+                 max_resumes: int = 3):
+        self.db_file = db_file
+        self.max_age_seconds = max_age_hours * 3600
+        self.max_resumes = max_resumes
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(db_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(db_file, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute(
+            'CREATE TABLE IF NOT EXISTS runs ('
+            'run_id INTEGER PRIMARY KEY AUTOINCREMENT, crawler TEXT NOT NULL, '
+            'sources TEXT, started_at REAL NOT NULL, resumes INTEGER NOT NULL DEFAULT 0)'
+        )
+        columns = {row[1] for row in self.conn.execute('PRAGMA table_info(runs)')}
+        if 'resumes' not in columns:
+            self.conn.execute('ALTER TABLE runs ADD COLUMN resumes INTEGER NOT NULL DEFAULT 0')
+        self.conn.execute(
+            'CREATE TABLE IF NOT EXISTS units ('
+            'run_id INTEGER NOT NULL, kind TEXT NOT NULL, key TEXT NOT NULL, payload TEXT, '
+            'PRIMARY KEY (run_id, kind, key))'
+        )
+        self.conn.commit()
+
+    @classmethod
+    def from_config(cls, config: Dict) -> 'RunJournal':
+        settings = config.get('journal_settings', {})
+        return cls(
+            db_file=settings.get('path', 'run_journal.db'),
+            max_age_hours=settings.get('max_age_hours', 6),
+            max_resumes=settings.get('max_resumes', 3)
+        )
+
+    def begin(self, crawler: str, sources: Optional[Iterable[str]] = None) -> JournalRun:
+        """미완료 실행을 이어받거나 새 실행 시작
+
+        이어받는 경우 중단된 실행의 소스 목록을 그대로 사용하며, 이번에 요청된 소스 중
+        빠지는 소스는 로그로 남깁니다(적응형 스케줄에서는 다음 확인 때 다시 요청됨).
+        """
+        now = time.time()
+        sources = list(sources) if sources is not None else None
+        with self._lock:
+            stale = [row[0] for row in self.conn.execute(
+                'SELECT run_id FROM runs WHERE crawler = ? AND started_at < ?',
+                (crawler, now - self.max_age_seconds)
+            )]
+            if stale:
+                logger.warning(f"{crawler} 미완료 실행 {len(stale)}건이 오래되어 버립니다.")
+                self._delete(stale)
+            row = self.conn.execute(
+                'SELECT run_id, sources, resumes FROM runs WHERE crawler = ? ORDER BY run_id DESC LIMIT 1',
+                (crawler,)
+            ).fetchone()
+            if row is not None and row[2] >= self.max_resumes:
+                logger.warning(f"{crawler} 미완료 실행을 {row[2]}번 이어받고도 끝나지 않아 버립니다.")
+                self._delete([row[0]])
+                row = None
+            if row is None:
+                run_id = self.conn.execute(
+                    'INSERT INTO runs (crawler, sources, started_at) VALUES (?, ?, ?)',
+                    (crawler, json.dumps(sources, ensure_ascii=False) if sources is not None else None, now)
+                ).lastrowid
+                self.conn.commit()
+                return JournalRun(self, run_id, crawler, sources, resumed=False)
+            run_id, stored_sources, resumes = row
+            self.conn.execute('UPDATE runs SET resumes = resumes + 1 WHERE run_id = ?', (run_id,))
+            self.conn.commit()
+        stored_sources = json.loads(stored_sources) if stored_sources else None
+        run = JournalRun(self, run_id, crawler, stored_sources, resumed=True)
+        logger.info(
+            f"{crawler} 중단된 실행을 이어서 진행합니다. "
+            f"(이어받기 {resumes + 1}/{self.max_resumes}번째, 완료 작업 {len(run._done)}건)"
+        )
+        if stored_sources is not None:
+            if sources is None:
+                logger.warning(f"{crawler} 전체 소스 대신 이어받은 실행의 소스 {len(stored_sources)}개만 처리합니다.")
+            else:
+                resumed_sources = set(stored_sources)
+                skipped = [source for source in sources if source not in resumed_sources]
+                if skipped:
+                    logger.warning(f"{crawler} 이어받은 실행에 없어 이번에 건너뛰는 소스: {', '.join(skipped)}")
+        return run
+
+    def _load_units(self, run_id: int) -> Dict[Tuple[str, str], Optional[str]]:
+        with self._lock:
+            return {
+                (kind, key): payload for kind, key, payload in self.conn.execute(
+                    'SELECT kind, key, payload FROM units WHERE run_id = ?', (run_id,)
+                )
+            }
+
+    def _write_units(self, run_id: int, rows: List[Tuple[str, str, Optional[str]]]):
+        try:
+            with self._lock:
+                self.conn.executemany(
+                    'INSERT OR REPLACE INTO units (run_id, kind, key, payload) VALUES (?, ?, ?, ?)',
+                    [(run_id, kind, key, payload) for kind, key, payload in rows]
+                )
+                self.conn.commit()
+        except sqlite3.Error as e:
+            logger.error(f"실행 저널 기록 실패: {str(e)}")
+
+    def _delete(self, run_ids: List[int]):
+        placeholders = ', '.join('?' * len(run_ids))
+        self.conn.execute(f'DELETE FROM units WHERE run_id IN ({placeholders})', run_ids)
+        self.conn.execute(f'DELETE FROM runs WHERE run_id IN ({placeholders})', run_ids)
+        self.conn.commit()
+
+    def _finish(self, run_id: int):
+        try:
+            with self._lock:
+                self._delete([run_id])
+        except sqlite3.Error as e:
+            logger.error(f"실행 저널 정리 실패: {str(e)}")
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,128 @@
+import json
+import logging
+import os
+import threading
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+from embedding_store import link_hash
+
+logger = logging.getLogger(__name__)
+
+
+class SentNewsIndex:
+    """전송된 뉴스 색인
+
+    링크 해시 → 항목 사전으로 O(1) 조회를 하고, 전송 시각 순으로 쌓이는 큐의
+    앞쪽만 확인해 만료 항목을 제거합니다. 새 항목은 추가 전용 저널에 한 줄씩
+    기록하고, 일정 건수마다 스냅샷(news_cache.json)을 임시 파일에 쓴 뒤 원자적으로
+    교체하여 저널을 비웁니다.
+    """
+
+    def __init__(self, cache_file: str = 'news_cache.json', window_hours: float = 24,
+                 compact_every: int = 100):
+        self.cache_file = cache_file
+        self.journal_file = os.path.splitext(cache_file)[0] + '.journal'
+        self.window = timedelta(hours=window_hours)
+        self.compact_every = compact_every
+        self.entries: Dict[str, Dict] = {}
+        self._expiry = deque()
+        self._journal_size = 0
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        """스냅샷을 읽고 저널을 재생"""
+        if os.path.exists(self.cache_file):
+            try:
+                with open(self.cache_file, 'r', encoding='utf-8') as f:
+                    sent_news = json.load(f).get('sent_news', [])
+                # 만료 큐가 시간 순서를 유지하도록 정렬 후 적재
+                for news in sorted(sent_news, key=lambda news: news['sent_time']):
+                    self._insert(news)
+            except Exception as e:
+                logger.error(f"캐시 파일 로드 실패: {str(e)}")
+
+        if os.path.exists(self.journal_file):
+            with open(self.journal_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        self._insert(json.loads(line))
+                        self._journal_size += 1
+                    except json.JSONDecodeError:
+                        # 기록 도중 중단된 마지막 줄은 무시
+                        logger.warning("손상된 저널 항목을 건너뜁니다.")
+        self.expire()
+
+    def _insert(self, news: Dict):
+        digest = link_hash(news['link'])
+        self.entries[digest] = news
+        self._expiry.append((datetime.fromisoformat(news['sent_time']), digest))
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, link: str) -> bool:
+        return link_hash(link) in self.entries
+
+    def items(self) -> List[Dict]:
+        """유지 중인 전송 뉴스 목록"""
+        return list(self.entries.values())
+
+    def links(self) -> List[str]:
+        return [news['link'] for news in self.entries.values()]
+
+    def expire(self, now: datetime = None) -> List[str]:
+        """보존 기간이 지난 항목 제거 후 제거된 링크 반환 (큐 앞쪽만 확인)"""
+        cutoff = (now or datetime.now()) - self.window
+        expired = []
+        with self._lock:
+            while self._expiry and self._expiry[0][0] <= cutoff:
+                sent_time, digest = self._expiry.popleft()
+                news = self.entries.get(digest)
+                # 같은 링크가 다시 전송된 경우 최신 기록은 유지
+                if news and datetime.fromisoformat(news['sent_time']) == sent_time:
+                    del self.entries[digest]
+                    expired.append(news['link'])
+        return expired
+
+    def add(self, news_item: Dict, sent_time: datetime = None):
+        """전송된 뉴스 추가 및 저널 기록"""
+        news = {
+            'title': news_item['title'],
+            'link': news_item['link'],
+            'summary': news_item['summary'],
+            'sent_time': (sent_time or datetime.now()).isoformat()
+        }
+        with self._lock:
+            self._insert(news)
+            try:
+                with open(self.journal_file, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(news, ensure_ascii=False) + '\n')
+                    f.flush()
+                    os.fsync(f.fileno())
+                self._journal_size += 1
+            except Exception as e:
+                logger.error(f"저널 기록 실패: {str(e)}")
+            if self._journal_size >= self.compact_every:
+                self._compact()
+
+    def compact(self):
+        """스냅샷을 다시 쓰고 저널 비우기"""
+        with self._lock:
+            self._compact()
+
+    def _compact(self):
+        try:
+            tmp_file = self.cache_file + '.tmp'
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump({'sent_news': list(self.entries.values())}, f, ensure_ascii=False)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, self.cache_file)
+            if os.path.exists(self.journal_file):
+                os.remove(self.journal_file)
+            self._journal_size = 0
+        except Exception as e:
+            logger.error(f"캐시 파일 압축 실패: {str(e)}")
@@ -0,0 +1,200 @@
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, List, Optional
+
+from slack_sdk import WebClient
+from slack_sdk.errors import SlackApiError
+
+from metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Block Kit 메시지 하나에 들어갈 수 있는 블록 수는 50개 (헤더 + 기사/구분선 쌍)
+MAX_DIGEST_SIZE = 24
+MAX_SECTION_TEXT = 3000
+
+
+class _Message:
+    __slots__ = ('channel', 'text', 'attempts', 'on_send')
+
+    def __init__(self, channel: str, text: str, on_send: Optional[Callable[[], None]] = None):
+        self.channel = channel
+        self.text = text
+        self.attempts = 0
+        self.on_send = on_send
+
+
+class SlackDeliveryQueue:
+    """크롤링과 Slack 전송을 분리하는 백그라운드 전송 큐
+
+    채널별로 메시지를 모아 최소 간격을 두고 전송하며, 429 응답의
+    Retry-After 만큼 해당 채널 전송을 미룹니다. digest_size가 1보다 크면
+    여러 기사를 Block Kit 다이제스트 한 건으로 묶어 보냅니다.
+    """
+
+    def __init__(self, slack_client: WebClient, digest_size: int = 1,
+                 min_interval: float = 1.0, max_attempts: int = 5):
+        self.slack_client = slack_client
+        self.digest_size = max(1, min(digest_size, MAX_DIGEST_SIZE))
+        self.min_interval = min_interval
+        self.max_attempts = max_attempts
+
+        self._queue = queue.Queue()
+        self._pending: Dict[str, deque] = {}
+        self._next_send: Dict[str, float] = {}
+        self._outstanding = 0
+        self._idle = threading.Condition()
+        self._stopping = False
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, slack_client: WebClient, slack_settings: Dict) -> 'SlackDeliveryQueue':
+        """slack_settings.delivery 설정으로 전송 큐 생성"""
+        delivery_settings = slack_settings.get('delivery', {})
+        return cls(
+            slack_client,
+            digest_size=delivery_settings.get('digest_size', 1),
+            min_interval=delivery_settings.get('min_interval', 1.0),
+            max_attempts=delivery_settings.get('max_attempts', 5)
+        )
+
+    def _ensure_started(self):
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stopping = False
+                self._thread = threading.Thread(target=self._run, name='slack-delivery', daemon=True)
+                self._thread.start()
+
+    def enqueue(self, channel: str, text: str, on_send: Optional[Callable[[], None]] = None):
+        """전송할 메시지를 큐에 추가 (즉시 반환, on_send는 처음 전송을 시도하기 직전에 한 번 호출)"""
+        with self._idle:
+            self._outstanding += 1
+        self._ensure_started()
+        self._queue.put(_Message(channel, text, on_send))
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """큐에 쌓인 메시지가 모두 처리될 때까지 대기"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._idle:
+            while self._outstanding > 0:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._idle.wait(remaining)
+        return True
+
+    def close(self, timeout: Optional[float] = None):
+        """남은 메시지를 전송한 뒤 작업 스레드 종료"""
+        self.flush(timeout)
+        self._stopping = True
+        self._queue.put(None)
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _done(self, count: int):
+        with self._idle:
+            self._outstanding -= count
+            self._idle.notify_all()
+
+    def _run(self):
+        while True:
+            try:
+                message = self._queue.get(timeout=self._wait_time())
+                if message is not None:
+                    self._pending.setdefault(message.channel, deque()).append(message)
+                # 이미 도착한 메시지는 한꺼번에 채널별로 모음
+                while True:
+                    message = self._queue.get_nowait()
+                    if message is not None:
+                        self._pending.setdefault(message.channel, deque()).append(message)
+            except queue.Empty:
+                pass
+
+            self._deliver_ready()
+
+            if self._stopping and not any(self._pending.values()):
+                return
+
+    def _wait_time(self) -> Optional[float]:
+        """다음 전송 가능 시각까지 대기할 시간"""
+        waiting = [self._next_send.get(channel, 0) for channel, messages in self._pending.items() if messages]
+        if not waiting:
+            return 1.0 if self._stopping else None
+        return max(0.0, min(waiting) - time.monotonic())
+
+    def _deliver_ready(self):
+        """전송 간격이 지난 채널의 메시지 전송"""
+        now = time.monotonic()
+        for channel, messages in self._pending.items():
+            if not messages or self._next_send.get(channel, 0) > now:
+                continue
+            batch = [messages.popleft() for _ in range(min(self.digest_size, len(messages)))]
+            retry_after = self._post(channel, batch)
+            if retry_after is None:
+                self._done(len(batch))
+                self._next_send[channel] = time.monotonic() + self.min_interval
+                continue
+
+            # 재시도 대상은 순서를 유지한 채 앞으로 되돌림
+            retry = []
+            for message in batch:
+                message.attempts += 1
+                if message.attempts < self.max_attempts:
+                    retry.append(message)
+            messages.extendleft(reversed(retry))
+            self._done(len(batch) - len(retry))
+            self._next_send[channel] = time.monotonic() + retry_after
+
+    def _post(self, channel: str, batch: List[_Message]) -> Optional[float]:
+        """메시지 전송 (성공 또는 재시도 불가 시 None, 재시도 필요 시 대기 초)"""
+        for message in batch:
+            if message.on_send is not None:
+                try:
+                    message.on_send()
+                except Exception as e:
+                    logger.error(f"전송 기록 콜백 실패: {str(e)}")
+                message.on_send = None
+        try:
+            with metrics.timer('slack_post', kind='news'):
+                if len(batch) == 1:
+                    self.slack_client.chat_postMessage(channel=channel, text=batch[0].text, parse="mrkdwn")
+                else:
+                    self.slack_client.chat_postMessage(
+                        channel=channel,
+                        text='\n\n'.join(message.text for message in batch),
+                        blocks=self._digest_blocks(batch)
+                    )
+            metrics.inc('slack_messages_total', len(batch), kind='news')
+            logger.info(f"Slack 메시지 {len(batch)}건 전송 완료: {channel}")
+            return None
+        except SlackApiError as e:
+            response = e.response
+            metrics.inc('slack_errors_total', status=response.status_code if response is not None else 'unknown')
+            if response is not None and response.status_code == 429:
+                retry_after = float(response.headers.get('Retry-After', 1))
+                logger.warning(f"Slack 전송 제한, {retry_after}초 후 재시도: {channel}")
+                return retry_after
+            logger.error(f"Slack 메시지 전송 실패: {str(e)}")
+            return None
+        except Exception as e:
+            logger.error(f"Slack 메시지 전송 중 오류 발생: {str(e)}")
+            return self.min_interval * 5
+
+    @staticmethod
+    def _digest_blocks(batch: List[_Message]) -> List[Dict]:
+        """여러 기사를 하나의 Block Kit 다이제스트로 구성"""
+        blocks = [{
+            'type': 'header',
+            'text': {'type': 'plain_text', 'text': f"📰 뉴스 {len(batch)}건"}
+        }]
+        for message in batch:
+            blocks.append({
+                'type': 'section',
+                'text': {'type': 'mrkdwn', 'text': message.text[:MAX_SECTION_TEXT]}
+            })
+            blocks.append({'type': 'divider'})
+        return blocks[:-1]
@@ -0,0 +1,115 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+TRACKING_PARAM_PREFIXES = ('utm_',)
+TRACKING_PARAMS = {'fbclid', 'gclid'}
+
+
+def normalize_url(url: str) -> str:
+    """캐시 키용 URL 정규화 (스킴/호스트 소문자, 추적 파라미터와 프래그먼트 제거)"""
+    parts = urlsplit(url.strip())
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PARAM_PREFIXES)
+    )
+    path = parts.path.rstrip('/') or '/'
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, urlencode(query), ''))
+
+
+class SummaryCache:
+    """정규화된 URL을 키로 기사 본문 추출 결과와 번역된 요약을 보관하는 SQLite 캐시
+
+    항목은 TTL이 지나면 무시되고, 최대 개수를 넘으면 가장 오래 사용되지 않은
+    항목부터 제거됩니다.
+    """
+
+    def __init__(self, db_file: str = 'summary_cache.db', ttl_hours: float = 72, max_entries: int = 5000):
+        self.db_file = db_file
+        self.ttl_seconds = ttl_hours * 3600
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(db_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(db_file, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute(
+            'CREATE TABLE IF NOT EXISTS summaries ('
+            'url TEXT PRIMARY KEY, text TEXT, summary TEXT, '
+            'fetched_at REAL NOT NULL, last_access REAL NOT NULL)'
+        )
+        self.conn.execute('CREATE INDEX IF NOT EXISTS idx_summaries_last_access ON summaries(last_access)')
+        self.conn.commit()
+
+    def get(self, url: str) -> Optional[Dict]:
+        """캐시된 요약 조회 (없거나 만료되면 None)"""
+        key = normalize_url(url)
+        now = time.time()
+        with self._lock:
+            row = self.conn.execute(
+                'SELECT text, summary, fetched_at FROM summaries WHERE url = ?', (key,)
+            ).fetchone()
+            if row is None or now - row[2] > self.ttl_seconds:
+                self.misses += 1
+                metrics.inc('summary_cache_total', result='miss')
+                return None
+            self.conn.execute('UPDATE summaries SET last_access = ? WHERE url = ?', (now, key))
+            self.conn.commit()
+            self.hits += 1
+            metrics.inc('summary_cache_total', result='hit')
+        return {'text': row[0], 'summary': row[1], 'fetched_at': row[2]}
+
+    def put(self, url: str, text: Optional[str], summary: str):
+        """추출 본문과 요약 저장 후 용량 초과분 제거 (text가 None이면 저장된 본문 유지)"""
+        key = normalize_url(url)
+        now = time.time()
+        try:
+            with self._lock:
+                self.conn.execute(
+                    'INSERT INTO summaries (url, text, summary, fetched_at, last_access) '
+                    'VALUES (?, ?, ?, ?, ?) '
+                    'ON CONFLICT(url) DO UPDATE SET text = COALESCE(excluded.text, text), '
+                    'summary = excluded.summary, fetched_at = excluded.fetched_at, '
+                    'last_access = excluded.last_access',
+                    (key, text, summary, now, now)
+                )
+                self._evict(now)
+                self.conn.commit()
+        except sqlite3.Error as e:
+            logger.error(f"요약 캐시 저장 실패: {str(e)}")
+
+    def _evict(self, now: float):
+        """만료 항목과 최대 개수를 넘는 LRU 항목 삭제"""
+        self.conn.execute('DELETE FROM summaries WHERE fetched_at < ?', (now - self.ttl_seconds,))
+        count = self.conn.execute('SELECT COUNT(*) FROM summaries').fetchone()[0]
+        if count > self.max_entries:
+            self.conn.execute(
+                'DELETE FROM summaries WHERE url IN ('
+                'SELECT url FROM summaries ORDER BY last_access ASC LIMIT ?)',
+                (count - self.max_entries,)
+            )
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+
+    def log_stats(self):
+        """실행 단위 적중/미스 통계 로그"""
+        total = self.hits + self.misses
+        ratio = (self.hits / total * 100) if total else 0
+        logger.info(f"요약 캐시 적중 {self.hits}건 / 미스 {self.misses}건 (적중률 {ratio:.1f}%)")
+
+    def close(self):
+        self.conn.close()
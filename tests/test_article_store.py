@@ -0,0 +1,70 @@
+from article_store import ArticleStore, match_expression, search_tokens
+
+
+def _news(i, title, summary='', **fields):
+    return dict({
+        'category': 'economy', 'keyword': '관세', 'press': '테스트일보', 'title': title,
+        'link': f"https://example.com/{i}", 'summary': summary,
+        'crawled_at': f"2026-09-0{i} 09:00:00",
+    }, **fields)
+
+
+def test_search_tokens_use_korean_bigrams():
+    assert search_tokens('반도체 수출 AI') == ['반도', '도체', '수출', 'ai']
+    assert search_tokens('세') == ['세']
+    assert match_expression('반도체 세') == '"반도 도체" AND "세"*'
+
+
+def test_search_matches_korean_bigrams(tmp_path):
+    store = ArticleStore(str(tmp_path / 'articles.db'))
+    store.add_many([
+        _news(1, '반도체 수출 증가', '관세 영향은 제한적'),
+        _news(2, '관세 협상 타결', '반도체 업계 안도'),
+        _news(3, '교육부 학점제 개선', '고교 운영 방식 변경', category='edu'),
+        _news(4, '반도체 관세 중복 기사', '', duplicate_of='https://example.com/1'),
+    ], crawler='naver')
+
+    links = [item['link'] for item in store.search('반도체')]
+    # 제목 일치가 요약 일치보다 앞서고, 중복 표시된 기사는 색인하지 않음
+    assert links == ['https://example.com/1', 'https://example.com/2']
+    assert [item['link'] for item in store.search('도체')] == links
+    # 어절 경계를 넘는 2-gram은 만들지 않음
+    assert store.search('체수') == []
+    assert [item['link'] for item in store.search('반도체 타결')] == ['https://example.com/2']
+    assert [item['link'] for item in store.search('학')] == ['https://example.com/3']
+    assert store.search('반도체', category='edu') == []
+    assert [item['link'] for item in store.search('반도체', start='2026-09-02')] == ['https://example.com/2']
+    store.close()
+
+
+def test_add_many_is_idempotent_and_index_rebuilds(tmp_path):
+    store = ArticleStore(str(tmp_path / 'articles.db'))
+    items = [_news(1, '반도체 수출 증가'), _news(2, '관세 협상 타결')]
+    assert store.add_many(items, crawler='naver') == 2
+    assert store.add_many(items, crawler='naver') == 0
+    assert store.add_many(items[:1], crawler='rss') == 1
+
+    assert store.rebuild_search_index() == 3
+    assert len(store.search('반도체')) == 2
+    store.close()
+
+
+def test_update_many_refreshes_summary_and_search_index(tmp_path):
+    store = ArticleStore(str(tmp_path / 'articles.db'))
+    first = _news(1, 'Chip exports rise', 'tariff impact limited')
+    second = _news(2, 'Chip exports rise again', 'tariff impact limited')
+    store.add_many([first, second], crawler='rss')
+
+    first = dict(first, summary='관세 영향은 제한적')
+    second = dict(second, summary='관세 영향은 제한적', duplicate_of=first['link'])
+    assert store.update_many([first, second, _news(9, '저장되지 않은 기사')], crawler='rss') == 2
+    assert store.update_many([first, second], crawler='rss') == 0
+
+    # 번역된 요약으로 검색되고, 중복 표시된 기사와 이전 요약은 색인에서 빠짐
+    assert [item['link'] for item in store.search('관세')] == [first['link']]
+    assert store.search('tariff') == []
+    assert [item['link'] for item in store.search('chip')] == [first['link']]
+    stored = {item['link']: item for item in store.query(crawler='rss')}
+    assert stored[first['link']]['summary'] == '관세 영향은 제한적'
+    assert stored[second['link']]['duplicate_of'] == first['link']
+    store.close()
@@ -0,0 +1,72 @@
+import numpy as np
+
+from embedding_store import EmbeddingStore
+
+
+def _unit(vector):
+    vector = np.asarray(vector, dtype=np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+def test_add_many_assigns_consecutive_rows(tmp_path):
+    store = EmbeddingStore(str(tmp_path / 'embeddings.npy'))
+    vectors = np.array([[1, 0, 0], [0, 2, 0], [0, 0, 3]], dtype=np.float32)
+    store.add_many(['a', 'b', 'c'], vectors)
+
+    assert len(store) == 3
+    assert store.vectors().shape == (3, 3)
+    for link, vector in zip(['a', 'b', 'c'], vectors):
+        np.testing.assert_allclose(store.get(link), _unit(vector))
+
+    # 덮어쓰기는 해당 링크의 행만 바꿈
+    store.add('c', np.array([1, 1, 0], dtype=np.float32))
+    np.testing.assert_allclose(store.get('c'), _unit([1, 1, 0]))
+    np.testing.assert_allclose(store.get('a'), _unit([1, 0, 0]))
+    np.testing.assert_allclose(store.get('b'), _unit([0, 1, 0]))
+    assert store.get('missing') is None
+
+
+def test_add_many_with_repeated_new_link_keeps_last_vector(tmp_path):
+    store = EmbeddingStore(str(tmp_path / 'embeddings.npy'))
+    store.add('a', np.array([1, 0], dtype=np.float32))
+    store.add_many(['b', 'b', 'c'], np.array([[0, 1], [1, 1], [1, -1]], dtype=np.float32))
+
+    assert len(store) == 3
+    assert store.vectors().shape == (3, 2)
+    np.testing.assert_allclose(store.get('b'), _unit([1, 1]))
+    np.testing.assert_allclose(store.get('c'), _unit([1, -1]))
+
+
+def test_save_and_reopen(tmp_path):
+    matrix_file = str(tmp_path / 'embeddings.npy')
+    store = EmbeddingStore(matrix_file)
+    store.add_many(['a', 'b'], np.array([[3, 4], [0, 1]], dtype=np.float32))
+    # save() 전에는 파일에 기록하지 않음
+    assert len(EmbeddingStore(matrix_file)) == 0
+    store.save()
+
+    reopened = EmbeddingStore(matrix_file)
+    assert len(reopened) == 2
+    assert 'a' in reopened and 'missing' not in reopened
+    np.testing.assert_allclose(reopened.get('a'), [0.6, 0.8], rtol=1e-6)
+
+    # 메모리 매핑으로 연 저장소에도 추가/덮어쓰기 가능
+    reopened.add_many(['b', 'c'], np.array([[1, 0], [0, 2]], dtype=np.float32))
+    reopened.save()
+    reopened = EmbeddingStore(matrix_file)
+    np.testing.assert_allclose(reopened.get('b'), [1, 0])
+    np.testing.assert_allclose(reopened.get('c'), [0, 1])
+
+
+def test_prune_keeps_rows_aligned(tmp_path):
+    matrix_file = str(tmp_path / 'embeddings.npy')
+    store = EmbeddingStore(matrix_file)
+    store.add_many(['a', 'b', 'c'], np.eye(3, dtype=np.float32))
+    store.prune(['c', 'a'])
+    store.save()
+
+    reopened = EmbeddingStore(matrix_file)
+    assert len(reopened) == 2
+    assert 'b' not in reopened
+    np.testing.assert_allclose(reopened.get('a'), [1, 0, 0])
+    np.testing.assert_allclose(reopened.get('c'), [0, 0, 1])
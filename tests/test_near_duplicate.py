@@ -0,0 +1,71 @@
+from near_duplicate import NearDuplicateIndex, hamming_distance, news_fingerprint
+
+NOW = 1_800_000_000.0
+
+
+def _item(link):
+    return {'link': link}
+
+
+def test_threshold_matches_within_max_distance():
+    index = NearDuplicateIndex(max_distance=6, state_file=None)
+    base = 0x0123456789ABCDEF
+    assert index.check(_item('a'), now=NOW, fingerprint=base) is None
+
+    # 서로 다른 밴드에 흩어진 6비트 차이는 중복, 7비트 차이는 새 기사
+    six_bits = base ^ sum(1 << bit for bit in (0, 10, 20, 30, 40, 50))
+    seven_bits = base ^ sum(1 << bit for bit in (1, 11, 21, 31, 41, 51, 61))
+    assert index.check(_item('b'), now=NOW, fingerprint=six_bits) == 'a'
+    assert index.check(_item('c'), now=NOW, fingerprint=seven_bits) is None
+    assert index.check(_item('d'), now=NOW, fingerprint=seven_bits) == 'c'
+
+
+def test_similar_text_has_close_fingerprint():
+    first = {'title': '교육부, 고교 학점제 운영 개선안 발표', 'summary': '교육부가 내년부터 고교 학점제 운영 방식을 개선한다고 밝혔다.'}
+    second = {'title': '교육부, 고교학점제 운영 개선안 발표', 'summary': '교육부가 내년부터 고교 학점제 운영 방식을 개선한다고 밝혔다'}
+    other = {'title': '엔비디아, 차세대 AI 가속기 공개', 'summary': '엔비디아가 데이터센터용 새 가속기를 발표했다.'}
+    assert hamming_distance(news_fingerprint(first), news_fingerprint(second)) <= 6
+    assert hamming_distance(news_fingerprint(first), news_fingerprint(other)) > 6
+
+
+def test_entries_expire_after_window():
+    index = NearDuplicateIndex(max_distance=3, window_hours=1, state_file=None)
+    assert index.check(_item('a'), now=NOW, fingerprint=42) is None
+    assert index.check(_item('b'), now=NOW + 3599, fingerprint=42) == 'a'
+    # 한 시간이 지나면 먼저 등록된 지문은 사라지고 새 기사가 대표가 됨
+    assert index.check(_item('c'), now=NOW + 3601, fingerprint=42) is None
+    assert index.check(_item('d'), now=NOW + 3602, fingerprint=42) == 'c'
+
+
+def test_collapse_marks_duplicates():
+    index = NearDuplicateIndex(state_file=None)
+    items = [
+        {'link': 'a', 'title': '미국 관세 정책에 반도체 업계 긴장', 'summary': '반도체 수출 기업들이 대응책 마련에 나섰다.'},
+        {'link': 'b', 'title': '미국 관세 정책에 반도체 업계 긴장', 'summary': '반도체 수출 기업들이 대응책 마련에 나섰다'},
+        {'link': 'c', 'title': 'AWS announces new generative AI services', 'summary': 'New services for enterprises.'},
+    ]
+    unique = index.collapse(items)
+    assert [item['link'] for item in unique] == ['a', 'c']
+    assert items[1]['duplicate_of'] == 'a'
+    assert items[0]['duplicates'] == ['b']
+
+
+def test_save_merges_state_in_time_order(tmp_path, monkeypatch):
+    state_file = str(tmp_path / 'near_duplicates.json')
+    clock = {'now': NOW}
+    monkeypatch.setattr('near_duplicate.time.time', lambda: clock['now'])
+
+    index = NearDuplicateIndex(max_distance=3, window_hours=1, state_file=state_file)
+    # 이 인스턴스가 연 뒤 다른 프로세스가 기록한 오래된 지문
+    other = NearDuplicateIndex(max_distance=3, window_hours=1, state_file=state_file)
+    other.check(_item('old'), now=NOW, fingerprint=0xFFFF)
+    other.save()
+
+    clock['now'] = NOW + 1800
+    index.check(_item('new'), now=NOW + 1800, fingerprint=0xFF0000)
+    index.save()
+    assert [index._entries[entry_id]['link'] for entry_id in index._order] == ['old', 'new']
+
+    # 병합된 오래된 지문도 보존 기간이 지나면 만료
+    assert index.check(_item('again'), now=NOW + 3601, fingerprint=0xFFFF) is None
+    assert index.check(_item('new-dup'), now=NOW + 3602, fingerprint=0xFF0000) == 'new'
@@ -0,0 +1,26 @@
+import json
+
+from rate_limiter import TokenBucketLimiter
+
+
+def test_daily_limit_and_batched_persistence(tmp_path):
+    state_file = str(tmp_path / 'quota.json')
+    limiter = TokenBucketLimiter(10000, daily_limit=7, state_file=state_file, save_every=5, save_interval=3600)
+    assert all(limiter.acquire() for _ in range(7))
+    assert not limiter.acquire()
+    assert limiter.remaining_today == 0
+
+    # 다섯 건마다 기록하고 나머지는 save()에서 기록
+    with open(state_file, 'r', encoding='utf-8') as f:
+        assert json.load(f)['used'] == 5
+    limiter.save()
+    assert TokenBucketLimiter(10000, daily_limit=10, state_file=state_file).remaining_today == 3
+
+
+def test_usage_resets_on_new_day(tmp_path):
+    state_file = str(tmp_path / 'quota.json')
+    with open(state_file, 'w', encoding='utf-8') as f:
+        json.dump({'date': '2000-01-01', 'used': 10}, f)
+    limiter = TokenBucketLimiter(10000, daily_limit=10, state_file=state_file)
+    assert limiter.remaining_today == 10
+    assert limiter.acquire()
@@ -0,0 +1,89 @@
+import json
+import os
+import sqlite3
+
+import pytest
+
+import benchmark
+from benchmark import Fixtures, StubServer, bench_config
+from rss_crawler import RSSNewsCrawler
+from summary_cache import normalize_url
+from translation import TranslationBackend, register_backend
+
+CONFIG_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'config.json')
+
+
+class PrefixBackend(TranslationBackend):
+    """번역문 앞에 표시를 붙이는 번역 백엔드"""
+
+    def translate_batch(self, texts, src, dest):
+        return [f"[번역] {text}" for text in texts]
+
+
+register_backend('test-prefix', PrefixBackend)
+
+
+@pytest.fixture
+def crawler(tmp_path, monkeypatch):
+    # 기사 페이지마다 다른 호스트의 rel=canonical 주소를 붙임
+    article_html = Fixtures.article_html
+
+    def canonical_article_html(self, feed, position):
+        canonical = f'<link rel="canonical" href="https://publisher.example.com/news/{feed}/{position}">'
+        return article_html(self, feed, position).replace(b'</head>', canonical.encode('utf-8') + b'</head>')
+
+    monkeypatch.setattr(benchmark.Fixtures, 'article_html', canonical_article_html)
+    fixtures = Fixtures(10, seed=3)
+    server = StubServer(fixtures)
+    server.start()
+    monkeypatch.chdir(tmp_path)
+    with open(CONFIG_FILE, 'r', encoding='utf-8') as f:
+        settings = bench_config(json.load(f), fixtures, server.base_url, 'hashing')
+    settings['slack_settings']['enabled'] = False
+    settings['rss_settings']['translation']['backend'] = 'test-prefix'
+    rss_crawler = RSSNewsCrawler(settings)
+    yield rss_crawler
+    rss_crawler.article_store.close()
+    rss_crawler.summary_cache.close()
+    rss_crawler.journal.close()
+    rss_crawler.canonical_urls.close()
+    rss_crawler.http.close()
+    server.close()
+
+
+class Crash(BaseException):
+    """프로세스 종료 대신 사용하는 예외 (크롤러의 except Exception에 잡히지 않음)"""
+
+
+def _stored(crawler):
+    with crawler.article_store._lock:
+        return [json.loads(row[0]) for row in crawler.article_store.conn.execute(
+            "SELECT data FROM articles WHERE crawler = 'rss'"
+        )]
+
+
+def test_feed_items_are_saved_before_translation(crawler, monkeypatch):
+    def crash(news_items):
+        raise Crash()
+
+    monkeypatch.setattr(crawler, 'translate_summaries', crash)
+    with pytest.raises(Crash):
+        crawler.run_crawling()
+
+    # 번역 전에 중단되어도 피드에서 받은 기사는 모두 저장됨
+    assert len(_stored(crawler)) == 10
+
+
+def test_translated_summary_is_cached_under_fetched_url(crawler):
+    crawler.run_crawling()
+
+    with sqlite3.connect(crawler.summary_cache.db_file) as conn:
+        rows = dict(conn.execute('SELECT url, summary FROM summaries'))
+    items = _stored(crawler)
+    translated = [item for item in items if item['summary'].startswith('[번역]')]
+
+    assert translated
+    assert all(item['link'].startswith('https://publisher.example.com/') for item in items)
+    # 다음 실행이 읽는 키(본문을 받은 주소)에 번역문이 저장되고 대표 URL 키의 행은 생기지 않음
+    assert all(rows[normalize_url(item['fetched_url'])] == item['summary'] for item in translated)
+    assert not [url for url in rows if 'publisher.example.com' in url]
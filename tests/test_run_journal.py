@@ -0,0 +1,228 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter
+
+import pytest
+
+from benchmark import Fixtures, StubServer, bench_config
+from canonical_url import CanonicalUrlIndex
+from crawler import NaverNewsCrawler
+from http_client import HttpClient
+from near_duplicate import NearDuplicateIndex
+from news_recommender import NewsRecommender
+from rss_crawler import RSSNewsCrawler
+from run_journal import JournalRun, RunJournal
+from slack_delivery import SlackDeliveryQueue
+
+CONFIG_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'config.json')
+
+
+class Crash(BaseException):
+    """프로세스 종료 대신 사용하는 예외 (크롤러의 except Exception에 잡히지 않음)"""
+
+
+class FakeSlack:
+    """전송한 메시지를 기록하는 Slack 클라이언트"""
+
+    def __init__(self):
+        self.texts = []
+        self._lock = threading.Lock()
+
+    def chat_postMessage(self, channel, text, **kwargs):
+        with self._lock:
+            self.texts.append(text)
+        return {'ok': True}
+
+
+def test_begin_resumes_unfinished_run(tmp_path):
+    db_file = str(tmp_path / 'journal.db')
+    journal = RunJournal(db_file)
+    run = journal.begin('naver', ['naver:tech/a', 'naver:tech/b'])
+    assert not run.resumed
+    run.record('search', 'tech/a', {'items': [1, 2]})
+    assert run.once('recommendation', 'https://example.com/1')
+    journal.close()
+
+    journal = RunJournal(db_file)
+    resumed = journal.begin('naver', ['naver:tech/c'])
+    assert resumed.resumed
+    assert resumed.run_id == run.run_id
+    assert resumed.sources == ['naver:tech/a', 'naver:tech/b']
+    assert resumed.get('search', 'tech/a') == {'items': [1, 2]}
+    assert not resumed.once('recommendation', 'https://example.com/1')
+
+    resumed.finish()
+    # 실행이 끝난 뒤 도착한 전송 기록은 남기지 않음
+    resumed.record('post', 'https://example.com/2')
+    assert journal.conn.execute('SELECT COUNT(*) FROM units').fetchone()[0] == 0
+    assert not journal.begin('naver').resumed
+    journal.close()
+
+
+def test_begin_drops_run_after_max_resumes(tmp_path):
+    journal = RunJournal(str(tmp_path / 'journal.db'), max_resumes=2)
+    run = journal.begin('rss')
+    run.record('feed', 'https://example.com/rss', [])
+    assert journal.begin('rss').run_id == run.run_id
+    assert journal.begin('rss').run_id == run.run_id
+
+    # 매번 같은 곳에서 중단되는 실행은 버리고 새로 시작
+    fresh = journal.begin('rss')
+    assert not fresh.resumed
+    assert fresh.run_id != run.run_id
+    assert journal.conn.execute(
+        'SELECT COUNT(*) FROM units WHERE run_id = ?', (run.run_id,)
+    ).fetchone()[0] == 0
+    journal.close()
+
+
+def test_begin_drops_stale_run(tmp_path):
+    journal = RunJournal(str(tmp_path / 'journal.db'), max_age_hours=1)
+    run = journal.begin('naver')
+    journal.conn.execute('UPDATE runs SET started_at = ?', (time.time() - 7200,))
+    journal.conn.commit()
+    assert journal.begin('naver').run_id != run.run_id
+    journal.close()
+
+
+def test_begin_migrates_runs_without_resume_count(tmp_path):
+    db_file = str(tmp_path / 'journal.db')
+    conn = sqlite3.connect(db_file)
+    conn.execute(
+        'CREATE TABLE runs (run_id INTEGER PRIMARY KEY AUTOINCREMENT, crawler TEXT NOT NULL, '
+        'sources TEXT, started_at REAL NOT NULL)'
+    )
+    conn.execute('INSERT INTO runs (crawler, sources, started_at) VALUES (?, ?, ?)', ('rss', None, time.time()))
+    conn.commit()
+    conn.close()
+
+    journal = RunJournal(db_file)
+    assert journal.begin('rss').resumed
+    journal.close()
+
+
+@pytest.fixture
+def stub():
+    # 재시작 전후로 같은 포트를 써야 RSS 기사 링크(스텁 주소 포함)가 같아짐
+    fixtures = Fixtures(60, seed=7)
+    server = StubServer(fixtures)
+    server.start()
+    yield server, fixtures
+    server.close()
+
+
+class Pipeline:
+    """데몬처럼 공유 객체를 만들어 두 크롤러를 구성 (다시 만들면 프로세스 재시작)"""
+
+    def __init__(self, settings, slack):
+        self.http_client = HttpClient(settings)
+        self.delivery_queue = SlackDeliveryQueue(slack, min_interval=0)
+        news_recommender = NewsRecommender.from_config(slack, settings)
+        near_duplicates = NearDuplicateIndex.from_config(settings)
+        self.canonical_urls = CanonicalUrlIndex.from_config(settings)
+        self.journal = RunJournal.from_config(settings)
+        shared = (
+            self.http_client, self.delivery_queue, news_recommender, near_duplicates,
+            None, self.canonical_urls, self.journal
+        )
+        self.naver = NaverNewsCrawler(settings, *shared)
+        self.rss = RSSNewsCrawler(settings, *shared)
+
+    def run(self, name):
+        getattr(self, name).run_crawling()
+        self.delivery_queue.flush()
+
+    def close(self):
+        self.delivery_queue.close()
+        self.journal.close()
+        self.canonical_urls.close()
+        self.http_client.close()
+
+
+def _run_pipeline(workdir, monkeypatch, stub, name, crash=None):
+    """workdir에서 크롤러를 실행하고 (전송 메시지, 저장소 행) 반환
+
+    crash가 있으면 먼저 crash를 건 채 실행해 중단시키고, 아직 보내지 않은 메시지를
+    마저 보낸 뒤 새 파이프라인으로 다시 실행합니다.
+    """
+    server, fixtures = stub
+    os.makedirs(workdir)
+    monkeypatch.chdir(workdir)
+    with open(CONFIG_FILE, 'r', encoding='utf-8') as f:
+        settings = bench_config(json.load(f), fixtures, server.base_url, 'hashing')
+    slack = FakeSlack()
+
+    if crash:
+        pipeline = Pipeline(settings, slack)
+        with monkeypatch.context() as patch:
+            crash(patch)
+            with pytest.raises(Crash):
+                pipeline.run(name)
+        pipeline.close()
+
+    pipeline = Pipeline(settings, slack)
+    pipeline.run(name)
+    store = pipeline.naver.article_store
+    with store._lock:
+        rows = [row[0] for row in store.conn.execute('SELECT link FROM articles WHERE crawler = ?', (name,))]
+    unfinished = pipeline.journal.conn.execute('SELECT COUNT(*) FROM runs').fetchone()[0]
+    pipeline.close()
+    assert unfinished == 0
+    return slack.texts, rows
+
+
+def _crash_on_record(kind):
+    """kind 작업을 처음 기록하려는 순간 중단 (저장소에는 쓰고 저널에는 기록하기 전)"""
+    def crash(patch):
+        record_many = JournalRun.record_many
+        state = {'crashed': False}
+        lock = threading.Lock()
+
+        def crashing_record_many(self, unit_kind, units):
+            with lock:
+                if unit_kind == kind and not state['crashed']:
+                    state['crashed'] = True
+                    raise Crash()
+            return record_many(self, unit_kind, units)
+
+        patch.setattr(JournalRun, 'record_many', crashing_record_many)
+    return crash
+
+
+def _crash_after(crawler_class, method, after):
+    """crawler_class.method를 after번 호출한 뒤 중단 (대기열에 남은 메시지는 종료 시 전송)"""
+    def crash(patch):
+        original = getattr(crawler_class, method)
+        state = {'calls': 0}
+        lock = threading.Lock()
+
+        def crashing(self, *args, **kwargs):
+            with lock:
+                state['calls'] += 1
+                if state['calls'] > after:
+                    raise Crash()
+            return original(self, *args, **kwargs)
+
+        patch.setattr(crawler_class, method, crashing)
+    return crash
+
+
+@pytest.mark.parametrize('name, crash', [
+    ('naver', _crash_on_record('article')),
+    ('naver', _crash_after(NaverNewsCrawler, 'send_to_slack', 15)),
+    ('rss', _crash_after(RSSNewsCrawler, '_summarize_article_content', 20)),
+    ('rss', _crash_on_record('prepared')),
+    ('rss', _crash_after(RSSNewsCrawler, 'send_to_slack', 10)),
+])
+def test_resume_after_crash_posts_and_saves_once(tmp_path, monkeypatch, stub, name, crash):
+    expected_texts, expected_rows = _run_pipeline(str(tmp_path / 'clean'), monkeypatch, stub, name)
+    texts, rows = _run_pipeline(str(tmp_path / 'crashed'), monkeypatch, stub, name, crash)
+
+    assert expected_rows
+    assert not [text for text, count in Counter(texts).items() if count > 1]
+    assert len(rows) == len(set(rows))
+    assert sorted(rows) == sorted(expected_rows)
+    assert sorted(texts) == sorted(expected_texts)
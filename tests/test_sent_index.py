@@ -0,0 +1,68 @@
+import json
+import os
+from datetime import datetime, timedelta
+
+from sent_index import SentNewsIndex
+
+NOW = datetime(2026, 10, 1, 12, 0)
+
+
+def _news(i):
+    return {'title': f"제목 {i}", 'link': f"https://example.com/{i}", 'summary': f"요약 {i}"}
+
+
+def test_journal_replay_without_snapshot(tmp_path):
+    cache_file = str(tmp_path / 'news_cache.json')
+    index = SentNewsIndex(cache_file, window_hours=24 * 365 * 10, compact_every=100)
+    for i in range(3):
+        index.add(_news(i), NOW + timedelta(minutes=i))
+    assert not os.path.exists(cache_file)
+    assert os.path.exists(index.journal_file)
+
+    reopened = SentNewsIndex(cache_file, window_hours=24 * 365 * 10)
+    assert len(reopened) == 3
+    assert 'https://example.com/1' in reopened
+    assert reopened.items()[1]['summary'] == '요약 1'
+
+
+def test_compaction_writes_snapshot_and_clears_journal(tmp_path):
+    cache_file = str(tmp_path / 'news_cache.json')
+    index = SentNewsIndex(cache_file, window_hours=24 * 365 * 10, compact_every=2)
+    for i in range(3):
+        index.add(_news(i), NOW + timedelta(minutes=i))
+
+    # 두 건째에 스냅샷으로 압축되고 세 번째 항목만 저널에 남음
+    with open(cache_file, 'r', encoding='utf-8') as f:
+        assert [news['link'] for news in json.load(f)['sent_news']] == [
+            'https://example.com/0', 'https://example.com/1'
+        ]
+    with open(index.journal_file, 'r', encoding='utf-8') as f:
+        assert len(f.readlines()) == 1
+
+    reopened = SentNewsIndex(cache_file, window_hours=24 * 365 * 10, compact_every=2)
+    assert sorted(reopened.links()) == [f"https://example.com/{i}" for i in range(3)]
+
+
+def test_replay_skips_truncated_last_line(tmp_path):
+    cache_file = str(tmp_path / 'news_cache.json')
+    index = SentNewsIndex(cache_file, window_hours=24 * 365 * 10)
+    index.add(_news(0), NOW)
+    with open(index.journal_file, 'a', encoding='utf-8') as f:
+        f.write('{"title": "중단된')
+
+    reopened = SentNewsIndex(cache_file, window_hours=24 * 365 * 10)
+    assert reopened.links() == ['https://example.com/0']
+
+
+def test_expire_keeps_resent_link(tmp_path):
+    index = SentNewsIndex(str(tmp_path / 'news_cache.json'), window_hours=1)
+    index.add(_news(0), NOW)
+    index.add(_news(1), NOW + timedelta(minutes=10))
+    # 같은 링크를 다시 전송하면 최신 기록 기준으로 만료
+    index.add(_news(0), NOW + timedelta(minutes=50))
+
+    assert index.expire(NOW + timedelta(minutes=65)) == []
+    assert sorted(index.links()) == ['https://example.com/0', 'https://example.com/1']
+    assert index.expire(NOW + timedelta(minutes=75)) == ['https://example.com/1']
+    assert index.expire(NOW + timedelta(minutes=115)) == ['https://example.com/0']
+    assert len(index) == 0
@@ -0,0 +1,67 @@
+import numpy as np
+
+from vector_index import MIN_TRAIN_SIZE, VectorIndex
+
+NOW = 1_800_000_000.0
+
+
+def _vectors(count, dim=16, seed=0):
+    vectors = np.random.default_rng(seed).normal(size=(count, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def test_search_before_training_is_exact(tmp_path):
+    index = VectorIndex(str(tmp_path / 'vectors.npz'))
+    vectors = _vectors(20)
+    links = [f"https://example.com/{i}" for i in range(20)]
+    index.add(links, [f"제목 {i}" for i in range(20)], vectors, now=NOW)
+
+    hits = index.search(vectors[:3], k=2)
+    assert [query[0]['link'] for query in hits] == links[:3]
+    assert hits[0][0]['similarity'] > hits[0][1]['similarity']
+    assert len(index.centroids) == 0
+
+
+def test_query_after_retrain(tmp_path):
+    index = VectorIndex(str(tmp_path / 'vectors.npz'), nprobe=4)
+    vectors = _vectors(MIN_TRAIN_SIZE + 100)
+    links = [f"https://example.com/{i}" for i in range(len(vectors))]
+    titles = [f"제목 {i}" for i in range(len(vectors))]
+    index.add(links[:MIN_TRAIN_SIZE - 1], titles[:MIN_TRAIN_SIZE - 1], vectors[:MIN_TRAIN_SIZE - 1], now=NOW)
+    assert index.trained_size == 0
+
+    index.add(links[MIN_TRAIN_SIZE - 1:], titles[MIN_TRAIN_SIZE - 1:], vectors[MIN_TRAIN_SIZE - 1:], now=NOW + 60)
+    assert index.trained_size == len(vectors)
+    assert len(index.centroids) == int(np.sqrt(len(vectors)))
+
+    # 자기 자신이 속한 목록은 항상 탐색되므로 학습 뒤에도 자기 자신이 가장 가까움
+    sample = np.arange(0, len(vectors), 97)
+    hits = index.search(vectors[sample], k=1)
+    assert [query[0]['link'] for query in hits] == [links[i] for i in sample]
+
+    # 학습 뒤 추가한 기사도 찾고, 전송/시각 조건을 적용
+    extra = _vectors(1, seed=1)
+    index.add(['https://example.com/extra'], ['추가'], extra, now=NOW + 120)
+    assert index.search(extra, k=1)[0][0]['link'] == 'https://example.com/extra'
+    assert index.search(extra, k=1, before=NOW + 120)[0][0]['link'] != 'https://example.com/extra'
+    assert index.search(extra, k=1, sent_only=True) == [[]]
+    index.mark_sent(['https://example.com/extra'])
+    assert index.search(extra, k=1, sent_only=True)[0][0]['link'] == 'https://example.com/extra'
+
+
+def test_save_reload_and_expire(tmp_path):
+    state_file = str(tmp_path / 'vectors.npz')
+    index = VectorIndex(state_file, window_days=1)
+    vectors = _vectors(3)
+    index.add(['a', 'b'], ['A', 'B'], vectors[:2], now=NOW)
+    index.mark_sent(['b'])
+    index.save()
+
+    reloaded = VectorIndex(state_file, window_days=1)
+    assert len(reloaded) == 2 and 'b' in reloaded
+    hit = reloaded.search(vectors[1], k=1, sent_only=True)[0][0]
+    assert hit['link'] == 'b' and hit['similarity'] > 0.999
+
+    # 보존 기간이 지난 행은 다음 추가 때 제거
+    reloaded.add(['c'], ['C'], vectors[2], now=NOW + 86400 + 1)
+    assert len(reloaded) == 1 and 'c' in reloaded and 'a' not in reloaded
@@ -0,0 +1,144 @@
+import logging
+import os
+import threading
+import time
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class TopicClusterer:
+    """임계값 기반 리더 클러스터링으로 카테고리별 토픽 중심을 실행 간 유지
+
+    새 임베딩은 기존 중심 k개와의 코사인 유사도만 계산해(O(k)) 가장 가까운
+    클러스터에 합치거나, 임계값 미만이면 새 클러스터를 만듭니다. 중심은
+    누적 평균으로 갱신되며 decay_hours 동안 새 기사가 없던 클러스터는 제거됩니다.
+    """
+
+    def __init__(self, state_file: str = 'topic_clusters.npz', threshold: float = 0.6,
+                 decay_hours: float = 72, max_clusters: int = 50):
+        self.state_file = state_file
+        self.threshold = threshold
+        self.decay_seconds = decay_hours * 3600
+        self.max_clusters = max_clusters
+        self.state: Dict[str, Dict[str, np.ndarray]] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        """카테고리별 중심/크기/최근 갱신 시각 로드"""
+        if not os.path.exists(self.state_file):
+            return
+        try:
+            with np.load(self.state_file, allow_pickle=False) as data:
+                for key in data.files:
+                    category, field = key.rsplit('__', 1)
+                    self.state.setdefault(category, {})[field] = data[key]
+        except Exception as e:
+            logger.error(f"토픽 클러스터 상태 로드 실패: {str(e)}")
+            self.state = {}
+
+    def save(self):
+        """상태를 임시 파일에 쓴 뒤 교체"""
+        arrays = {
+            f"{category}__{field}": value
+            for category, fields in self.state.items()
+            for field, value in fields.items()
+        }
+        try:
+            tmp_file = self.state_file + '.tmp'
+            with open(tmp_file, 'wb') as f:
+                np.savez(f, **arrays)
+            os.replace(tmp_file, self.state_file)
+        except Exception as e:
+            logger.error(f"토픽 클러스터 상태 저장 실패: {str(e)}")
+
+    def _category_state(self, category: str, dim: int, now: float) -> Dict[str, np.ndarray]:
+        """카테고리 상태 반환 (오래된 클러스터 제거 포함)"""
+        state = self.state.get(category)
+        if state is None or state['centroids'].shape[1] != dim:
+            state = {
+                'centroids': np.zeros((0, dim), dtype=np.float32),
+                'counts': np.zeros(0, dtype=np.int64),
+                'last_seen': np.zeros(0, dtype=np.float64),
+            }
+        alive = state['last_seen'] >= now - self.decay_seconds
+        if not alive.all():
+            state = {field: value[alive] for field, value in state.items()}
+        self.state[category] = state
+        return state
+
+    def assign(self, category: str, embeddings: np.ndarray,
+               now: float = None) -> Tuple[np.ndarray, Dict[int, int]]:
+        """임베딩마다 클러스터 번호를 부여하고 이번에 늘어난 크기를 반환"""
+        vectors = np.asarray(embeddings, dtype=np.float32)
+        vectors = vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-8)
+        now = now or time.time()
+        with self._lock:
+            state = self._category_state(category, vectors.shape[1], now)
+            centroids = list(state['centroids'])
+            counts = list(state['counts'])
+            last_seen = list(state['last_seen'])
+            labels = np.zeros(len(vectors), dtype=np.int64)
+            growth: Dict[int, int] = {}
+
+            for i, vector in enumerate(vectors):
+                best = -1
+                if centroids:
+                    similarities = np.stack(centroids) @ vector
+                    best = int(np.argmax(similarities))
+                    if similarities[best] < self.threshold:
+                        best = -1
+                if best < 0:
+                    centroids.append(vector)
+                    counts.append(0)
+                    last_seen.append(now)
+                    best = len(centroids) - 1
+                # 누적 평균으로 중심 갱신 후 재정규화
+                counts[best] += 1
+                centroid = centroids[best] + (vector - centroids[best]) / counts[best]
+                centroids[best] = centroid / max(np.linalg.norm(centroid), 1e-8)
+                last_seen[best] = now
+                labels[i] = best
+                growth[best] = growth.get(best, 0) + 1
+
+            state['centroids'] = np.stack(centroids).astype(np.float32)
+            state['counts'] = np.array(counts, dtype=np.int64)
+            state['last_seen'] = np.array(last_seen, dtype=np.float64)
+            self._trim(category, labels, growth)
+        return labels, growth
+
+    def _trim(self, category: str, labels: np.ndarray, growth: Dict[int, int]):
+        """클러스터가 너무 많으면 이번 실행과 무관한 작은 클러스터부터 제거"""
+        state = self.state[category]
+        count = len(state['counts'])
+        if count <= self.max_clusters:
+            return
+        active = set(growth)
+        removable = sorted(
+            (i for i in range(count) if i not in active),
+            key=lambda i: (state['counts'][i], state['last_seen'][i])
+        )[:count - self.max_clusters]
+        keep = np.ones(count, dtype=bool)
+        keep[removable] = False
+        # 남는 클러스터 번호를 다시 매기고 labels/growth에 반영
+        remap = np.cumsum(keep) - 1
+        for field in state:
+            state[field] = state[field][keep]
+        labels[:] = remap[labels]
+        remapped = {int(remap[label]): added for label, added in growth.items()}
+        growth.clear()
+        growth.update(remapped)
+
+    def rank(self, category: str, labels: np.ndarray, growth: Dict[int, int]) -> List[int]:
+        """이번 실행에 기사가 들어온 클러스터를 성장 순으로 정렬
+
+        새로 들어온 기사 수가 많을수록, 전체 크기 대비 증가율이 높을수록(새로 떠오른 토픽) 앞섭니다.
+        """
+        counts = self.state[category]['counts']
+        return sorted(growth, key=lambda label: (growth[label], growth[label] / counts[label]), reverse=True)
+
+    def centroid(self, category: str, label: int) -> np.ndarray:
+        return self.state[category]['centroids'][label]
@@ -0,0 +1,142 @@
+import hashlib
+import logging
+import re
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Dict, List, Type
+
+logger = logging.getLogger(__name__)
+
+
+def is_english(text: str) -> bool:
+    """텍스트가 영어인지 확인 (알파벳 중 ASCII 비율이 70% 초과)"""
+    english_chars = 0
+    total_chars = 0
+    for c in text:
+        if c.isalpha():
+            total_chars += 1
+            if c < '\x80':
+                english_chars += 1
+    return (english_chars / total_chars) > 0.7 if total_chars > 0 else False
+
+
+class TranslationBackend(ABC):
+    """번역 백엔드 인터페이스"""
+
+    @abstractmethod
+    def translate_batch(self, texts: List[str], src: str, dest: str) -> List[str]:
+        """texts를 같은 순서와 개수의 번역문 목록으로 반환"""
+
+
+class GoogleTranslateBackend(TranslationBackend):
+    """googletrans 백엔드
+
+    여러 문장을 줄바꿈으로 이어 한 번의 요청으로 번역한 뒤 다시 나누고,
+    줄 수가 맞지 않으면 항목별 번역으로 대체합니다.
+    """
+
+    def __init__(self):
+        from googletrans import Translator
+        self.translator = Translator()
+
+    def translate_batch(self, texts: List[str], src: str, dest: str) -> List[str]:
+        lines = [re.sub(r'\s+', ' ', text).strip() for text in texts]
+        translated = self.translator.translate('\n'.join(lines), src=src, dest=dest).text.split('\n')
+        if len(translated) == len(lines):
+            return [line.strip() for line in translated]
+        logger.warning("일괄 번역 결과의 줄 수가 맞지 않아 항목별로 번역합니다.")
+        return [self.translator.translate(line, src=src, dest=dest).text for line in lines]
+
+
+class IdentityBackend(TranslationBackend):
+    """원문을 그대로 돌려주는 로컬 대체 백엔드 (테스트/오프라인용)"""
+
+    def translate_batch(self, texts: List[str], src: str, dest: str) -> List[str]:
+        return list(texts)
+
+
+BACKENDS: Dict[str, Type[TranslationBackend]] = {
+    'googletrans': GoogleTranslateBackend,
+    'identity': IdentityBackend,
+}
+
+
+def register_backend(name: str, backend_class: Type[TranslationBackend]):
+    """번역 백엔드 등록"""
+    BACKENDS[name] = backend_class
+
+
+def create_backend(name: str) -> TranslationBackend:
+    """설정 이름으로 번역 백엔드 생성"""
+    if name not in BACKENDS:
+        raise ValueError(f"알 수 없는 번역 백엔드: {name}")
+    return BACKENDS[name]()
+
+
+class BatchTranslator:
+    """한 실행에서 모은 텍스트를 일괄 번역하고 내용 해시로 결과를 기억하는 번역기"""
+
+    def __init__(self, backend: TranslationBackend, batch_size: int = 20,
+                 max_chars: int = 4500, memo_size: int = 10000):
+        self.backend = backend
+        self.batch_size = batch_size
+        self.max_chars = max_chars
+        self.memo_size = memo_size
+        self._memo = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _digest(text: str, src: str, dest: str) -> str:
+        return hashlib.sha1(f"{src}:{dest}:{text}".encode('utf-8')).hexdigest()
+
+    def _remember(self, key: str, translated: str):
+        with self._lock:
+            self._memo[key] = translated
+            self._memo.move_to_end(key)
+            while len(self._memo) > self.memo_size:
+                self._memo.popitem(last=False)
+
+    def _batches(self, texts: List[str]):
+        """배치 크기와 글자 수 제한에 맞춰 텍스트 묶기"""
+        batch = []
+        chars = 0
+        for text in texts:
+            if batch and (len(batch) >= self.batch_size or chars + len(text) > self.max_chars):
+                yield batch
+                batch = []
+                chars = 0
+            batch.append(text)
+            chars += len(text) + 1
+        if batch:
+            yield batch
+
+    def translate_many(self, texts: List[str], src: str = 'en', dest: str = 'ko') -> List[str]:
+        """텍스트 목록 번역 (중복 텍스트와 이미 번역한 텍스트는 다시 요청하지 않음)"""
+        results = {}
+        pending = []
+        queued = set()
+        with self._lock:
+            for text in texts:
+                key = self._digest(text, src, dest)
+                if key in self._memo:
+                    results[text] = self._memo[key]
+                elif text not in queued:
+                    # 같은 텍스트는 한 번만 요청
+                    queued.add(text)
+                    pending.append(text)
+
+        for batch in self._batches(pending):
+            try:
+                translated = self.backend.translate_batch(batch, src, dest)
+            except Exception as e:
+                logger.error(f"번역 중 오류 발생: {str(e)}")
+                continue
+            for text, translated_text in zip(batch, translated):
+                results[text] = translated_text
+                self._remember(self._digest(text, src, dest), translated_text)
+
+        if pending:
+            logger.info(f"일괄 번역 완료: 요청 {len(pending)}건 / 전체 {len(texts)}건")
+        # 번역에 실패한 텍스트는 원문 유지
+        return [results.get(text, text) for text in texts]
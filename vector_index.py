@@ -0,0 +1,244 @@
+import logging
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# 이 개수 이상 쌓이면 k-means로 목록을 나누고, 학습 당시의 두 배가 되면 다시 학습
+MIN_TRAIN_SIZE = 1024
+MAX_TRAIN_SAMPLE = 20000
+KMEANS_ITERATIONS = 10
+# 관련 기사 표시에 쓰는 제목은 앞부분만 보관
+TITLE_CHARS = 80
+
+
+def _normalize(embeddings: np.ndarray) -> np.ndarray:
+    vectors = np.asarray(embeddings, dtype=np.float32)
+    if vectors.ndim == 1:
+        vectors = vectors[np.newaxis, :]
+    return vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-8)
+
+
+class VectorIndex:
+    """수집한 기사 임베딩의 근사 최근접 이웃 색인 (NumPy IVF-flat)
+
+    정규화된 벡터를 float32로 메모리에 두고(파일에는 float16), 충분히 쌓이면 구면
+    k-means 중심(√n개)으로 역색인 목록을 나눕니다. 검색은 질의와 가까운 nprobe개
+    목록의 벡터만 내적하므로 보존 기간이 길어져도 비교 대상은 일부에 그칩니다.
+    행마다 링크, 제목, 추가 시각, 추천 전송 여부를 함께 저장하며, 보존 기간이 지난
+    행은 추가할 때 제거됩니다.
+    """
+
+    def __init__(self, state_file: str = 'news_vectors.npz', window_days: float = 14,
+                 nprobe: int = 8):
+        self.state_file = state_file
+        self.window_seconds = window_days * 86400
+        self.nprobe = nprobe
+        self.vectors = np.zeros((0, 0), dtype=np.float32)
+        self.links = np.zeros(0, dtype=str)
+        self.titles = np.zeros(0, dtype=str)
+        self.added_at = np.zeros(0, dtype=np.float64)
+        self.sent = np.zeros(0, dtype=bool)
+        self.centroids = np.zeros((0, 0), dtype=np.float32)
+        self.assignments = np.zeros(0, dtype=np.int32)
+        self.trained_size = 0
+        self._lists: Optional[List[np.ndarray]] = None
+        self._positions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    @classmethod
+    def from_settings(cls, settings: Dict) -> 'VectorIndex':
+        return cls(
+            state_file=settings.get('vector_index_file', 'news_vectors.npz'),
+            window_days=settings.get('history_days', 14),
+            nprobe=settings.get('vector_index_nprobe', 8)
+        )
+
+    def _load(self):
+        if not os.path.exists(self.state_file):
+            return
+        try:
+            with np.load(self.state_file, allow_pickle=False) as data:
+                self.vectors = data['vectors'].astype(np.float32)
+                self.links = data['links']
+                self.titles = data['titles']
+                self.added_at = data['added_at']
+                self.sent = data['sent']
+                self.centroids = data['centroids']
+                self.assignments = data['assignments']
+                self.trained_size = int(data['trained_size'])
+            self._reindex()
+        except Exception as e:
+            logger.error(f"벡터 색인 로드 실패: {str(e)}")
+            self._reset(0)
+
+    def save(self):
+        """상태를 임시 파일에 쓴 뒤 교체"""
+        with self._lock:
+            arrays = {
+                'vectors': self.vectors.astype(np.float16), 'links': self.links, 'titles': self.titles,
+                'added_at': self.added_at, 'sent': self.sent, 'centroids': self.centroids,
+                'assignments': self.assignments, 'trained_size': np.array(self.trained_size),
+            }
+        try:
+            directory = os.path.dirname(self.state_file)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_file = self.state_file + '.tmp'
+            with open(tmp_file, 'wb') as f:
+                np.savez(f, **arrays)
+            os.replace(tmp_file, self.state_file)
+        except Exception as e:
+            logger.error(f"벡터 색인 저장 실패: {str(e)}")
+
+    def __len__(self) -> int:
+        return len(self.links)
+
+    def __contains__(self, link: str) -> bool:
+        return link in self._positions
+
+    def _reset(self, dim: int):
+        self.vectors = np.zeros((0, dim), dtype=np.float32)
+        self.links = np.zeros(0, dtype=str)
+        self.titles = np.zeros(0, dtype=str)
+        self.added_at = np.zeros(0, dtype=np.float64)
+        self.sent = np.zeros(0, dtype=bool)
+        self.centroids = np.zeros((0, dim), dtype=np.float32)
+        self.assignments = np.zeros(0, dtype=np.int32)
+        self.trained_size = 0
+        self._reindex()
+
+    def _reindex(self):
+        self._positions = {link: i for i, link in enumerate(self.links.tolist())}
+        self._lists = None
+
+    def _inverted_lists(self) -> List[np.ndarray]:
+        """중심별 행 번호 목록 (변경 후 첫 검색 때 다시 계산)"""
+        if self._lists is None:
+            order = np.argsort(self.assignments, kind='stable')
+            bounds = np.searchsorted(self.assignments[order], np.arange(len(self.centroids) + 1))
+            self._lists = [order[bounds[i]:bounds[i + 1]] for i in range(len(self.centroids))]
+        return self._lists
+
+    def _assign(self, vectors: np.ndarray) -> np.ndarray:
+        if not len(self.centroids):
+            return np.zeros(len(vectors), dtype=np.int32)
+        return np.argmax(vectors @ self.centroids.T, axis=1).astype(np.int32)
+
+    def _train(self):
+        """구면 k-means로 중심을 다시 구하고 모든 행을 재배정"""
+        count = len(self.vectors)
+        nlist = max(int(np.sqrt(count)), 1)
+        rng = np.random.default_rng(0)
+        sample = self.vectors[rng.choice(count, min(count, MAX_TRAIN_SAMPLE), replace=False)]
+        centroids = sample[rng.choice(len(sample), nlist, replace=False)]
+        for _ in range(KMEANS_ITERATIONS):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, sample)
+            empty = ~np.bincount(labels, minlength=nlist).astype(bool)
+            sums[empty] = centroids[empty]
+            centroids = _normalize(sums)
+        self.centroids = centroids
+        self.assignments = np.concatenate([
+            self._assign(self.vectors[start:start + 4096])
+            for start in range(0, count, 4096)
+        ]).astype(np.int32)
+        self.trained_size = count
+        self._lists = None
+        logger.info(f"벡터 색인 목록 재구성: 기사 {count}건, 목록 {nlist}개")
+
+    def _expire(self, now: float):
+        keep = self.added_at >= now - self.window_seconds
+        if keep.all():
+            return
+        for field in ('vectors', 'links', 'titles', 'added_at', 'sent', 'assignments'):
+            setattr(self, field, getattr(self, field)[keep])
+        self._reindex()
+
+    def add(self, links: List[str], titles: List[str], embeddings: np.ndarray, now: float = None):
+        """기사 임베딩 추가 (이미 있는 링크는 건너뜀)"""
+        vectors = _normalize(embeddings)
+        now = now or time.time()
+        with self._lock:
+            if self.vectors.shape[1] != vectors.shape[1]:
+                if len(self.vectors):
+                    logger.warning("임베딩 차원이 달라 벡터 색인을 초기화합니다.")
+                self._reset(vectors.shape[1])
+            self._expire(now)
+            new_rows = []
+            seen = set()
+            for i, link in enumerate(links):
+                if link not in self._positions and link not in seen:
+                    seen.add(link)
+                    new_rows.append(i)
+            if not new_rows:
+                return
+            vectors = vectors[new_rows]
+            self.vectors = np.concatenate([self.vectors, vectors])
+            self.links = np.concatenate([self.links, np.array([links[i] for i in new_rows], dtype=str)])
+            self.titles = np.concatenate([
+                self.titles, np.array([titles[i][:TITLE_CHARS] for i in new_rows], dtype=str)
+            ])
+            self.added_at = np.concatenate([self.added_at, np.full(len(new_rows), now)])
+            self.sent = np.concatenate([self.sent, np.zeros(len(new_rows), dtype=bool)])
+            self.assignments = np.concatenate([self.assignments, self._assign(vectors)])
+            self._reindex()
+            if len(self.vectors) >= MIN_TRAIN_SIZE and len(self.vectors) >= 2 * self.trained_size:
+                self._train()
+
+    def mark_sent(self, links: Iterable[str]):
+        """추천으로 전송된 기사 표시"""
+        with self._lock:
+            for link in links:
+                position = self._positions.get(link)
+                if position is not None:
+                    self.sent[position] = True
+
+    def search(self, embeddings: np.ndarray, k: int = 5, sent_only: bool = False,
+               before: float = None) -> List[List[Dict]]:
+        """질의마다 유사도 순 상위 k개 ({'link', 'title', 'added_at', 'similarity'}) 반환
+
+        sent_only면 추천으로 전송된 기사만, before가 있으면 그 시각 이전에 추가된 기사만 찾습니다.
+        """
+        queries = _normalize(embeddings)
+        with self._lock:
+            if not len(self.vectors) or self.vectors.shape[1] != queries.shape[1]:
+                return [[] for _ in queries]
+            lists = self._inverted_lists() if len(self.centroids) else None
+            if lists is not None:
+                nprobe = min(self.nprobe, len(self.centroids))
+                probes = np.argpartition(-(queries @ self.centroids.T), nprobe - 1, axis=1)[:, :nprobe]
+            results = []
+            for row, query in enumerate(queries):
+                # 질의와 가까운 nprobe개 목록의 벡터만 비교
+                if lists is not None:
+                    candidates = np.concatenate([lists[i] for i in probes[row]])
+                else:
+                    candidates = np.arange(len(self.vectors))
+                if sent_only:
+                    candidates = candidates[self.sent[candidates]]
+                if before is not None:
+                    candidates = candidates[self.added_at[candidates] < before]
+                if not len(candidates):
+                    results.append([])
+                    continue
+                similarities = self.vectors[candidates] @ query
+                top = min(k, len(candidates))
+                columns = np.argpartition(-similarities, top - 1)[:top]
+                columns = columns[np.argsort(-similarities[columns])]
+                results.append([
+                    {
+                        'link': str(self.links[candidates[column]]),
+                        'title': str(self.titles[candidates[column]]),
+                        'added_at': float(self.added_at[candidates[column]]),
+                        'similarity': float(similarities[column]),
+                    }
+                    for column in columns
+                ])
+            return results